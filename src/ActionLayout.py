@@ -0,0 +1,129 @@
+from itertools import compress
+
+from src.BoardTopology import *
+from src.LegalActions import TRADE_RESOURCE_GIVEN
+
+"""
+Flat action layout.
+
+A move function output can be seen as one flat list of scores, with a fixed slot for every action. The slots are in
+the same order as the output vector of a move function:
+
+    [ Settlements (1 per node), Cities (1 per node), Roads (1 per edge), EndTurn, TradeWithGame (20),
+      BuyDevelopmentCard, Knight ]
+
+Decoding works on the flat scores and a flattened legal action mask, so only legal slots are compared. A player
+taking several actions in a turn pops the highest scoring legal action after each one, as taking an action can make
+others legal:
+
+    scores = layout.flatten(output_dictionary)
+    key, element = layout.popHighestLegalAction(scores, game_manager.legalActionMask(player))
+
+rankLegalActions orders every legal action at once, for when the mask is fixed, e.g. to order moves in a search.
+"""
+
+# Keys of move function output in slot order
+ACTION_KEYS = ('Settlements', 'Cities', 'Roads', 'EndTurn', 'TradeWithGame', 'BuyDevelopmentCard', 'Knight')
+
+
+class ActionLayout:
+    def __init__(self, topology):
+        """
+        Slot layout of actions for a board topology
+        :param topology: BoardTopology
+        """
+        self.keys = ACTION_KEYS
+        self.sizes = {'Settlements': topology.number_of_nodes,
+                      'Cities': topology.number_of_nodes,
+                      'Roads': topology.number_of_edges,
+                      'EndTurn': 1,
+                      'TradeWithGame': len(TRADE_RESOURCE_GIVEN),
+                      'BuyDevelopmentCard': 1,
+                      'Knight': 1}
+
+        # First slot of each key, and the (key, element) action of each slot
+        self.offsets = {}
+        slot_actions = []
+        for key in self.keys:
+            self.offsets[key] = len(slot_actions)
+            slot_actions += [(key, element) for element in range(self.sizes[key])]
+        self.slot_actions = tuple(slot_actions)
+        self.size = len(slot_actions)
+        self._slots = range(self.size)
+        self._ranges = tuple((key, self.offsets[key], self.offsets[key] + self.sizes[key]) for key in self.keys)
+
+    def slot(self, key, element):
+        """
+        Get slot of an action
+        :param key: Move function output key
+        :param element: Index in list of key
+        :return: Slot index
+        """
+        return self.offsets[key] + element
+
+    def flatten(self, output_dictionary):
+        """
+        Join a move function output dictionary into one list of scores in slot order
+        :param output_dictionary: Dictionary of lists
+        :return: List of scores
+        """
+        scores = []
+        for key in self.keys:
+            scores += output_dictionary[key]
+
+        return scores
+
+    def split(self, scores):
+        """
+        Split a list of scores in slot order into a move function output dictionary
+        :param scores: List of scores
+        :return: Dictionary of lists
+        """
+        return {key: scores[start:end] for key, start, end in self._ranges}
+
+    def rankLegalActions(self, scores, legal_dictionary):
+        """
+        Sort legal actions scoring above 0 by score with one sort. Equal scores keep slot order
+        :param scores: List of scores in slot order
+        :param legal_dictionary: Legal action mask with the same keys as a move function output, 1 marks a legal element
+        :return: List of (key, element) actions, highest score first
+        """
+        legal_slots = [slot for slot in compress(self._slots, self.flatten(legal_dictionary)) if scores[slot] > 0]
+        legal_slots.sort(key=scores.__getitem__, reverse=True)
+
+        return [self.slot_actions[slot] for slot in legal_slots]
+
+    def popHighestLegalAction(self, scores, legal_dictionary):
+        """
+        Find the highest scoring legal action and set its score to 0 so it isn't found again
+        :param scores: List of scores in slot order, updated in place
+        :param legal_dictionary: Legal action mask with the same keys as a move function output, 1 marks a legal element
+        :return: key, element of action. None, None if no legal action scores above 0
+        """
+        # Only legal slots are compared, and max keeps the first of equal scores so ties go to the lowest slot
+        slot = max(compress(self._slots, self.flatten(legal_dictionary)), key=scores.__getitem__, default=None)
+        if slot is None or scores[slot] <= 0:
+            return None, None
+
+        scores[slot] = 0
+        return self.slot_actions[slot]
+
+
+# Layouts already built, by topology
+_layout_cache = {}
+
+
+def actionLayout(topology):
+    """
+    Layout of a topology. Built once per topology, later calls return the same instance
+    :param topology: BoardTopology
+    :return: ActionLayout
+    """
+    if topology not in _layout_cache:
+        _layout_cache[topology] = ActionLayout(topology)
+
+    return _layout_cache[topology]
+
+
+# Layout of the standard board
+STANDARD_LAYOUT = actionLayout(STANDARD_TOPOLOGY)
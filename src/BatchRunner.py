@@ -0,0 +1,218 @@
+import argparse
+import importlib
+import multiprocessing
+import time
+from collections import namedtuple
+
+from src.BoardLayout import *
+from src.GameManager import *
+from src.Player import *
+
+"""
+Headless runner which plays many games across a pool of processes and aggregates the results per move function.
+
+Example usage, playing 1000 games over 8 processes:
+
+    python -m src.BatchRunner --games 1000 --processes 8 --move-functions src.RandomAgent:fastRandomAction
+"""
+
+# Everything a worker needs to play one game. move_functions has one element per player, profile is True to profile the
+# game and layout is the BoardLayout to play on, None to lay out the board from the seed
+GameArguments = namedtuple('GameArguments', ['seed', 'move_functions', 'profile', 'layout'], defaults=(False, None))
+
+
+def playGame(game_arguments):
+    """
+    Plays a single game with a silent event log. Called in worker processes
+    :param game_arguments: GameArguments
+    :return: Dictionary of game results
+    """
+    seed, move_functions, profile, layout = game_arguments
+
+    # Each game gets its own seed so any game in a batch can be replayed on its own
+    players = [Player(move_function) for move_function in move_functions]
+    game_manager = GameManager(players, seed=seed, profile=GameProfile() if profile else None, layout=layout)
+
+    start_time = time.perf_counter()
+    game_manager.startGame()
+    end_time = time.perf_counter()
+
+    return {'seed': seed,
+            'move_functions': [moveFunctionName(move_function) for move_function in move_functions],
+            'winner': game_manager.winner,
+            'turns': game_manager.turn_counter,
+            'points': [game_manager.countPoints(index) for index in range(len(players))],
+            'duration': end_time - start_time,
+            'profile': game_manager.profile}
+
+
+def runBatch(move_functions, number_of_games, processes=None, seed=0, rotate_seats=True, chunk_size=8, profile=False,
+             layouts=None):
+    """
+    Plays a batch of games, in parallel if more than one process is used
+    :param move_functions: List of move functions with one element per player, 2 or more
+    :param number_of_games: Number of games to play
+    :param processes: Number of worker processes. None uses every CPU, 1 plays all games in this process
+    :param seed: Seed for the batch. Game i is played with seed + i
+    :param rotate_seats: If True, move functions are rotated one seat each game so each plays every seat equally
+    :param chunk_size: Number of games sent to a worker at a time
+    :param profile: If True, each game is profiled and the merged GameProfile is included in the summary
+    :param layouts: Sequence of BoardLayouts, e.g. a LayoutCache. Game i is played on layout (seed + i) modulo number
+                    of layouts, so batches with the same seed play the same boards. None lays out each board from its
+                    game's seed
+    :return: Summary dictionary from summariseResults, List of result dictionaries for each game
+    """
+    game_arguments = [None] * number_of_games
+    for game_index in range(number_of_games):
+        seats = list(move_functions)
+        if rotate_seats:
+            rotation = game_index % len(seats)
+            seats = seats[rotation:] + seats[:rotation]
+        layout = layouts[(seed + game_index) % len(layouts)] if layouts is not None else None
+        game_arguments[game_index] = GameArguments(seed + game_index, seats, profile, layout)
+
+    start_time = time.perf_counter()
+    if processes == 1:
+        results = [playGame(arguments) for arguments in game_arguments]
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            results = list(pool.imap_unordered(playGame, game_arguments, chunk_size))
+    wall_time = time.perf_counter() - start_time
+
+    # Keep results in order of seed regardless of which worker finished first
+    results.sort(key=lambda result: result['seed'])
+
+    summary = summariseResults(results, wall_time)
+    if profile:
+        summary['profile'] = mergeProfiles(result['profile'] for result in results)
+
+    return summary, results
+
+
+def summariseResults(results, wall_time):
+    """
+    Aggregates game results per move function
+    :param results: List of result dictionaries from playGame
+    :param wall_time: Time taken to play all games in seconds
+    :return: Summary dictionary
+    """
+    number_of_games = len(results)
+    total_turns = sum(result['turns'] for result in results)
+
+    # Tally games, wins, turns and points for each move function. A move function playing several seats in one game
+    # counts once per seat
+    move_function_totals = {}
+    for result in results:
+        for seat, name in enumerate(result['move_functions']):
+            totals = move_function_totals.setdefault(name, {'seats': 0, 'wins': 0, 'turns': 0, 'points': 0})
+            totals['seats'] += 1
+            totals['turns'] += result['turns']
+            totals['points'] += result['points'][seat]
+            if result['winner'] == seat:
+                totals['wins'] += 1
+
+    move_function_summaries = {}
+    for name, totals in move_function_totals.items():
+        move_function_summaries[name] = {'seats_played': totals['seats'],
+                                         'wins': totals['wins'],
+                                         'win_rate': totals['wins'] / totals['seats'],
+                                         'mean_points': totals['points'] / totals['seats'],
+                                         'mean_game_length': totals['turns'] / totals['seats'],
+                                         'games_per_second': totals['seats'] / wall_time if wall_time > 0 else 0.0}
+
+    games_without_winner = 0
+    for result in results:
+        if result['winner'] is None:
+            games_without_winner += 1
+
+    return {'games': number_of_games,
+            'games_without_winner': games_without_winner,
+            'mean_game_length': total_turns / number_of_games if number_of_games > 0 else 0.0,
+            'wall_time': wall_time,
+            'games_per_second': number_of_games / wall_time if wall_time > 0 else 0.0,
+            'move_functions': move_function_summaries}
+
+
+def moveFunctionName(move_function):
+    """
+    Gets name used to identify a move function in results
+    :param move_function: Move function. Callable objects can give their own name with a name attribute
+    :return: Name in form module:function
+    """
+    name = getattr(move_function, 'name', None)
+    if name is None:
+        name = getattr(move_function, '__qualname__', type(move_function).__qualname__)
+    return getattr(move_function, '__module__', '') + ':' + name
+
+
+def loadMoveFunction(specification):
+    """
+    Imports a move function from a specification string
+    :param specification: String in form module:function, e.g. src.Player:randomAction
+    :return: Move function
+    """
+    module_name, function_name = specification.split(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def formatSummary(summary):
+    """
+    Formats summary dictionary as a printable table
+    :param summary: Summary dictionary from summariseResults
+    :return: String
+    """
+    lines = ['Games: ' + str(summary['games']) + ' (' + str(summary['games_without_winner']) + ' without a winner)',
+             'Mean game length: ' + '{:.1f}'.format(summary['mean_game_length']) + ' rounds',
+             'Throughput: ' + '{:.2f}'.format(summary['games_per_second']) + ' games/s over ' +
+             '{:.1f}'.format(summary['wall_time']) + ' s',
+             '']
+
+    lines.append('{:<40} {:>8} {:>8} {:>9} {:>12} {:>10}'.format('Move function', 'Seats', 'Wins', 'Win rate',
+                                                                 'Mean points', 'Games/s'))
+    for name, move_function_summary in sorted(summary['move_functions'].items()):
+        lines.append('{:<40} {:>8} {:>8} {:>9.3f} {:>12.2f} {:>10.2f}'.format(
+            name, move_function_summary['seats_played'], move_function_summary['wins'],
+            move_function_summary['win_rate'], move_function_summary['mean_points'],
+            move_function_summary['games_per_second']))
+
+    return '\n'.join(lines)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Play a batch of headless games and summarise the results')
+    parser.add_argument('--games', type=int, default=100, help='Number of games to play')
+    parser.add_argument('--processes', type=int, default=None, help='Number of worker processes (default: all CPUs)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of first game')
+    parser.add_argument('--move-functions', nargs='+', default=['src.RandomAgent:fastRandomAction'],
+                        help='Move functions as module:function, repeated to fill seats if fewer than players')
+    parser.add_argument('--players', type=int, default=4, help='Number of players in each game')
+    parser.add_argument('--fixed-seats', action='store_true', help='Don\'t rotate move functions between seats')
+    parser.add_argument('--profile', action='store_true', help='Profile games and print where time was spent')
+    parser.add_argument('--layouts', default=None, help='Layout cache file to draw boards from')
+    parser.add_argument('--write-layouts', type=int, default=None, metavar='N',
+                        help='Write N balanced layouts to the --layouts file before playing')
+    parsed = parser.parse_args(arguments)
+
+    move_functions = [loadMoveFunction(specification) for specification in parsed.move_functions]
+    move_functions = [move_functions[seat % len(move_functions)] for seat in range(parsed.players)]
+
+    layouts = None
+    if parsed.layouts is not None:
+        if parsed.write_layouts is not None:
+            writeLayoutCache(parsed.layouts, parsed.write_layouts)
+        layouts = LayoutCache(parsed.layouts)
+
+    try:
+        summary, results = runBatch(move_functions, parsed.games, processes=parsed.processes, seed=parsed.seed,
+                                    rotate_seats=not parsed.fixed_seats, profile=parsed.profile, layouts=layouts)
+    finally:
+        if layouts is not None:
+            layouts.close()
+    print(formatSummary(summary))
+    if parsed.profile:
+        print('')
+        print(formatProfile(summary['profile']))
+
+
+if __name__ == '__main__':
+    main()
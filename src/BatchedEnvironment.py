@@ -0,0 +1,178 @@
+import threading
+
+from src.GameManager import *
+from src.Player import *
+
+"""
+Environment which plays many games in lockstep so that a policy can make every pending decision in one call.
+
+Each game runs in its own thread. Players controlled by the policy block when they need a decision, and once every
+unfinished game is waiting, all their input vectors are passed to the policy as one batch and the outputs are handed
+back to the games.
+"""
+
+
+class BatchedEnvironment:
+    def __init__(self, policy, number_of_games, seats=None, number_of_players=4, seed=None):
+        """
+        Class to play a batch of games against a batched policy
+        :param policy: Function taking a list of input vectors and returning a list of (output dictionary, output vector)
+                       in the same order, where each element is what a move function would return for that input
+        :param number_of_games: Number of games to play at once
+        :param seats: List of move functions with one element per player. Seats which are None are played by policy.
+                      Defaults to policy playing every seat
+        :param number_of_players: Number of seats when seats isn't given
+        :param seed: Seed for the batch. Game i is played with seed + i. None draws each game's seed from the global
+                     random module
+        """
+        self.policy = policy
+        self.number_of_games = number_of_games
+        self.seats = seats if seats is not None else [None] * number_of_players
+        self.seed = seed
+
+        # Statistics on batching
+        self.policy_calls = 0
+        self.decisions = 0
+        self.largest_batch = 0
+
+        self.game_managers = []
+
+        """
+        Thread state, only accessed whilst holding self._condition:
+
+        - self._pending maps game index to the input vector of the decision the game is waiting for
+        - self._outputs maps game index to the policy output for that decision, until the game collects it
+        - self._running is number of games which haven't finished
+        - self._stopped is True once the batch is abandoned, which releases games waiting for a decision
+        """
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._outputs = {}
+        self._running = 0
+        self._stopped = False
+        self._errors = []
+
+    def run(self):
+        """
+        Plays all games to completion
+        :return: List of result dictionaries, one per game
+        """
+        self.game_managers = [None] * self.number_of_games
+        threads = [None] * self.number_of_games
+        for game_index in range(self.number_of_games):
+            players = [None] * len(self.seats)
+            for seat, move_function in enumerate(self.seats):
+                if move_function is None:
+                    move_function = BatchedMoveFunction(self, game_index)
+                players[seat] = Player(move_function)
+
+            seed = self.seed + game_index if self.seed is not None else None
+            self.game_managers[game_index] = GameManager(players, seed=seed)
+            threads[game_index] = threading.Thread(target=self._playGame, args=(game_index,), daemon=True)
+
+        self._running = self.number_of_games
+        for thread in threads:
+            thread.start()
+
+        with self._condition:
+            while True:
+                # Wait until every game still running is waiting for a decision
+                while self._running > 0 and len(self._pending) < self._running:
+                    self._condition.wait()
+
+                if self._running == 0:
+                    break
+
+                # Evaluate all pending decisions in one call
+                game_indices = sorted(self._pending)
+                input_vectors = [self._pending.pop(game_index) for game_index in game_indices]
+                outputs = self.policy(input_vectors)
+                if len(outputs) != len(input_vectors):
+                    self._errors.insert(0, ValueError('Policy returned ' + str(len(outputs)) + ' outputs for ' +
+                                                      str(len(input_vectors)) + ' input vectors'))
+                    self._stopped = True
+                    self._condition.notify_all()
+                    break
+
+                for game_index, output in zip(game_indices, outputs):
+                    self._outputs[game_index] = output
+
+                self.policy_calls += 1
+                self.decisions += len(game_indices)
+                self.largest_batch = max(self.largest_batch, len(game_indices))
+
+                self._condition.notify_all()
+
+        for thread in threads:
+            thread.join()
+
+        if len(self._errors) != 0:
+            raise self._errors[0]
+
+        results = [None] * self.number_of_games
+        for game_index, game_manager in enumerate(self.game_managers):
+            results[game_index] = {'winner': game_manager.winner,
+                                   'turns': game_manager.turn_counter,
+                                   'points': [game_manager.countPoints(index) for index in range(len(self.seats))]}
+
+        return results
+
+    def waitForDecision(self, game_index, input_vector):
+        """
+        Called from a game thread. Blocks until the policy has evaluated the input vector
+        :param game_index: Index of game making decision
+        :param input_vector: Input vector for decision
+        :return: Policy output for input vector
+        """
+        with self._condition:
+            self._pending[game_index] = input_vector
+            self._condition.notify_all()
+
+            while game_index not in self._outputs:
+                if self._stopped:
+                    raise RuntimeError('Batch stopped before game ' + str(game_index) + ' finished')
+                self._condition.wait()
+
+            return self._outputs.pop(game_index)
+
+    def _playGame(self, game_index):
+        """
+        Thread target which plays one game
+        :param game_index: Index of game to play
+        """
+        try:
+            self.game_managers[game_index].startGame()
+
+        except Exception as error:
+            self._errors.append(error)
+
+        finally:
+            with self._condition:
+                self._running -= 1
+                self._condition.notify_all()
+
+
+class BatchedMoveFunction:
+    def __init__(self, environment, game_index):
+        """
+        Move function which defers decisions to the batched policy of an environment
+        :param environment: BatchedEnvironment instance
+        :param game_index: Index of game the player using this move function is in
+        """
+        self.environment = environment
+        self.game_index = game_index
+
+    def __call__(self, input_vector):
+        return self.environment.waitForDecision(self.game_index, input_vector)
+
+
+def batchPolicy(move_function):
+    """
+    Wraps a move function which makes one decision at a time as a batched policy
+    :param move_function: Move function
+    :return: Policy function taking a list of input vectors
+    """
+    def policy(input_vectors):
+        return [move_function(input_vector) for input_vector in input_vectors]
+
+    return policy
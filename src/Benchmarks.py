@@ -0,0 +1,286 @@
+import argparse
+import json
+import platform
+import time
+
+from src.BoardLayout import *
+from src.GameManager import *
+from src.Player import *
+from src.RoadNetwork import *
+
+"""
+Benchmarks of the engine's hot paths.
+
+Every benchmark uses fixed seeds so results from different commits can be compared. Results are written as JSON, and a
+previous results file can be given to report which benchmarks have slowed down:
+
+    python -m src.Benchmarks --output new.json --compare old.json
+"""
+
+# Edges around three neighbouring hexes, the 15 road network with the most loops and branches to search
+WORST_CASE_ROAD_EDGES = [0, 1, 6, 7, 11, 12, 2, 3, 8, 13, 14, 19, 20, 26, 27]
+
+
+def benchmarkBoardConstruction(seed):
+    """
+    Board construction, including shuffling hexes and dice rolls
+    """
+    rng = random.Random(seed)
+
+    def operation():
+        Board(4, rng=rng)
+
+    return operation
+
+
+def benchmarkBalancedLayout(seed):
+    """
+    Generating a balanced layout of the standard board
+    """
+    rng = random.Random(seed)
+
+    def operation():
+        balancedLayout(rng=rng)
+
+    return operation
+
+
+def benchmarkGetInputValues(seed):
+    """
+    Getting the board's input values
+    """
+    board = Board(4, rng=random.Random(seed))
+
+    def operation():
+        board.getInputValues()
+
+    return operation
+
+
+def benchmarkAssembleInputVector(seed):
+    """
+    Assembling a player's full input vector
+    """
+    players = [Player(randomAction) for i in range(4)]
+    GameManager(players, seed=seed)
+
+    def operation():
+        players[0].assembleInputVector()
+
+    return operation
+
+
+def benchmarkLongestPath(seed):
+    """
+    Finding the longest road of a worst case 15 road network after its last road is built
+    """
+    road_network = RoadNetwork(Board(4, rng=random.Random(seed)), 0)
+    for edge_index in WORST_CASE_ROAD_EDGES[:-1]:
+        road_network.addRoad(edge_index)
+    new_board_nodes = [road_network.addRoad(WORST_CASE_ROAD_EDGES[-1])]
+    road_network.longestContinousPath()
+
+    def operation():
+        road_network.removeLastRoad(new_board_nodes[0])
+        new_board_nodes[0] = road_network.addRoad(WORST_CASE_ROAD_EDGES[-1])
+        road_network.longestContinousPath()
+
+    return operation
+
+
+def benchmarkBreakRoadAtNode(seed):
+    """
+    Breaking a worst case 15 road network at its busiest node and joining it back together
+    """
+    road_network = RoadNetwork(Board(4, rng=random.Random(seed)), 0)
+    for edge_index in WORST_CASE_ROAD_EDGES:
+        road_network.addRoad(edge_index)
+
+    def operation():
+        road_network.joinRoadAtNode(10, road_network.breakRoadAtNode(10))
+
+    return operation
+
+
+def benchmarkTurn(seed):
+    """
+    One turn part way through a game of randomAction players, including restoring the game to before the turn
+    """
+    players = [Player(randomAction) for i in range(4)]
+    game_manager = GameManager(players, seed=seed)
+
+    # Play the setup phase and 20 rounds, then keep a snapshot of the game to play the next turn from
+    snapshots = []
+
+    def snapshotAction(input_vector, rng=random):
+        if game_manager.turn_counter == 20 and len(snapshots) == 0:
+            snapshots.append(game_manager.snapshot())
+            raise StopIteration
+        return randomAction(input_vector, rng)
+
+    for player in players:
+        player.move_function = seedMoveFunction(snapshotAction, player.rng)
+    try:
+        game_manager.startGame()
+    except StopIteration:
+        pass
+    for player in players:
+        player.move_function = seedMoveFunction(randomAction, player.rng)
+
+    def operation():
+        game_manager.restore(snapshots[0])
+        game_manager.turn()
+
+    return operation
+
+
+def benchmarkGame(seed):
+    """
+    A full game of randomAction players. The same seeded game is played every time
+    """
+    def operation():
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players, seed=seed)
+        game_manager.startGame()
+
+    return operation
+
+
+# Benchmark name, function creating the operation to time, default number of operations per repeat
+BENCHMARKS = [('board_construction', benchmarkBoardConstruction, 200),
+              ('balanced_layout', benchmarkBalancedLayout, 20),
+              ('get_input_values', benchmarkGetInputValues, 100000),
+              ('assemble_input_vector', benchmarkAssembleInputVector, 10000),
+              ('longest_path_15_roads', benchmarkLongestPath, 200),
+              ('break_road_at_node', benchmarkBreakRoadAtNode, 2000),
+              ('turn', benchmarkTurn, 200),
+              ('game', benchmarkGame, 5)]
+
+
+def timeOperation(operation, number, repeats):
+    """
+    Times an operation, taking the fastest of several repeats to reduce noise
+    :param operation: Function taking no arguments
+    :param number: Number of times to call operation per repeat
+    :param repeats: Number of repeats
+    :return: Seconds per call
+    """
+    best_time = None
+    for repeat in range(repeats):
+        start_time = time.perf_counter()
+        for call in range(number):
+            operation()
+        repeat_time = time.perf_counter() - start_time
+
+        if best_time is None or repeat_time < best_time:
+            best_time = repeat_time
+
+    return best_time / number
+
+
+def runBenchmarks(names=None, repeats=5, scale=1.0, seed=0):
+    """
+    Runs benchmarks
+    :param names: List of benchmark names to run. Defaults to all
+    :param repeats: Number of repeats of each benchmark
+    :param scale: Multiplier on the default number of operations per repeat
+    :param seed: Seed used to set up every benchmark
+    :return: Results dictionary
+    """
+    results = {}
+    for name, create_operation, number in BENCHMARKS:
+        if names is not None and name not in names:
+            continue
+
+        number = max(1, int(number * scale))
+        seconds = timeOperation(create_operation(seed), number, repeats)
+        results[name] = {'seconds_per_operation': seconds,
+                         'operations_per_second': 1.0 / seconds if seconds > 0 else 0.0,
+                         'operations': number,
+                         'repeats': repeats}
+
+    return {'python': platform.python_version(),
+            'machine': platform.machine(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seed': seed,
+            'benchmarks': results}
+
+
+def compareResults(baseline, current, threshold=0.1):
+    """
+    Compares two results dictionaries
+    :param baseline: Results dictionary from an earlier run
+    :param current: Results dictionary to compare against baseline
+    :param threshold: Fraction a benchmark must slow down by to count as a regression
+    :return: List of dictionaries, one per benchmark in both runs
+    """
+    comparisons = []
+    for name, current_result in current['benchmarks'].items():
+        if name not in baseline['benchmarks']:
+            continue
+
+        baseline_seconds = baseline['benchmarks'][name]['seconds_per_operation']
+        current_seconds = current_result['seconds_per_operation']
+        ratio = current_seconds / baseline_seconds if baseline_seconds > 0 else 1.0
+        comparisons.append({'name': name,
+                            'baseline': baseline_seconds,
+                            'current': current_seconds,
+                            'ratio': ratio,
+                            'regressed': ratio > 1.0 + threshold})
+
+    return comparisons
+
+
+def formatResults(results, comparisons=None):
+    """
+    Formats results as a printable table
+    :param results: Results dictionary from runBenchmarks
+    :param comparisons: Optional list from compareResults
+    :return: String
+    """
+    comparison_by_name = {comparison['name']: comparison for comparison in comparisons or []}
+
+    lines = ['{:<24} {:>14} {:>14} {:>10}'.format('Benchmark', 'Time/op (us)', 'Ops/s', 'vs base')]
+    for name, result in results['benchmarks'].items():
+        change = ''
+        if name in comparison_by_name:
+            comparison = comparison_by_name[name]
+            change = '{:+.1%}'.format(comparison['ratio'] - 1.0) + (' !' if comparison['regressed'] else '')
+        lines.append('{:<24} {:>14.2f} {:>14.1f} {:>10}'.format(name, result['seconds_per_operation'] * 1e6,
+                                                               result['operations_per_second'], change))
+
+    return '\n'.join(lines)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Benchmark engine hot paths')
+    parser.add_argument('--output', help='File to write JSON results to')
+    parser.add_argument('--compare', help='JSON results file of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Slow down counted as a regression')
+    parser.add_argument('--benchmarks', nargs='+', default=None, help='Names of benchmarks to run (default: all)')
+    parser.add_argument('--repeats', type=int, default=5, help='Repeats of each benchmark')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier on number of operations')
+    parser.add_argument('--seed', type=int, default=0, help='Seed used to set up benchmarks')
+    parsed = parser.parse_args(arguments)
+
+    results = runBenchmarks(parsed.benchmarks, parsed.repeats, parsed.scale, parsed.seed)
+
+    comparisons = None
+    if parsed.compare is not None:
+        with open(parsed.compare) as baseline_file:
+            comparisons = compareResults(json.load(baseline_file), results, parsed.threshold)
+
+    print(formatResults(results, comparisons))
+
+    if parsed.output is not None:
+        with open(parsed.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    # Non-zero exit status when a benchmark has regressed, for use in scripts
+    if comparisons is not None and any(comparison['regressed'] for comparison in comparisons):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,15 +1,29 @@
-from random import shuffle
-from src.Graph import *
+import random
+from src.BoardTopology import *
+
+
+# Building types stored in Board.node_building
+EMPTY = 0
+SETTLEMENT = 1
+CITY = 2
+
+# Weights of settlement spot scores, on top of 1 per pip. Port bonuses are in the order of BoardNode.ports
+RESOURCE_MIX_WEIGHT = 1.0
+PORT_BONUSES = (1.0, 1.5, 1.5, 1.5, 1.5, 1.5)
+EXPANSION_WEIGHT = 0.25
 
 
 class BoardNode:
-    def __init__(self, ID, number_of_players):
+    __slots__ = ('ID', 'board', 'resource_probabilities', 'resource_dice_rolls', 'ports')
+
+    def __init__(self, ID, board):
         """
-        Class to represent node on board graph
+        Class to represent node on board graph. Occupancy is stored in the board's flat arrays
         :param ID: ID of node
-        :param number_of_players: number of players in game
+        :param board: Board instance node belongs to
         """
         self.ID = ID
+        self.board = board
 
         """
         Resources:
@@ -21,66 +35,103 @@ class BoardNode:
         self.resource_dice_rolls = [[], [], [], [], []]
 
         """
-        Settlements and cities:
-        - self.settlement and self.city are boolean lists stating if node has a settlement or city on it
-        - The index of the value refers to the player ID (player 1 is user)
+        Ports:
+        - self.ports is a boolean tuple stating if a port type exists on this node. Shared with the board topology
+        - tuple order is: [ 3:1, 2:1 Wheat, 2:1 Stone, 2:1 Brick, 2:1 Sheep, 2:1 Wood ]
         """
-        self.settlement = [0] * number_of_players
-        self.city = [0] * number_of_players
+        self.ports = board.topology.node_ports[ID]
 
+    """
+    Settlements and cities:
+    - self.settlement and self.city are boolean tuples stating if node has a settlement or city on it
+    - The index of the value refers to the player ID (player 1 is user)
+    - Both are views of Board.node_owner and Board.node_building. Assigning a list with a 1 for the owner places the
+      building, assigning all 0s removes it
+    """
+    @property
+    def settlement(self):
+        return self._buildingTuple(SETTLEMENT)
+
+    @settlement.setter
+    def settlement(self, values):
+        self._setBuilding(SETTLEMENT, values)
+
+    @property
+    def city(self):
+        return self._buildingTuple(CITY)
+
+    @city.setter
+    def city(self, values):
+        self._setBuilding(CITY, values)
+
+    @property
+    def connected_edges(self):
         """
-        Ports:
-        - self.ports is a boolean list stating if a port type exists on this node
-        - list order is: [ 3:1, 2:1 Wheat, 2:1 Stone, 2:1 Brick, 2:1 Sheep, 2:1 Wood ]
+        Edges which are connected to this node
+        :return: Tuple of BoardEdge instances
         """
-        self.ports = [0] * 6
-
-        # Edges which are connected to this node
-        self.connected_edges = []
+        return tuple(self.board.edges[edge_index] for edge_index in self.board.topology.node_edges[self.ID])
 
     def isEmpty(self):
         """
         Checks if node has not been built on
         :return: Bool - True if node is empty
         """
-        for i in range(len(self.city)):
-            if (self.settlement[i] == 1) or (self.city[i] == 1):
-                return False
+        return self.board.node_building[self.ID] == EMPTY
 
-        return True
+    def _buildingTuple(self, building):
+        values = [0] * self.board.number_of_players
+        if self.board.node_building[self.ID] == building:
+            values[self.board.node_owner[self.ID] - 1] = 1
+
+        return tuple(values)
+
+    def _setBuilding(self, building, values):
+        if 1 in values:
+            self.board.setNodeBuilding(self.ID, list(values).index(1), building)
+        elif self.board.node_building[self.ID] == building:
+            self.board.setNodeBuilding(self.ID, None, EMPTY)
 
 
 class BoardEdge:
-    def __init__(self, ID, node_1, node_2, number_of_players):
+    __slots__ = ('ID', 'board', 'nodes')
+
+    def __init__(self, ID, board):
         """
-        Class to represent edge on board graph
+        Class to represent edge on board graph. Occupancy is stored in the board's flat arrays
         :param ID: ID of edge
-        :param node_1: ID of first connected node
-        :param node_2: ID of second connected node
-        :param number_of_players: number of players in game
+        :param board: Board instance edge belongs to
         """
 
-        # Edge info
+        # Edge info. Connected nodes are shared with the board topology
         self.ID = ID
-        self.nodes = [node_1, node_2]
+        self.board = board
+        self.nodes = board.topology.edge_pairs[ID]
 
-        """
-        Roads:
-        - self.road is a boolean list stating if edge has road on it
-        - The index of the value refers to the player ID (player 1 is user)
-        """
-        self.road = [0] * number_of_players
+    """
+    Roads:
+    - self.road is a boolean tuple stating if edge has road on it
+    - The index of the value refers to the player ID (player 1 is user)
+    - It is a view of Board.edge_owner. Assigning a list with a 1 for the owner places the road, all 0s removes it
+    """
+    @property
+    def road(self):
+        values = [0] * self.board.number_of_players
+        if self.board.edge_owner[self.ID] != 0:
+            values[self.board.edge_owner[self.ID] - 1] = 1
+
+        return tuple(values)
+
+    @road.setter
+    def road(self, values):
+        self.board.setEdgeRoad(self.ID, list(values).index(1) if 1 in values else None)
 
     def isEmpty(self):
         """
         Checks if edge has not been built on
         :return: Bool - True if edge is empty
         """
-        for i in range(len(self.road)):
-            if self.road[i] == 1:
-                return False
-
-        return True
+        return self.board.edge_owner[self.ID] == 0
 
 
 class Board:
@@ -88,114 +139,157 @@ class Board:
     Class used to represent board
     """
 
-    def __init__(self, number_of_players):
+    def __init__(self, number_of_players, topology=STANDARD_TOPOLOGY, rng=random, layout=None):
         """
         Initialises representation of the board
         :param number_of_players: number of players in game
+        :param topology: BoardTopology describing how nodes, edges, hexes and ports connect. Shared between boards
+        :param rng: Random stream used to lay out hexes and dice rolls. Defaults to the global random module
+        :param layout: BoardLayout giving the resource and dice roll of each hex, e.g. from balancedLayout. None
+                       shuffles hexes and dice rolls with rng
         """
 
-        # Initialise nodes
-        number_of_nodes = 54
-        self.nodes = [None] * number_of_nodes
-        for node_id in range(number_of_nodes):
-            self.nodes[node_id] = BoardNode(node_id, number_of_players)
-
-        # Assign ports
-        port_locations = [
-            [0, 1, 14, 15, 26, 37, 47, 48],  # 3:1
-            [28, 38],                        # 2:1 Wheat
-            [7, 17],                         # 2:1 Stone
-            [45, 46],                        # 2:1 Brick
-            [3, 4],                          # 2:1 Sheep
-            [50, 51],                        # 2:1 Wood
-        ]
-
-        for type_index, port_list in enumerate(port_locations):
-            for node_index in port_list:
-                self.nodes[node_index].ports[type_index] = 1
-
-        # Initialise edges
-        edge_pairs = [[0, 1], [1, 2], [2, 3], [3, 4], [4, 5], [5, 6],
-                       [0, 8], [2, 10], [4, 12], [6, 14],
-                       [7, 8], [8, 9], [9, 10], [10, 11], [11, 12], [12, 13], [13, 14], [14, 15],
-                       [7, 17], [9, 19], [11, 21], [13, 23], [15, 25],
-                       [16, 17], [17, 18], [18, 19], [19, 20], [20, 21], [21, 22], [22, 23], [23, 24], [24, 25], [25, 26],
-                       [16, 27], [18, 29], [20, 31], [22, 33], [24, 35], [26, 37],
-                       [27, 28], [28, 29], [29, 30], [30, 31], [31, 32], [32, 33], [33, 34], [34, 35], [35, 36], [36, 37],
-                       [28, 38], [30, 40], [32, 42], [34, 44], [36, 46],
-                       [38, 39], [39, 40], [40, 41], [41, 42], [42, 43], [43, 44], [44, 45], [45, 46],
-                       [39, 47], [41, 49], [43, 51], [45, 53],
-                       [47, 48], [48, 49], [49, 50], [50, 51], [51, 52], [52, 53]]
-
-        self.node_connectivity_matrix = constructNodeConnectivityMatrix(edge_pairs)
-
-        self.edges = [None] * len(edge_pairs)
-        for edge_id in range(len(edge_pairs)):
-            self.edges[edge_id] = BoardEdge(edge_id, edge_pairs[edge_id][0], edge_pairs[edge_id][1], number_of_players)
-
-            # Add edges to list of connected edges on each node
-            self.nodes[edge_pairs[edge_id][0]].connected_edges.append(self.edges[edge_id])
-            self.nodes[edge_pairs[edge_id][1]].connected_edges.append(self.edges[edge_id])
-
-        # Define connectivity between nodes and hexes
-        # Each element is one hex and is a list of nodes that are connected to it
-        self.hex_node_connectivity = [[0, 1, 2, 8, 9, 10],
-                                      [2, 3, 4, 10, 11, 12],
-                                      [4, 5, 6, 12, 13, 14],
-                                      [7, 8, 9, 17, 18, 19],
-                                      [9, 10, 11, 19, 20, 21],
-                                      [11, 12, 13, 21, 22, 23],
-                                      [13, 14, 15, 23, 24, 25],
-                                      [16, 17, 18, 27, 28, 29],
-                                      [18, 19, 20, 29, 30, 31],
-                                      [20, 21, 22, 31, 32, 33],
-                                      [22, 23, 24, 33, 34, 35],
-                                      [24, 25, 26, 35, 36, 37],
-                                      [28, 29, 30, 38, 39, 40],
-                                      [30, 31, 32, 40, 41, 42],
-                                      [32, 33, 34, 42, 43, 44],
-                                      [34, 35, 36, 44, 45, 46],
-                                      [39, 40, 41, 47, 48, 49],
-                                      [41, 42, 43, 49, 50, 51],
-                                      [43, 44, 45, 51, 52, 53]]
-
-        # Create all hexes - resource order is [ Wheat, Stone, Brick, Sheep, Wood ]
-        number_of_resource = [4, 3, 3, 4, 4]
-        self.hexes = []
-        for resource_type in range(len(number_of_resource)):
-            for i in range(number_of_resource[resource_type]):
-                self.hexes.append(Hex(0, resource_type))
-        self.hexes.append(Hex(0, -1))
-
-        # Shuffle list
-        shuffle(self.hexes)
-
-        # Choose dice roles !!!Currently chosen at random but should implement proper order
-        number_markers = [2, 5, 4, 6, 3, 9, 8, 11, 11, 10, 6, 3, 8, 4, 8, 10, 11, 12]
+        # Static tables are shared with every other board using the same topology
+        self.topology = topology
+        self.edge_pairs = topology.edge_pairs
+        self.node_neighbours = topology.node_neighbours
+        self.hex_node_connectivity = topology.hex_node_connectivity
+
+        """
+        Occupancy:
+
+        - self.node_owner stores 1 + index of player who has built on each node, 0 if empty
+        - self.node_building stores type of building on each node: EMPTY, SETTLEMENT or CITY
+        - self.edge_owner stores 1 + index of player who has built a road on each edge, 0 if empty
+        - self.node_block_count stores number of built on nodes within one edge of each node (including itself). Nodes
+          with a count of 0 are open under the distance rule
+        """
+        number_of_nodes = topology.number_of_nodes
+        self.number_of_players = number_of_players
+        self.node_owner = bytearray(number_of_nodes)
+        self.node_building = bytearray(number_of_nodes)
+        self.edge_owner = bytearray(topology.number_of_edges)
+        self.node_block_count = bytearray(number_of_nodes)
+
+        # Initialise nodes and edges
+        self.nodes = [BoardNode(node_id, self) for node_id in range(number_of_nodes)]
+        self.edges = [BoardEdge(edge_id, self) for edge_id in range(topology.number_of_edges)]
+
+        """
+        Hexes:
+
+        - self.hexes lists every hex, including deserts
+        - self.hex_dice_roll_list[roll] lists the hexes producing resources on each dice roll, None if there are none
+        - self.number_of_hex_ids is number of hex IDs in use, which the robber can be moved to
+        - self.layout is the BoardLayout hexes were placed from, None if they were shuffled
+        """
         self.hex_dice_roll_list = [None] * 13
-        shuffle(number_markers)
-        hex_index = 0
-        for hexagon in self.hexes:
-            hexagon.ID = hex_index
-            if hexagon.resource_index != -1:
-                hexagon.dice_roll = number_markers[hex_index]
-                hexagon.probability = probabilityOfRoll(number_markers[hex_index])
-
-                if not self.hex_dice_roll_list[number_markers[hex_index]]:
-                    self.hex_dice_roll_list[number_markers[hex_index]] = [hexagon]
-                else:
-                    self.hex_dice_roll_list[number_markers[hex_index]].append(hexagon)
-
-                # Update connected nodes
-                for node in self.hex_node_connectivity[hex_index]:
-                    self.nodes[node].resource_dice_rolls[hexagon.resource_index].append(hexagon.dice_roll)
-                    if hexagon.dice_roll not in self.nodes[node].resource_dice_rolls[hexagon.resource_index]:
-                        self.nodes[node].resource_probabilities[hexagon.resource_index] += hexagon.probability
-                hex_index += 1
+        self.layout = layout
+        if layout is None:
+            # Create all hexes - resource order is [ Wheat, Stone, Brick, Sheep, Wood ]
+            number_of_resource = topology.resource_counts
+            self.hexes = []
+            for resource_type in range(len(number_of_resource)):
+                for i in range(number_of_resource[resource_type]):
+                    self.hexes.append(Hex(0, resource_type))
+            for i in range(topology.number_of_deserts):
+                self.hexes.append(Hex(0, -1))
+
+            # Shuffle list
+            rng.shuffle(self.hexes)
+
+            # Choose dice roles at random. Hex IDs only count hexes with a resource, so deserts take no position
+            number_markers = list(topology.number_tokens)
+            rng.shuffle(number_markers)
+            hex_index = 0
+            for hexagon in self.hexes:
+                hexagon.ID = hex_index
+                if hexagon.resource_index != -1:
+                    hexagon.dice_roll = number_markers[hex_index]
+                    self._placeHex(hexagon)
+                    hex_index += 1
+            self.number_of_hex_ids = hex_index
+
+        else:
+            # Every hex takes the position of its ID
+            resources, dice_rolls = layout
+            if len(resources) != topology.number_of_hexes or len(dice_rolls) != topology.number_of_hexes:
+                raise ValueError('Layout does not have one hex for each hex of topology')
+
+            self.hexes = [Hex(hex_index, resource_index) for hex_index, resource_index in enumerate(resources)]
+            for hexagon, dice_roll in zip(self.hexes, dice_rolls):
+                if hexagon.resource_index != -1:
+                    hexagon.dice_roll = dice_roll
+                    self._placeHex(hexagon)
+            self.number_of_hex_ids = len(self.hexes)
+
+        # Dice rolls are fixed from here on
+        for node in self.nodes:
+            node.resource_dice_rolls = tuple(tuple(dice_rolls) for dice_rolls in node.resource_dice_rolls)
+
+        """
+        Input values:
+        
+        - self.input_values is a flat list of the board parameters given to players, in order:
+          [ Resource probabilities (5 per node), Settlements (1 per player per node), Cities (1 per player per node),
+            Ports (6 per node), Roads (1 per player per edge) ]
+        - It is assembled once here then updated in place whenever a building or road is placed
+        """
+        self._settlement_offset = 5 * number_of_nodes
+        self._city_offset = self._settlement_offset + number_of_players * number_of_nodes
+        self._port_offset = self._city_offset + number_of_players * number_of_nodes
+        self._road_offset = self._port_offset + 6 * number_of_nodes
+        self.input_values = self.assembleInputValues()
+
+        # Ranked settlement spots, only built when first needed then updated as nodes are built on
+        self._settlement_spots = None
+
+    def _placeHex(self, hexagon):
+        # Add a hex with a resource and dice roll to the roll lookup and its nodes' resources
+        hexagon.probability = probabilityOfRoll(hexagon.dice_roll)
+
+        if not self.hex_dice_roll_list[hexagon.dice_roll]:
+            self.hex_dice_roll_list[hexagon.dice_roll] = [hexagon]
+        else:
+            self.hex_dice_roll_list[hexagon.dice_roll].append(hexagon)
+
+        # Update connected nodes
+        # Node probability of getting resource counts each roll once, even if two hexes share it
+        for node in self.hex_node_connectivity[hexagon.ID]:
+            if hexagon.dice_roll not in self.nodes[node].resource_dice_rolls[hexagon.resource_index]:
+                self.nodes[node].resource_probabilities[hexagon.resource_index] += hexagon.probability
+            self.nodes[node].resource_dice_rolls[hexagon.resource_index].append(hexagon.dice_roll)
+
+    @property
+    def node_connectivity_matrix(self):
+        """
+        Node connectivity matrix, shared with every board using the same topology
+        :return: Matrix of connectivity. For element in row i, column j, a value of 1 represents a connection between node i and node j
+        """
+        return self.topology.node_connectivity_matrix
+
+    @property
+    def settlement_spots(self):
+        """
+        Index of nodes ranked as settlement spots, built on first use as most games never need it
+        :return: SettlementSpots instance, kept up to date with buildings placed and removed from then on
+        """
+        if self._settlement_spots is None:
+            self._settlement_spots = SettlementSpots(self)
+            self._settlement_spots.rebuild()
+
+        return self._settlement_spots
 
     def getInputValues(self):
         """
-        Assemble board parameters
+        Get board parameters. The list returned is updated in place as the board changes so must not be modified
+        :return: Board parameters
+        """
+        return self.input_values
+
+    def assembleInputValues(self):
+        """
+        Assemble board parameters by walking all nodes and edges
         :return: Board parameters
         """
         # Node inputs
@@ -217,19 +311,123 @@ class Board:
 
         return resource_probabilities + settlements + cities + ports + roads
 
+    def placeSettlement(self, node_index, player_index):
+        """
+        Place settlement on node. Does not check rules
+        :param node_index: Index of node to build on
+        :param player_index: Index of player building settlement
+        """
+        self.setNodeBuilding(node_index, player_index, SETTLEMENT)
+
+    def placeCity(self, node_index, player_index):
+        """
+        Replace settlement on node with city. Does not check rules
+        :param node_index: Index of node to build on
+        :param player_index: Index of player building city
+        """
+        self.setNodeBuilding(node_index, player_index, CITY)
+
+    def placeRoad(self, edge_index, player_index):
+        """
+        Place road on edge. Does not check rules
+        :param edge_index: Index of edge to build on
+        :param player_index: Index of player building road
+        """
+        self.setEdgeRoad(edge_index, player_index)
+
+    def setNodeBuilding(self, node_index, player_index, building):
+        """
+        Set building on node, replacing any existing building, and update input values. Does not check rules
+        :param node_index: Index of node
+        :param player_index: Index of player who owns building. Ignored if building is EMPTY
+        :param building: EMPTY, SETTLEMENT or CITY
+        """
+        # Clear input value of existing building
+        if self.node_building[node_index] != EMPTY:
+            offset = self._settlement_offset if self.node_building[node_index] == SETTLEMENT else self._city_offset
+            self.input_values[offset + node_index * self.number_of_players + self.node_owner[node_index] - 1] = 0
+            if building == EMPTY:
+                self._changeNodeBlockCount(node_index, -1)
+                if self._settlement_spots is not None:
+                    self._settlement_spots.nodesUnblocked(node_index)
+        elif building != EMPTY:
+            self._changeNodeBlockCount(node_index, 1)
+
+        self.node_building[node_index] = building
+        if building == EMPTY:
+            self.node_owner[node_index] = 0
+        else:
+            self.node_owner[node_index] = player_index + 1
+            offset = self._settlement_offset if building == SETTLEMENT else self._city_offset
+            self.input_values[offset + node_index * self.number_of_players + player_index] = 1
+
+    def _changeNodeBlockCount(self, node_index, change):
+        # Node and its neighbours are blocked while node is built on
+        node_block_count = self.node_block_count
+        node_block_count[node_index] += change
+        for neighbour in self.node_neighbours[node_index]:
+            node_block_count[neighbour] += change
+
+    def setEdgeRoad(self, edge_index, player_index):
+        """
+        Set road on edge, replacing any existing road, and update input values. Does not check rules
+        :param edge_index: Index of edge
+        :param player_index: Index of player who owns road, None to remove road
+        """
+        if self.edge_owner[edge_index] != 0:
+            self.input_values[self._road_offset + edge_index * self.number_of_players +
+                              self.edge_owner[edge_index] - 1] = 0
+
+        if player_index is None:
+            self.edge_owner[edge_index] = 0
+        else:
+            self.edge_owner[edge_index] = player_index + 1
+            self.input_values[self._road_offset + edge_index * self.number_of_players + player_index] = 1
+
+    def snapshotOccupancy(self):
+        """
+        Capture which nodes and edges are built on. The layout of hexes and dice rolls is fixed for a game so is not
+        included
+        :return: Tuple of bytes for restoreOccupancy
+        """
+        return bytes(self.node_owner), bytes(self.node_building), bytes(self.edge_owner)
+
+    def restoreOccupancy(self, snapshot):
+        """
+        Restore nodes and edges built on to state captured by snapshotOccupancy and update input values to match
+        :param snapshot: Tuple from snapshotOccupancy
+        """
+        self.node_owner[:], self.node_building[:], self.edge_owner[:] = snapshot
+
+        # Clear settlement, city and road input values then set those built on
+        number_of_node_values = self.number_of_players * len(self.nodes)
+        self.input_values[self._settlement_offset:self._port_offset] = [0] * (2 * number_of_node_values)
+        self.input_values[self._road_offset:] = [0] * (self.number_of_players * len(self.edges))
+
+        self.node_block_count[:] = bytes(len(self.nodes))
+        for node_index, building in enumerate(self.node_building):
+            if building != EMPTY:
+                offset = self._settlement_offset if building == SETTLEMENT else self._city_offset
+                self.input_values[offset + node_index * self.number_of_players + self.node_owner[node_index] - 1] = 1
+                self._changeNodeBlockCount(node_index, 1)
+
+        for edge_index, owner in enumerate(self.edge_owner):
+            if owner != 0:
+                self.input_values[self._road_offset + edge_index * self.number_of_players + owner - 1] = 1
+
+        if self._settlement_spots is not None:
+            self._settlement_spots.rebuild()
+
     def connectedNodesBuiltOn(self, node_index):
         """
         Check if any nodes connected to node node_index are built on
         :param node_index: Index of node to check
         :return: Bool - True if connected nodes are empty
         """
-        node_connectivity = self.node_connectivity_matrix[node_index]
-        for i, node in enumerate(node_connectivity):
-            # If connected
-            if node != 0:
-                # If connected node is built on return False
-                if not self.nodes[i].isEmpty():
-                    return False
+        for i in self.node_neighbours[node_index]:
+            # If connected node is built on return False
+            if self.node_building[i] != EMPTY:
+                return False
 
         return True
 
@@ -241,8 +439,8 @@ class Board:
         :return: Bool - True if any connected edges have a road built by player player_index on them
         """
         # For each connected edge check road
-        for edge in self.nodes[node_index].connected_edges:
-            if edge.road[player_index] == 1:
+        for edge_index in self.topology.node_edges[node_index]:
+            if self.edge_owner[edge_index] == player_index + 1:
                 return True
 
         return False
@@ -255,17 +453,126 @@ class Board:
         :return: Bool - True if either connected node is connected
         """
         # Check if player has settlement or city on either node or if player has a road connected to either node
-        for node_index in range(2):
-            if self.nodes[self.edges[edge_index].nodes[node_index]].settlement[player_index] == 1 or self.nodes[self.edges[edge_index].nodes[node_index]].city[player_index] == 1:
+        for node_index in self.topology.edge_pairs[edge_index]:
+            if self.node_owner[node_index] == player_index + 1:
                 return True
 
-            if self.nodeHasRoad(self.edges[edge_index].nodes[node_index], player_index):
+            if self.nodeHasRoad(node_index, player_index):
                 return True
 
         return False
 
 
+class SettlementSpots:
+    def __init__(self, board):
+        """
+        Index of nodes ranked by how good a spot they are for a settlement. Scores depend only on the board layout so are
+        computed once, and the best spot still open under the distance rule is kept track of as nodes are built on
+        :param board: Board instance index belongs to
+        """
+        self.board = board
+        number_of_nodes = len(board.nodes)
+
+        """
+        Node values, fixed for the board layout:
+
+        - self.pips[node] is total number of dice combinations (out of 36) giving node resources
+        - self.resource_mix[node] is number of different resources node gets
+        - self.port_bonus[node] is value of node's ports
+        - self.two_step_spots[node] is nodes two edges away, the nearest spots a settlement there could expand to.
+          Shared with the board topology
+        - self.expansion[node] is most pips of any two step spot
+        - self.scores[node] is weighted sum of the above
+        """
+        self.pips = [0] * number_of_nodes
+        self.resource_mix = [0] * number_of_nodes
+        self.port_bonus = [0.0] * number_of_nodes
+        for node in board.nodes:
+            for dice_rolls in node.resource_dice_rolls:
+                self.pips[node.ID] += sum(pipsOfRoll(dice_roll) for dice_roll in dice_rolls)
+                self.resource_mix[node.ID] += int(len(dice_rolls) > 0)
+            self.port_bonus[node.ID] = sum(bonus for bonus, port in zip(PORT_BONUSES, node.ports) if port)
+
+        self.two_step_spots = board.topology.node_two_step
+        self.expansion = [max([self.pips[spot] for spot in spots], default=0) for spots in self.two_step_spots]
+
+        self.scores = [self.pips[node_index] + RESOURCE_MIX_WEIGHT * self.resource_mix[node_index] +
+                       self.port_bonus[node_index] + EXPANSION_WEIGHT * self.expansion[node_index]
+                       for node_index in range(number_of_nodes)]
+
+        """
+        Ranking:
+
+        - self.ranked_nodes lists nodes from best to worst score, ties in node order
+        - self.rank[node] is position of node in self.ranked_nodes
+        - self.block_count is the board's count of built on nodes within one edge of each node, 0 for open nodes
+        - self._first is position in self.ranked_nodes of the best open node, or of a blocked node before it
+        """
+        self.ranked_nodes = tuple(sorted(range(number_of_nodes), key=lambda node_index: -self.scores[node_index]))
+        self.rank = [0] * number_of_nodes
+        for rank, node_index in enumerate(self.ranked_nodes):
+            self.rank[node_index] = rank
+
+        self.block_count = board.node_block_count
+        self._first = 0
+
+    def nodesUnblocked(self, node_index):
+        """
+        Move back to any spots opened up after the building on a node is removed. Nodes being blocked need no update,
+        as bestSpot skips them
+        :param node_index: Index of node cleared
+        """
+        for blocked_node in (node_index,) + self.board.node_neighbours[node_index]:
+            if self.block_count[blocked_node] == 0 and self.rank[blocked_node] < self._first:
+                self._first = self.rank[blocked_node]
+
+    def rebuild(self):
+        """
+        Start searching from the best spot again, e.g. after the board's occupancy has been restored
+        """
+        self._first = 0
+
+    def isOpen(self, node_index):
+        """
+        Check node can be built on under the distance rule
+        :param node_index: Index of node to check
+        :return: Bool - True if node and its neighbours are empty
+        """
+        return self.block_count[node_index] == 0
+
+    def bestSpot(self, mask=None):
+        """
+        Find the best scoring open node. Blocked nodes at the top of the ranking are skipped once, so repeated calls
+        are constant time
+        :param mask: Optional list with 1 for each node which may be chosen, e.g. a settlement mask from LegalActions
+        :return: Index of node, None if no open node is allowed by mask
+        """
+        # Move past nodes which have been blocked since the last call
+        ranked_nodes = self.ranked_nodes
+        while self._first < len(ranked_nodes) and self.block_count[ranked_nodes[self._first]] != 0:
+            self._first += 1
+
+        for node_index in self.openSpots():
+            if mask is None or mask[node_index] == 1:
+                return node_index
+
+        return None
+
+    def openSpots(self):
+        """
+        Generator of open nodes from best to worst score
+        :return: Generator of node indexes
+        """
+        block_count = self.block_count
+        for rank in range(self._first, len(self.ranked_nodes)):
+            node_index = self.ranked_nodes[rank]
+            if block_count[node_index] == 0:
+                yield node_index
+
+
 class Hex:
+    __slots__ = ('ID', 'resource_index', 'dice_roll', 'probability')
+
     def __init__(self, ID, resource_index):
         self.ID = ID
         self.resource_index = resource_index
@@ -273,6 +580,15 @@ class Hex:
         self.probability = 0
 
 
+def pipsOfRoll(number):
+    """
+    Number of ways two dice can total number, i.e. the pips on its number token
+    :param number: Dice roll from 2 to 12
+    :return: Number of dice combinations out of 36
+    """
+    return 6 - abs(7 - number)
+
+
 def probabilityOfRoll(number):
     a = [0, 0, 1.0/36.0, 2.0/36.0, 3.0/36.0, 4.0/36.0, 5.0/36.0, 6.0/36.0, 5.0/36.0, 4.0/36.0, 3.0/36.0, 2.0/36.0, 1.0/36.0]
     return a[number]
\ No newline at end of file
@@ -0,0 +1,276 @@
+import mmap
+import random
+import struct
+from collections import namedtuple
+
+from src.BoardTopology import *
+from src.RandomStreams import *
+
+"""
+Balanced board layouts.
+
+A Board normally shuffles its hexes and number tokens uniformly, so some layouts are far better for one seat than
+another and agents need many games to be compared fairly. balancedLayout places tiles under the usual constraints of a
+fair board instead:
+
+- No two neighbouring hexes have the same resource
+- No two neighbouring hexes have the same number token, and 6s and 8s are never next to each other
+
+Tiles are placed by a backtracking search with forward checking, so a tile which would break a constraint is never
+tried and the search backs up as soon as any hex or remaining tile runs out of options.
+
+Layouts can be written to a cache file once, then every batch draws the same pre-validated layouts by index:
+
+    writeLayoutCache('layouts.bin', 1000)
+    with LayoutCache('layouts.bin') as layouts:
+        game_manager = GameManager(players, seed=seed, layout=layouts[seed % len(layouts)])
+"""
+
+# Position of each tile on a board. resources[hex] is the resource index of each hex, -1 for a desert, and
+# dice_rolls[hex] is its number token, 0 for a desert
+BoardLayout = namedtuple('BoardLayout', ['resources', 'dice_rolls'])
+
+# Number tokens which may not be next to each other
+RED_NUMBERS = (6, 8)
+
+# Tiles placed per position before a search starts again with a new random order, so an unlucky early choice doesn't
+# lead to a long search
+SEARCH_LIMIT = 10
+
+# Searches started again before balancedLayout gives up
+MAX_RESTARTS = 1000
+
+# Cache files are a header followed by each layout as one signed byte per hex of resources then one byte per hex of
+# dice rolls
+CACHE_MAGIC = b'CLAY'
+CACHE_HEADER = struct.Struct('<4sHI')  # magic, number of hexes, number of layouts
+
+
+def balancedLayout(topology=STANDARD_TOPOLOGY, rng=random, max_restarts=MAX_RESTARTS):
+    """
+    Lay out the tiles of a topology so no neighbouring hexes share a resource or number, and no red numbers touch
+    :param topology: BoardTopology, which gives the tiles and which hexes neighbour each other
+    :param rng: Random stream choosing between balanced layouts. Defaults to the global random module
+    :param max_restarts: Number of times the search can start again with a new random order before giving up
+    :return: BoardLayout
+    """
+    resource_values = [-1] + list(range(len(topology.resource_counts)))
+    resource_counts = [topology.number_of_deserts] + list(topology.resource_counts)
+    roll_values = sorted(set(topology.number_tokens))
+    roll_counts = [topology.number_tokens.count(roll) for roll in roll_values]
+
+    for attempt in range(max_restarts + 1):
+        resources = _searchPlacement(topology.hex_neighbours, resource_values, resource_counts, _sameValue, rng)
+        if resources is None:
+            continue
+
+        # Number tokens go on every hex but the deserts
+        resource_hexes = [hex_index for hex_index, resource in enumerate(resources) if resource != -1]
+        positions = {hex_index: position for position, hex_index in enumerate(resource_hexes)}
+        neighbours = [[positions[neighbour] for neighbour in topology.hex_neighbours[hex_index]
+                       if neighbour in positions] for hex_index in resource_hexes]
+        rolls = _searchPlacement(neighbours, roll_values, roll_counts, _numbersClash, rng)
+        if rolls is None:
+            continue
+
+        dice_rolls = [0] * topology.number_of_hexes
+        for position, hex_index in enumerate(resource_hexes):
+            dice_rolls[hex_index] = rolls[position]
+
+        return BoardLayout(tuple(resources), tuple(dice_rolls))
+
+    raise ValueError('No balanced layout found in ' + str(max_restarts) + ' restarts')
+
+
+def isBalanced(layout, topology=STANDARD_TOPOLOGY):
+    """
+    Checks a layout has exactly the tiles of a topology and meets every constraint of balancedLayout
+    :param layout: BoardLayout
+    :param topology: BoardTopology
+    :return: Bool - True if layout is balanced
+    """
+    resources, dice_rolls = layout
+    if len(resources) != topology.number_of_hexes or len(dice_rolls) != topology.number_of_hexes:
+        return False
+
+    # Tiles must match the topology's
+    expected_resources = [-1] * topology.number_of_deserts
+    for resource_index, count in enumerate(topology.resource_counts):
+        expected_resources += [resource_index] * count
+    if sorted(resources) != expected_resources:
+        return False
+    token_rolls = [roll for roll, resource in zip(dice_rolls, resources) if resource != -1]
+    if sorted(token_rolls) != sorted(topology.number_tokens):
+        return False
+    if any(roll != 0 for roll, resource in zip(dice_rolls, resources) if resource == -1):
+        return False
+
+    for hex_index, neighbours in enumerate(topology.hex_neighbours):
+        for neighbour in neighbours:
+            if _sameValue(resources[hex_index], resources[neighbour]):
+                return False
+            if resources[hex_index] != -1 and resources[neighbour] != -1 and \
+                    _numbersClash(dice_rolls[hex_index], dice_rolls[neighbour]):
+                return False
+
+    return True
+
+
+def _sameValue(value_1, value_2):
+    return value_1 == value_2
+
+
+def _numbersClash(roll_1, roll_2):
+    return roll_1 == roll_2 or (roll_1 in RED_NUMBERS and roll_2 in RED_NUMBERS)
+
+
+def _searchPlacement(neighbours, values, counts, conflicts, rng):
+    """
+    Give every position a value so no two neighbouring positions conflict, using each value its number of times
+    :param neighbours: Neighbouring positions of each position
+    :param values: List of values to place
+    :param counts: Number of positions to give each value. Counts must add up to the number of positions
+    :param conflicts: Function of two values, True if they can't be on neighbouring positions
+    :param rng: Random stream ordering the values tried
+    :return: List of value of each position. None if SEARCH_LIMIT tiles per position were placed without finding a
+             placement
+    """
+    number_of_positions = len(neighbours)
+    value_range = range(len(values))
+    conflicting = [[other for other in value_range if conflicts(values[value], values[other])] for value in value_range]
+
+    """
+    Search state:
+
+    - placed[position] is the index in values of the value placed on each position, None if not yet placed
+    - remaining[value] is number of positions still to be given each value
+    - blocked[position][value] is number of placed neighbours which stop position taking value
+    """
+    placed = [None] * number_of_positions
+    remaining = list(counts)
+    blocked = [[0] * len(values) for position in range(number_of_positions)]
+    tiles_placed = 0
+
+    def place(position, value, change):
+        for neighbour in neighbours[position]:
+            neighbour_blocked = blocked[neighbour]
+            for other in conflicting[value]:
+                neighbour_blocked[other] += change
+
+    def search(positions_left):
+        nonlocal tiles_placed
+        if positions_left == 0:
+            return True
+
+        # Every remaining value needs enough open positions which can take it
+        open_positions = [position for position in range(number_of_positions) if placed[position] is None]
+        for value in value_range:
+            if remaining[value] > sum(1 for position in open_positions if blocked[position][value] == 0):
+                return False
+
+        # Place on the position with fewest options first
+        best_position = None
+        best_options = None
+        for position in open_positions:
+            options = [value for value in value_range if remaining[value] > 0 and blocked[position][value] == 0]
+            if best_options is None or len(options) < len(best_options):
+                best_position = position
+                best_options = options
+                if len(options) == 0:
+                    return False
+
+        rng.shuffle(best_options)
+        for value in best_options:
+            tiles_placed += 1
+            if tiles_placed > SEARCH_LIMIT * number_of_positions:
+                return False
+
+            placed[best_position] = value
+            remaining[value] -= 1
+            place(best_position, value, 1)
+            if search(positions_left - 1):
+                return True
+            place(best_position, value, -1)
+            remaining[value] += 1
+            placed[best_position] = None
+
+        return False
+
+    if search(number_of_positions):
+        return [values[value] for value in placed]
+    if tiles_placed <= SEARCH_LIMIT * number_of_positions:
+        raise ValueError('Tiles can\'t be placed without neighbouring tiles conflicting')
+    return None
+
+
+def writeLayoutCache(path, number_of_layouts, topology=STANDARD_TOPOLOGY, seed=0):
+    """
+    Generate balanced layouts and write them to a cache file. Layout i depends only on seed and i, so caches written
+    with the same seed agree on every layout they share
+    :param path: File to write
+    :param number_of_layouts: Number of layouts to generate
+    :param topology: BoardTopology of layouts
+    :param seed: Seed of layouts
+    """
+    with open(path, 'wb') as cache_file:
+        cache_file.write(CACHE_HEADER.pack(CACHE_MAGIC, topology.number_of_hexes, number_of_layouts))
+        for layout_index in range(number_of_layouts):
+            layout = balancedLayout(topology, deriveStream(seed, 'layout' + str(layout_index)))
+            if not isBalanced(layout, topology):
+                raise ValueError('Generated layout ' + str(layout_index) + ' is not balanced')
+            cache_file.write(struct.pack('<' + str(topology.number_of_hexes) + 'b', *layout.resources))
+            cache_file.write(bytes(layout.dice_rolls))
+
+
+class LayoutCache:
+    def __init__(self, path, topology=STANDARD_TOPOLOGY):
+        """
+        Read only, memory-mapped view of layouts written by writeLayoutCache
+        :param path: Cache file
+        :param topology: BoardTopology the layouts must be for
+        """
+        with open(path, 'rb') as cache_file:
+            self._map = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, number_of_hexes, self._length = CACHE_HEADER.unpack_from(self._map)
+        if magic != CACHE_MAGIC:
+            raise ValueError(path + ' is not a layout cache')
+        if number_of_hexes != topology.number_of_hexes:
+            raise ValueError('Layouts in ' + path + ' are for ' + str(number_of_hexes) + ' hexes, not ' +
+                             str(topology.number_of_hexes))
+        if len(self._map) != CACHE_HEADER.size + self._length * 2 * number_of_hexes:
+            raise ValueError(path + ' is truncated')
+
+        self.number_of_hexes = number_of_hexes
+        self._resource_format = struct.Struct('<' + str(number_of_hexes) + 'b')
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, layout_index):
+        """
+        Get a layout
+        :param layout_index: Index of layout
+        :return: BoardLayout
+        """
+        if layout_index < 0:
+            layout_index += self._length
+        if not 0 <= layout_index < self._length:
+            raise IndexError('Layout index out of range')
+
+        start = CACHE_HEADER.size + layout_index * 2 * self.number_of_hexes
+        resources = self._resource_format.unpack_from(self._map, start)
+        dice_rolls = tuple(self._map[start + self.number_of_hexes:start + 2 * self.number_of_hexes])
+        return BoardLayout(resources, dice_rolls)
+
+    def close(self):
+        """
+        Unmap the cache file
+        """
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
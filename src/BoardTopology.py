@@ -0,0 +1,307 @@
+from src.Graph import *
+
+"""
+Static board topology.
+
+The layout of nodes, edges, hexes and ports never changes during or between games, so it is calculated once per board
+geometry and shared by every Board using it. All tables are tuples so they can't be modified by accident.
+
+Geometries other than the standard 19 hex board come from hexGridTopology, which lays out rows of pointy topped hexes
+and derives every table from their coordinates:
+
+    topology = hexGridTopology(hexagonRowLengths(3))           # 37 hexes
+    topology = hexGridTopology(FIVE_SIX_PLAYER_ROW_LENGTHS)    # 30 hexes, as the 5-6 player extension
+    game_manager = GameManager(players, topology=topology)
+
+Nodes are numbered row by row from the top left, so the standard geometry gets the same numbering as the tables below.
+"""
+
+# Nodes connected by each edge
+EDGE_PAIRS = ((0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (5, 6),
+              (0, 8), (2, 10), (4, 12), (6, 14),
+              (7, 8), (8, 9), (9, 10), (10, 11), (11, 12), (12, 13), (13, 14), (14, 15),
+              (7, 17), (9, 19), (11, 21), (13, 23), (15, 25),
+              (16, 17), (17, 18), (18, 19), (19, 20), (20, 21), (21, 22), (22, 23), (23, 24), (24, 25), (25, 26),
+              (16, 27), (18, 29), (20, 31), (22, 33), (24, 35), (26, 37),
+              (27, 28), (28, 29), (29, 30), (30, 31), (31, 32), (32, 33), (33, 34), (34, 35), (35, 36), (36, 37),
+              (28, 38), (30, 40), (32, 42), (34, 44), (36, 46),
+              (38, 39), (39, 40), (40, 41), (41, 42), (42, 43), (43, 44), (44, 45), (45, 46),
+              (39, 47), (41, 49), (43, 51), (45, 53),
+              (47, 48), (48, 49), (49, 50), (50, 51), (51, 52), (52, 53))
+
+# Nodes connected to each hex
+HEX_NODE_CONNECTIVITY = ((0, 1, 2, 8, 9, 10),
+                         (2, 3, 4, 10, 11, 12),
+                         (4, 5, 6, 12, 13, 14),
+                         (7, 8, 9, 17, 18, 19),
+                         (9, 10, 11, 19, 20, 21),
+                         (11, 12, 13, 21, 22, 23),
+                         (13, 14, 15, 23, 24, 25),
+                         (16, 17, 18, 27, 28, 29),
+                         (18, 19, 20, 29, 30, 31),
+                         (20, 21, 22, 31, 32, 33),
+                         (22, 23, 24, 33, 34, 35),
+                         (24, 25, 26, 35, 36, 37),
+                         (28, 29, 30, 38, 39, 40),
+                         (30, 31, 32, 40, 41, 42),
+                         (32, 33, 34, 42, 43, 44),
+                         (34, 35, 36, 44, 45, 46),
+                         (39, 40, 41, 47, 48, 49),
+                         (41, 42, 43, 49, 50, 51),
+                         (43, 44, 45, 51, 52, 53))
+
+# Nodes with each type of port
+PORT_LOCATIONS = ((0, 1, 14, 15, 26, 37, 47, 48),  # 3:1
+                  (28, 38),                        # 2:1 Wheat
+                  (7, 17),                         # 2:1 Stone
+                  (45, 46),                        # 2:1 Brick
+                  (3, 4),                          # 2:1 Sheep
+                  (50, 51))                        # 2:1 Wood
+
+# Hexes in each row of the standard board and of the 5-6 player extension
+STANDARD_ROW_LENGTHS = (3, 4, 5, 4, 3)
+FIVE_SIX_PLAYER_ROW_LENGTHS = (3, 4, 5, 6, 5, 4, 3)
+
+# Hexes of each resource on the standard board, in order [ Wheat, Stone, Brick, Sheep, Wood ], and its number tokens in
+# the order they are shuffled from
+STANDARD_RESOURCE_COUNTS = (4, 3, 3, 4, 4)
+STANDARD_NUMBER_TOKENS = (2, 5, 4, 6, 3, 9, 8, 11, 11, 10, 6, 3, 8, 4, 8, 10, 11, 12)
+
+# Number tokens of each roll in the printed game, scaled to the size of generated geometries
+NUMBER_TOKEN_FREQUENCIES = {2: 1, 3: 2, 4: 2, 5: 2, 6: 2, 8: 2, 9: 2, 10: 2, 11: 2, 12: 1}
+
+# Ports on the standard board per coastal edge, used to place ports on generated geometries
+PORTS_PER_COASTAL_EDGE = (9, 30)
+
+
+class BoardTopology:
+    def __init__(self, number_of_nodes, edge_pairs, hex_node_connectivity, port_locations, row_lengths=None):
+        """
+        Immutable tables describing how nodes, edges, hexes and ports connect
+        :param number_of_nodes: Number of nodes on board
+        :param edge_pairs: Nodes connected by each edge
+        :param hex_node_connectivity: Nodes connected to each hex
+        :param port_locations: Nodes with each type of port, in order [ 3:1, 2:1 Wheat, 2:1 Stone, 2:1 Brick, 2:1 Sheep, 2:1 Wood ]
+        :param row_lengths: Number of hexes in each row, for topologies from hexGridTopology. None otherwise
+        """
+        self.number_of_nodes = number_of_nodes
+        self.row_lengths = None if row_lengths is None else tuple(row_lengths)
+        self.number_of_edges = len(edge_pairs)
+        self.number_of_hexes = len(hex_node_connectivity)
+
+        # Tiles laid out on boards of this size
+        self.resource_counts, self.number_of_deserts, self.number_tokens = tileCounts(self.number_of_hexes)
+
+        self.edge_pairs = tuple(tuple(edge) for edge in edge_pairs)
+        self.hex_node_connectivity = tuple(tuple(hex_nodes) for hex_nodes in hex_node_connectivity)
+        self.port_locations = tuple(tuple(port_nodes) for port_nodes in port_locations)
+
+        # Node-edge incidence and node neighbours
+        node_edges = [[] for node in range(number_of_nodes)]
+        for edge_index, edge in enumerate(self.edge_pairs):
+            node_edges[edge[0]].append(edge_index)
+            node_edges[edge[1]].append(edge_index)
+        self.node_edges = tuple(tuple(edges) for edges in node_edges)
+
+        self.node_neighbours = tuple(tuple(neighbours)
+                                     for neighbours in constructNodeAdjacencyList(self.edge_pairs, number_of_nodes))
+
+        # Nodes two edges away from each node, not counting the node itself or its neighbours
+        self.node_two_step = tuple(tuple(sorted({two_step for neighbour in self.node_neighbours[node_index]
+                                                 for two_step in self.node_neighbours[neighbour]} -
+                                                {node_index}.union(self.node_neighbours[node_index])))
+                                   for node_index in range(number_of_nodes))
+
+        # Hexes connected to each node
+        node_hexes = [[] for node in range(number_of_nodes)]
+        for hex_index, hex_nodes in enumerate(self.hex_node_connectivity):
+            for node_index in hex_nodes:
+                node_hexes[node_index].append(hex_index)
+        self.node_hexes = tuple(tuple(hexes) for hexes in node_hexes)
+
+        # Hexes sharing an edge with each hex
+        hex_neighbours = [set() for hex_nodes in self.hex_node_connectivity]
+        for node_1, node_2 in self.edge_pairs:
+            edge_hexes = set(node_hexes[node_1]).intersection(node_hexes[node_2])
+            for hex_index in edge_hexes:
+                hex_neighbours[hex_index].update(edge_hexes - {hex_index})
+        self.hex_neighbours = tuple(tuple(sorted(neighbours)) for neighbours in hex_neighbours)
+
+        # Port flags of each node, in the order of BoardNode.ports
+        node_ports = [[0] * len(self.port_locations) for node in range(number_of_nodes)]
+        for type_index, port_nodes in enumerate(self.port_locations):
+            for node_index in port_nodes:
+                node_ports[node_index][type_index] = 1
+        self.node_ports = tuple(tuple(ports) for ports in node_ports)
+
+        self._node_connectivity_matrix = None
+
+    @property
+    def node_connectivity_matrix(self):
+        """
+        Node connectivity matrix, only built when first needed as neighbour lookups use self.node_neighbours
+        :return: Tuple of rows of connectivity. For element in row i, column j, a value of 1 represents a connection between node i and node j
+        """
+        if self._node_connectivity_matrix is None:
+            self._node_connectivity_matrix = tuple(tuple(row) for row in
+                                                   constructNodeConnectivityMatrix(self.edge_pairs, self.number_of_nodes))
+
+        return self._node_connectivity_matrix
+
+
+def tileCounts(number_of_hexes):
+    """
+    Number of each tile for a board, scaling the standard board's mix of resources and number tokens to its size
+    :param number_of_hexes: Number of hexes on board
+    :return: Tuple of hexes of each resource, Number of deserts, Tuple of number tokens
+    """
+    if number_of_hexes == len(HEX_NODE_CONNECTIVITY):
+        return STANDARD_RESOURCE_COUNTS, 1, STANDARD_NUMBER_TOKENS
+
+    # One desert per 19 hexes, every other hex gets a resource and a number token
+    number_of_deserts = max(1, round(number_of_hexes / len(HEX_NODE_CONNECTIVITY)))
+    number_of_resource_hexes = number_of_hexes - number_of_deserts
+
+    resource_counts = _largestRemainder(STANDARD_RESOURCE_COUNTS, number_of_resource_hexes)
+
+    rolls = sorted(NUMBER_TOKEN_FREQUENCIES)
+    roll_counts = _largestRemainder([NUMBER_TOKEN_FREQUENCIES[roll] for roll in rolls], number_of_resource_hexes)
+    number_tokens = tuple(roll for roll, count in zip(rolls, roll_counts) for i in range(count))
+
+    return tuple(resource_counts), number_of_deserts, number_tokens
+
+
+def _largestRemainder(weights, total):
+    # Split total in proportion to weights, giving what is left after rounding down to the largest remainders first
+    weight_sum = sum(weights)
+    shares = [divmod(total * weight, weight_sum) for weight in weights]
+    counts = [share[0] for share in shares]
+    by_remainder = sorted(range(len(weights)), key=lambda index: -shares[index][1])
+    for index in by_remainder[:total - sum(counts)]:
+        counts[index] += 1
+
+    return counts
+
+
+def hexagonRowLengths(radius):
+    """
+    Row lengths of a hexagon shaped board
+    :param radius: Number of rings of hexes around the centre hex. 2 is the standard board
+    :return: Tuple of number of hexes in each row
+    """
+    if radius < 0:
+        raise ValueError('Radius must be at least 0')
+
+    upper_rows = tuple(range(radius + 1, 2 * radius + 1))
+    return upper_rows + (2 * radius + 1,) + upper_rows[::-1]
+
+
+def hexGridTables(row_lengths):
+    """
+    Derive node, edge and hex tables of rows of pointy topped hexes, each row centred under the one above
+    :param row_lengths: Number of hexes in each row. Neighbouring rows must differ by 1
+    :return: Number of nodes, Tuple of edge pairs, Tuple of nodes connected to each hex
+    """
+    row_lengths = tuple(row_lengths)
+    if len(row_lengths) == 0 or min(row_lengths) < 1:
+        raise ValueError('Every row needs at least one hex')
+    for row_index in range(1, len(row_lengths)):
+        if abs(row_lengths[row_index] - row_lengths[row_index - 1]) != 1:
+            raise ValueError('Neighbouring rows must differ in length by 1')
+
+    """
+    Coordinates:
+
+    - Nodes lie on lines between rows, line r being the top of row r and the bottom of row r - 1
+    - Along a line, x is measured in half hex widths. Hex j of row r is centred at x = (longest row - row length) + 2j + 1
+    - A hex has three nodes on each of its lines, at x - 1, x and x + 1
+    """
+    longest_row = max(row_lengths)
+    hex_coordinates = []
+    for row_index, row_length in enumerate(row_lengths):
+        for hex_column in range(row_length):
+            centre = longest_row - row_length + 2 * hex_column + 1
+            hex_coordinates.append(tuple((line, x) for line in (row_index, row_index + 1)
+                                         for x in (centre - 1, centre, centre + 1)))
+
+    # Number nodes by line then x
+    node_ids = {coordinate: node_id for node_id, coordinate in
+                enumerate(sorted({coordinate for hex_nodes in hex_coordinates for coordinate in hex_nodes}))}
+
+    # Each hex has two edges along each of its lines, and one down each side. Edges are ordered by line, edges along a
+    # line before the edges down from it
+    edges = set()
+    for top_left, top, top_right, bottom_left, bottom, bottom_right in hex_coordinates:
+        edges.update(((0,) + top_left, (0,) + top, (0,) + bottom_left, (0,) + bottom))
+        edges.update(((1,) + top_left, (1,) + top_right))
+    edge_pairs = []
+    for direction, line, x in sorted(edges, key=lambda edge: (edge[1], edge[0], edge[2])):
+        other_end = (line, x + 1) if direction == 0 else (line + 1, x)
+        edge_pairs.append((node_ids[(line, x)], node_ids[other_end]))
+
+    hex_node_connectivity = tuple(tuple(sorted(node_ids[coordinate] for coordinate in hex_nodes))
+                                  for hex_nodes in hex_coordinates)
+
+    return len(node_ids), tuple(edge_pairs), hex_node_connectivity
+
+
+def coastalPortLocations(edge_pairs, hex_node_connectivity):
+    """
+    Spread ports evenly around the coast, at the same density as the standard board. Ports alternate between 3:1 and
+    each 2:1 type in turn
+    :param edge_pairs: Nodes connected by each edge
+    :param hex_node_connectivity: Nodes connected to each hex
+    :return: Nodes with each type of port, in order [ 3:1, 2:1 Wheat, 2:1 Stone, 2:1 Brick, 2:1 Sheep, 2:1 Wood ]
+    """
+    # Coastal edges border a single hex
+    hex_sets = [set(hex_nodes) for hex_nodes in hex_node_connectivity]
+    coastal_neighbours = {}
+    for node_1, node_2 in edge_pairs:
+        if sum(1 for hex_nodes in hex_sets if node_1 in hex_nodes and node_2 in hex_nodes) == 1:
+            coastal_neighbours.setdefault(node_1, []).append(node_2)
+            coastal_neighbours.setdefault(node_2, []).append(node_1)
+
+    # Walk around the coast from the lowest node
+    coast = [min(coastal_neighbours)]
+    previous_node = None
+    while True:
+        next_node = next(node for node in coastal_neighbours[coast[-1]] if node != previous_node)
+        if next_node == coast[0]:
+            break
+        previous_node = coast[-1]
+        coast.append(next_node)
+
+    number_of_ports = len(coast) * PORTS_PER_COASTAL_EDGE[0] // PORTS_PER_COASTAL_EDGE[1]
+    port_locations = [[] for port_type in range(len(PORT_LOCATIONS))]
+    for port_index in range(number_of_ports):
+        position = port_index * len(coast) // number_of_ports
+        port_type = 0 if port_index % 2 == 0 else 1 + (port_index // 2) % (len(PORT_LOCATIONS) - 1)
+        port_locations[port_type] += [coast[position], coast[(position + 1) % len(coast)]]
+
+    return tuple(tuple(sorted(port_nodes)) for port_nodes in port_locations)
+
+
+# Topologies already built, by row lengths and port locations
+_topology_cache = {}
+
+
+def hexGridTopology(row_lengths, port_locations=None):
+    """
+    Topology of rows of hexes. Built once per geometry, later calls return the same instance
+    :param row_lengths: Number of hexes in each row, e.g. from hexagonRowLengths
+    :param port_locations: Nodes with each type of port. None spreads ports evenly around the coast
+    :return: BoardTopology
+    """
+    key = (tuple(row_lengths), None if port_locations is None else tuple(map(tuple, port_locations)))
+    if key not in _topology_cache:
+        number_of_nodes, edge_pairs, hex_node_connectivity = hexGridTables(key[0])
+        if port_locations is None:
+            port_locations = coastalPortLocations(edge_pairs, hex_node_connectivity)
+        _topology_cache[key] = BoardTopology(number_of_nodes, edge_pairs, hex_node_connectivity, port_locations,
+                                             key[0])
+
+    return _topology_cache[key]
+
+
+# Topology of the standard 19 hex board, shared by every Board
+STANDARD_TOPOLOGY = hexGridTopology(STANDARD_ROW_LENGTHS, PORT_LOCATIONS)
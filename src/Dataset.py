@@ -0,0 +1,210 @@
+import json
+import mmap
+import os
+from array import array
+
+from src.GameManager import *
+from src.Player import *
+
+"""
+Memory-mapped training datasets.
+
+Samples of (observation, action, reward) from self-play are written as fixed width rows of 32 bit floats into shard
+files, with an index file describing the layout. A Dataset memory-maps the shards, so samples can be read at random
+from many processes without loading or copying the data:
+
+    exportSelfPlay('data', [randomAction] * 4, number_of_games=100)
+    with Dataset('data') as dataset:
+        observation, action, reward = dataset[12345]
+
+Each row holds the player's input vector, the output vector of their move function, then the reward for the game.
+"""
+
+INDEX_FILE = 'index.json'
+
+
+class DatasetWriter:
+    def __init__(self, directory, samples_per_shard=65536):
+        """
+        Writes samples to shard files in a directory
+        :param directory: Directory to write to, created if it doesn't exist
+        :param samples_per_shard: Number of samples in each shard file
+        """
+        self.directory = directory
+        self.samples_per_shard = samples_per_shard
+        os.makedirs(directory, exist_ok=True)
+
+        # Layout is fixed by the first sample
+        self.observation_size = None
+        self.action_size = None
+
+        self.shards = []
+        self._shard_file = None
+
+    def addSample(self, observation, action, reward):
+        """
+        Append a sample
+        :param observation: List of numbers, e.g. from Player.assembleInputVector
+        :param action: List of numbers, e.g. the output vector of a move function
+        :param reward: Number
+        """
+        if self.observation_size is None:
+            self.observation_size = len(observation)
+            self.action_size = len(action)
+        elif len(observation) != self.observation_size or len(action) != self.action_size:
+            raise ValueError('Sample size does not match earlier samples')
+
+        if self._shard_file is None or self.shards[-1]['samples'] == self.samples_per_shard:
+            self._startShard()
+
+        row = array('f', observation)
+        row.extend(action)
+        row.append(reward)
+        row.tofile(self._shard_file)
+        self.shards[-1]['samples'] += 1
+
+    def close(self):
+        """
+        Finish the last shard and write the index file
+        """
+        if self._shard_file is not None:
+            self._shard_file.close()
+            self._shard_file = None
+
+        index = {'format': 'float32',
+                 'observation_size': self.observation_size or 0,
+                 'action_size': self.action_size or 0,
+                 'row_size': (self.observation_size or 0) + (self.action_size or 0) + 1,
+                 'samples_per_shard': self.samples_per_shard,
+                 'samples': sum(shard['samples'] for shard in self.shards),
+                 'shards': self.shards}
+        with open(os.path.join(self.directory, INDEX_FILE), 'w') as index_file:
+            json.dump(index, index_file, indent=2)
+
+    def _startShard(self):
+        if self._shard_file is not None:
+            self._shard_file.close()
+
+        file_name = 'shard_' + '{:05d}'.format(len(self.shards)) + '.bin'
+        self._shard_file = open(os.path.join(self.directory, file_name), 'wb')
+        self.shards.append({'file': file_name, 'samples': 0})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+class Dataset:
+    def __init__(self, directory):
+        """
+        Read only view of a dataset written by DatasetWriter. Samples are memoryviews into memory-mapped shards
+        :param directory: Directory containing index file and shards
+        """
+        with open(os.path.join(directory, INDEX_FILE)) as index_file:
+            self.index = json.load(index_file)
+
+        self.observation_size = self.index['observation_size']
+        self.action_size = self.index['action_size']
+        self.row_size = self.index['row_size']
+        self.samples_per_shard = self.index['samples_per_shard']
+
+        # Memory map each shard and view it as floats
+        self._maps = []
+        self._views = []
+        for shard in self.index['shards']:
+            with open(os.path.join(directory, shard['file']), 'rb') as shard_file:
+                shard_map = mmap.mmap(shard_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(shard_map)
+            self._views.append(memoryview(shard_map).cast('f'))
+
+        self._length = self.index['samples']
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, sample_index):
+        """
+        Get a sample without copying
+        :param sample_index: Index of sample
+        :return: observation, action as memoryviews of floats, reward as a float
+        """
+        if sample_index < 0:
+            sample_index += self._length
+        if not 0 <= sample_index < self._length:
+            raise IndexError('Sample index out of range')
+
+        # Shards are full apart from the last, so the shard can be found by division
+        shard_index, row_index = divmod(sample_index, self.samples_per_shard)
+        row = self.row(shard_index, row_index)
+        return row[:self.observation_size], row[self.observation_size:self.row_size - 1], row[self.row_size - 1]
+
+    def row(self, shard_index, row_index):
+        """
+        Get a whole row of a shard without copying
+        :param shard_index: Index of shard
+        :param row_index: Index of row in shard
+        :return: memoryview of floats
+        """
+        start = row_index * self.row_size
+        return self._views[shard_index][start:start + self.row_size]
+
+    def close(self):
+        """
+        Drop the dataset's memory maps. Each shard is unmapped once no samples taken from it are still referenced
+        """
+        self._views = []
+        self._maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+def exportSelfPlay(directory, move_functions, number_of_games, seed=0, samples_per_shard=65536):
+    """
+    Plays games and writes every decision to a dataset. Reward is 1 for decisions of the winner and 0 otherwise
+    :param directory: Directory to write dataset to
+    :param move_functions: List of move functions with one element per player
+    :param number_of_games: Number of games to play
+    :param seed: Seed of first game, game i uses seed + i
+    :param samples_per_shard: Number of samples in each shard file
+    :return: Number of samples written
+    """
+    samples = 0
+    with DatasetWriter(directory, samples_per_shard) as writer:
+        for game_index in range(number_of_games):
+            players = [Player(move_function) for move_function in move_functions]
+            game_manager = GameManager(players, seed=seed + game_index)
+
+            # Keep each player's decisions until the game is over and rewards are known
+            decisions = []
+            for player in players:
+                player.move_function = recordingMoveFunction(player.move_function, player.player_index, decisions)
+
+            game_manager.startGame()
+
+            for player_index, input_vector, output_vector in decisions:
+                writer.addSample(input_vector, output_vector, 1.0 if player_index == game_manager.winner else 0.0)
+            samples += len(decisions)
+
+    return samples
+
+
+def recordingMoveFunction(move_function, player_index, decisions):
+    """
+    Wraps a move function to keep each input vector and output vector it sees
+    :param move_function: Move function
+    :param player_index: Index of player using move function
+    :param decisions: List to append (player index, input vector, output vector) to
+    :return: Move function
+    """
+    def recordedMoveFunction(input_vector):
+        output_dictionary, output_vector = move_function(input_vector)
+        decisions.append((player_index, input_vector, list(output_vector)))
+        return output_dictionary, output_vector
+
+    return recordedMoveFunction
@@ -0,0 +1,126 @@
+import sys
+
+"""
+Game event logging.
+
+Game classes report events to an EventLog rather than printing. An EventLog with no sinks is silent, and callers check
+EventLog.active before building an event so that headless games pay nothing for logging:
+
+    if self.event_log.active:
+        self.event_log.emit('road_built', player=0, edge=14, ...)
+
+Sinks decide what to do with events. TextSink formats events as readable messages and RecordSink keeps structured
+records. Any object with a receive(event, fields) method can be used as a sink.
+"""
+
+# Message format for each event type, filled in with the event fields
+EVENT_MESSAGES = {
+    'game_started': 'Starting Game',
+    'setup_started': 'Setup Phase:\n',
+    'first_player': 'First player is: Player {player}\n',
+    'placing_settlement': '\nPlayer {player}:\nPlacing settlement',
+    'placing_road': 'Placing road',
+    'turn_started': '\nRound: {round}, Player: {player}',
+    'dice_rolled': 'Player has rolled a {roll}',
+    'resources_received': 'Player {player} has received {amount} of resource type {resource} from node {node}',
+    'robber': 'Robber',
+    'cards_discarded': 'Player {player} discarded {resources} resources of each type',
+    'robber_moved': 'Player {player} moved robber to hex: {hex}',
+    'resource_stolen': 'Player {player} stole resource type {resource} from player {victim}',
+    'generic_port_built': 'Player {player} built a 3:1 port',
+    'resource_port_built': 'Player {player} built a 2:1 port  of resource type {resource}',
+    'settlement_built': 'Player {player} built settlement on node {node}',
+    'longest_road': 'Player {player} has longest road',
+    'road_built': 'Player {player} built road on edge {edge}, connecting nodes {node_0} and {node_1}. '
+                  'Players longest road: {road_length}',
+    'road_network_broken': 'Player {player}\'s RoadNetwork broken at node {node}',
+    'city_built': 'Player {player} built a city on node {node}',
+    'traded': 'Player {player} traded {amount} resources of type {given_resource} for 1 resource of type '
+              '{received_resource}',
+    'knight_played': 'Player {player} has played a knight card',
+    'largest_army': 'Player {player} has largest army',
+    'development_card_bought': 'Player {player} has purchased a development card.',
+    'points': 'Player {player} has {points} points',
+    'game_won': 'Player {player} has won!',
+    'no_winner': 'No player won',
+    'final_points': 'Player {player} finished with {points} points',
+}
+
+
+class EventLog:
+    def __init__(self, sinks=None):
+        """
+        Distributes game events to sinks. Silent if there are no sinks
+        :param sinks: List of sinks to send events to
+        """
+        self.sinks = []
+        self.active = False
+
+        for sink in sinks or []:
+            self.addSink(sink)
+
+    def addSink(self, sink):
+        """
+        Start sending events to a sink
+        :param sink: Object with a receive(event, fields) method
+        """
+        self.sinks.append(sink)
+        self.active = True
+
+    def removeSink(self, sink):
+        """
+        Stop sending events to a sink
+        :param sink: Sink previously added
+        """
+        self.sinks.remove(sink)
+        self.active = len(self.sinks) != 0
+
+    def emit(self, event, **fields):
+        """
+        Send event to all sinks. Callers should check self.active first to avoid building events no one receives
+        :param event: Event type, a key of EVENT_MESSAGES
+        :param fields: Values describing event
+        """
+        for sink in self.sinks:
+            sink.receive(event, fields)
+
+
+class TextSink:
+    def __init__(self, stream=None):
+        """
+        Sink which writes events as readable messages
+        :param stream: File-like object to write to. Defaults to standard output
+        """
+        self.stream = stream
+
+    def receive(self, event, fields):
+        print(formatEvent(event, fields), file=self.stream if self.stream is not None else sys.stdout)
+
+
+class RecordSink:
+    def __init__(self):
+        """
+        Sink which keeps every event as an (event, fields) tuple in self.records
+        """
+        self.records = []
+
+    def receive(self, event, fields):
+        self.records.append((event, fields))
+
+    def events(self, event):
+        """
+        Lists fields of every recorded event of one type
+        :param event: Event type
+        :return: List of field dictionaries
+        """
+        return [fields for record_event, fields in self.records if record_event == event]
+
+
+def formatEvent(event, fields):
+    """
+    Formats an event as a readable message
+    :param event: Event type, a key of EVENT_MESSAGES
+    :param fields: Values describing event
+    :return: Message string
+    """
+    return EVENT_MESSAGES[event].format(**fields)
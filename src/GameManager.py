@@ -1,17 +1,55 @@
 import random
+import time
+from collections import namedtuple
 
+from src.ActionLayout import *
 from src.Board import *
+from src.EventLog import *
+from src.LegalActions import *
+from src.Player import *
+from src.Production import *
+from src.Profiling import *
+from src.RandomStreams import *
 from src.RoadNetwork import *
 
 """
 GameManager class to store and manage rules of game
 """
 
+# Immutable capture of everything that changes during a game, from GameManager.snapshot
+GameSnapshot = namedtuple('GameSnapshot', ['board', 'legal_actions', 'players', 'road_networks', 'development_cards',
+                                           'robber_location', 'player_turn', 'starting_player', 'turn_counter',
+                                           'points', 'road_lengths', 'longest_road_player_index', 'settlements',
+                                           'cities', 'knights', 'largest_army_index', 'winner', 'random_state'])
+
 class GameManager:
-    def __init__(self, players):
+    def __init__(self, players, event_log=None, seed=None, dice_rolls=None, profile=None, topology=STANDARD_TOPOLOGY,
+                 layout=None):
+        """
+        Sets up a new game
+        :param players: List of Player instances, one per seat. Games have 2 or more players
+        :param event_log: EventLog to report game events to. Defaults to a silent log
+        :param seed: Seed of the game's random streams. None draws a seed from the global random module
+        :param dice_rolls: Optional sequence of pre-drawn dice rolls to use before rolling
+        :param profile: GameProfile to record timings and counts in. None turns profiling off
+        :param topology: BoardTopology of the board, e.g. from hexGridTopology. Move functions must score actions of
+                         its layout, self.action_layout, which is passed to move functions taking a layout argument
+        :param layout: BoardLayout of hexes and dice rolls, e.g. from a LayoutCache. None lays out the board from the
+                       seed
+        """
+        self.event_log = event_log if event_log is not None else EventLog()
+        self.profile = profile
+
+        number_of_players = len(players)
+        if number_of_players < 2:
+            raise ValueError('Games need at least 2 players')
+        self.number_of_players = number_of_players
+
+        # Independent random streams for the board, dice, deck and each player
+        self.random_streams = RandomStreams(seed, number_of_players, dice_rolls)
+
         # Initialise Board
-        number_of_players = 4
-        self.game_board = Board(number_of_players)
+        self.game_board = Board(number_of_players, topology=topology, rng=self.random_streams.board, layout=layout)
 
         # Start off robber on desert tile
         for index, hex in enumerate(self.game_board.hexes):
@@ -29,31 +67,60 @@ class GameManager:
         for development_card_index in range(5):
             for i in range(number_of_development_cards[development_card_index]):
                 self.development_cards.append(development_card_index)
-        random.shuffle(self.development_cards)
+        self.random_streams.deck.shuffle(self.development_cards)
 
         # Initialise player states
         self.players = players
         self.player_turn = 0
         self.starting_player = 0
-        self.points = [0, 0, 0, 0]
-
+        self.points = [0] * number_of_players
 
-        self.road_network = [None] * 4
-        self.road_lengths = [0, 0, 0, 0]
+        self.road_network = [None] * number_of_players
+        self.road_lengths = [0] * number_of_players
         self.longest_road_player_index = 0
 
-        self.settlements = [0, 0, 0, 0]
-        self.cities = [0, 0, 0, 0]
+        self.settlements = [0] * number_of_players
+        self.cities = [0] * number_of_players
 
-        self.knights = [0, 0, 0, 0]
+        self.knights = [0] * number_of_players
         self.largest_army_index = 0
 
+        # Index of player who won game, None until a player has won
+        self.winner = None
+
+        # Incrementally updated masks of where each player can build
+        self.legal_actions = LegalActions(self.game_board, number_of_players)
+
+        # Slot of each action in move function outputs for this board
+        self.action_layout = actionLayout(topology)
+        self.turn_counter = 0
+
+        # Incrementally updated resources produced by each dice roll
+        self.production = ProductionTable(self.game_board, number_of_players, self.robber_location)
+
+        """
+        Undo:
+
+        - self.undo_stack holds (move, counters, undo log) for each move applied with applyMove, most recent last
+        - self._undo_log collects (function, arguments) reversing each structural change whilst a move is applied, and
+          is None the rest of the time so normal play records nothing
+        """
+        self.undo_stack = []
+        self._undo_log = None
+
         for index, player in enumerate(self.players):
             player.player_index = index
             player.game_manager = self
+            player.rng = self.random_streams.agent[index]
+
+            # Move functions which take an rng draw from the player's stream, so a seed repeats the whole game, and those
+            # which take a layout score the actions of this board
+            player.move_function = seedMoveFunction(player.move_function, player.rng, self.action_layout)
+            player.number_of_resource_cards = [0] * number_of_players
+            player.number_of_development_cards = [0] * number_of_players
 
             # Initialise player road network
-            self.road_network[index] = RoadNetwork(self.game_board, index)
+            self.road_network[index] = RoadNetwork(self.game_board, index, self.event_log)
 
         # self.action_functions is a dictionary storing references to the functions to perform actions
         self.action_functions = {'Settlements': self.buildSettlement,
@@ -67,8 +134,13 @@ class GameManager:
         """
         Start game
         """
-        print("Starting Game")
+        if self.event_log.active:
+            self.event_log.emit('game_started', seed=self.random_streams.seed, players=len(self.players),
+                                hexes=tuple((hex.resource_index, hex.dice_roll) for hex in self.game_board.hexes),
+                                topology=self.game_board.topology, shuffled=self.game_board.layout is None)
         self.turn_counter = 0
+        if self.profile is not None:
+            self.profile.count('games')
         self.setupPlayers()
 
     def setupPlayers(self):
@@ -82,28 +154,29 @@ class GameManager:
         5) Repeat steps 2 and 3 for each player decrementing player index
         """
 
-        print('Setup Phase:\n')
+        if self.event_log.active:
+            self.event_log.emit('setup_started')
 
         # Step 1
-        self.starting_player = random.randrange(0, 3)
-        print('First player is: Player ' + str(self.starting_player) + '\n')
+        number_of_players = self.number_of_players
+        self.starting_player = self.random_streams.board.randrange(number_of_players)
+        if self.event_log.active:
+            self.event_log.emit('first_player', player=self.starting_player)
 
-        # Create ordered list corresponding to order of placing settlements
-        setup_order = [self.starting_player] * 8
-        for i in range(3):
-            setup_order[i + 1] = loopingIterator(setup_order[i])
-        setup_order[4] = setup_order[3]
-        for i in range(3):
-            setup_order[i + 5] = loopingIterator(setup_order[i + 4], increment=False)
+        # Create ordered list corresponding to order of placing settlements, round the table and back again
+        setup_order = [self.starting_player] * number_of_players
+        for i in range(number_of_players - 1):
+            setup_order[i + 1] = loopingIterator(setup_order[i], number_of_players)
+        setup_order += setup_order[::-1]
 
         # Iterate over ordered list and get each player to place a settlement and a road
-        settlement_node = [None] * 4
+        settlement_node = [None] * number_of_players
         for player_index in setup_order:
             node_chosen, edge_chosen = self.players[player_index].setup()
             settlement_node[player_index] = node_chosen
 
         # Give each player one resource from second settlement placement
-        for player_index in range(4):
+        for player_index in range(number_of_players):
             for resource_index in range(5):
                 self.players[player_index].resource_cards[resource_index] = len(self.game_board.nodes[settlement_node[player_index]].resource_dice_rolls[resource_index])
 
@@ -111,35 +184,47 @@ class GameManager:
         self.turn_counter = 1
         self.turnManager()
 
-        for i in range(len(self.players)):
-            print('Player ' + str(i) + ' finished with ' + str(self.countPoints(i)) + ' points')
+        if self.event_log.active:
+            for i in range(len(self.players)):
+                self.event_log.emit('final_points', player=i, points=self.countPoints(i))
 
     def turnManager(self):
         """
         Outer loop for turn function
         """
         game_ended = False
+        self.winner = None
 
         while not game_ended:
 
             # Take turn
-            self.turn()
+            if self.profile is not None:
+                start_time = time.perf_counter()
+                self.turn()
+                self.profile.addTime('turn', time.perf_counter() - start_time)
+                self.profile.count('turns')
+            else:
+                self.turn()
 
             # Check game has ended
-            if self.countPoints(self.player_turn) == 10:
-                print('Player ' + str(self.player_turn) + ' has won!')
+            if self.countPoints(self.player_turn) >= 10:
+                if self.event_log.active:
+                    self.event_log.emit('game_won', player=self.player_turn)
+                self.winner = self.player_turn
                 game_ended = True
                 break
 
             elif self.turn_counter == 200:
-                print('No player won')
+                if self.event_log.active:
+                    self.event_log.emit('no_winner')
                 game_ended = True
                 break
 
-            print('Player ' + str(self.player_turn) + ' has ' + str(self.countPoints(self.player_turn)) + ' points')
+            if self.event_log.active:
+                self.event_log.emit('points', player=self.player_turn, points=self.countPoints(self.player_turn))
 
             # Increment turn counter
-            self.player_turn = loopingIterator(self.player_turn)
+            self.player_turn = loopingIterator(self.player_turn, self.number_of_players)
             if self.player_turn == self.starting_player:
                 self.turn_counter += 1
 
@@ -153,59 +238,87 @@ class GameManager:
         4) If game hasn't ended increment player counter
         """
 
-        print('\nRound: ' + str(self.turn_counter) + ', Player: ' + str(self.player_turn))
+        if self.event_log.active:
+            self.event_log.emit('turn_started', round=self.turn_counter, player=self.player_turn)
 
         # Step 1: Roll die and give out resources
-        dice_roll = rollDice(2)
-        print('Player has rolled a ' + str(dice_roll))
+        dice_roll = self.random_streams.rollDice()
+        if self.event_log.active:
+            self.event_log.emit('dice_rolled', roll=dice_roll)
+
+        if self.profile is not None:
+            start_time = time.perf_counter()
 
         # Check roll isn't 7
         if dice_roll != 7:
-            # Get corresponding hexes on board
-            for hex in self.game_board.hex_dice_roll_list[dice_roll]:
+            self.distributeResources(dice_roll)
+            if self.profile is not None:
+                self.profile.addTime('dice_distribution', time.perf_counter() - start_time)
+        else:
+            # 7 has been rolled, go into robber state
+            self.robber()
+            if self.profile is not None:
+                self.profile.addTime('robber', time.perf_counter() - start_time)
 
-                # Check hex isn't blocked by robber
-                if hex.ID != self.robber_location:
+        # Step 2: Make current player perform actions until they pass go
+        self.players[self.player_turn].action()
 
-                    # Get all nodes connected to this hex
-                    for node_index in self.game_board.hex_node_connectivity[hex.ID]:
+    def distributeResources(self, dice_roll):
+        """
+        Give each player the resources produced by a dice roll, from the production table
+        :param dice_roll: Value rolled
+        """
+        if self.event_log.active:
+            self.logResourcesReceived(dice_roll)
 
-                        # For each player check if node built on
-                        for player_index in range(4):
+        roll_production = self.production.table[dice_roll]
+        for player_index, total in enumerate(self.production.roll_totals[dice_roll]):
+            if total == 0:
+                continue
 
-                            # Check player has built on node
-                            node_resource_contribution = 0
-                            if self.game_board.nodes[node_index].settlement[player_index] == 1:
-                                node_resource_contribution = 1
-                            elif self.game_board.nodes[node_index].city[player_index] == 1:
-                                node_resource_contribution = 2
+            resource_cards = self.players[player_index].resource_cards
+            for resource_index, amount in enumerate(roll_production[player_index]):
+                resource_cards[resource_index] += amount
 
-                            self.players[player_index].resource_cards[hex.resource_index] += node_resource_contribution
-                            if node_resource_contribution != 0:
-                                print('Player ' + str(player_index) + ' has received ' + str(node_resource_contribution) + ' of resource type ' + str(hex.resource_index) + ' from node ' + str(node_index))
+            # Update all other players that player player_index has received resources
+            for i in range(self.number_of_players):
+                if i != player_index:
+                    self.players[i].number_of_resource_cards[player_index] += total
 
-                                # Update all other players that player player_index has received resources
-                                for i in range(4):
-                                    if i != player_index:
-                                        self.players[i].number_of_resource_cards[player_index] += node_resource_contribution
-        else:
-            # 7 has been rolled, go into robber state
-            self.robber()
+    def logResourcesReceived(self, dice_roll):
+        """
+        Emit an event for each node which produces resources from a dice roll
+        :param dice_roll: Value rolled
+        """
+        for hex in self.game_board.hex_dice_roll_list[dice_roll]:
 
-        # Step 2: Make current player perform actions until they pass go
-        self.players[self.player_turn].action()
+            # Check hex isn't blocked by robber
+            if hex.ID != self.robber_location:
+
+                # Settlements get 1 resource and cities get 2
+                for node_index in self.game_board.hex_node_connectivity[hex.ID]:
+                    if self.game_board.node_building[node_index] != EMPTY:
+                        self.event_log.emit('resources_received', player=self.game_board.node_owner[node_index] - 1,
+                                            amount=self.game_board.node_building[node_index],
+                                            resource=hex.resource_index, node=node_index)
 
     def robber(self):
         """
         Manages event where 7 is rolled
         """
 
-        print('Robber')
+        if self.event_log.active:
+            self.event_log.emit('robber')
 
         # First go through each player and if they have 8 or more cards, tell them to discard half
         for player in self.players:
             if sum(player.resource_cards) > 7:
+                resource_cards = tuple(player.resource_cards)
                 player.discardHalfCards()
+                if self.event_log.active:
+                    self.event_log.emit('cards_discarded', player=player.player_index,
+                                        resources=tuple(before - after for before, after in
+                                                        zip(resource_cards, player.resource_cards)))
 
         # Next current player must move robber
         self.moveRobber(self.player_turn)
@@ -217,7 +330,9 @@ class GameManager:
         """
 
         self.players[player_index].moveRobber()
-        print('Player ' + str(player_index) + ' moved robber to hex: ' + str(self.robber_location))
+        self.production.moveRobber(self.robber_location)
+        if self.event_log.active:
+            self.event_log.emit('robber_moved', player=player_index, hex=self.robber_location)
 
         # Get list of all players with connected settlements
         players_to_steal_from = []
@@ -233,16 +348,145 @@ class GameManager:
 
             # Get random resource from player
             num_cards = sum(self.players[chosen_player].resource_cards)
-            cards_to_take = random.randint(0, num_cards - 1)
+            cards_to_take = self.random_streams.deck.randint(0, num_cards - 1)
 
             for resource_type in range(5):
                 cards_to_take -= self.players[chosen_player].resource_cards[resource_type]
                 if cards_to_take < 0:
                     self.players[chosen_player].resource_cards[resource_type] -= 1
-                    print('Player ' + str(player_index) + ' stole resource type ' + str(resource_type) + ' from player ' + str(chosen_player))
+                    if self.event_log.active:
+                        self.event_log.emit('resource_stolen', player=player_index, resource=resource_type,
+                                            victim=chosen_player)
                     break
 
 
+    def snapshot(self):
+        """
+        Capture the state of the game in an immutable form which can be restored any number of times
+        :return: GameSnapshot
+        """
+        return GameSnapshot(board=self.game_board.snapshotOccupancy(),
+                            legal_actions=self.legal_actions.snapshot(),
+                            players=tuple(player.snapshot() for player in self.players),
+                            road_networks=tuple(road_network.snapshot() for road_network in self.road_network),
+                            development_cards=tuple(self.development_cards),
+                            robber_location=self.robber_location,
+                            player_turn=self.player_turn,
+                            starting_player=self.starting_player,
+                            turn_counter=self.turn_counter,
+                            points=tuple(self.points),
+                            road_lengths=tuple(self.road_lengths),
+                            longest_road_player_index=self.longest_road_player_index,
+                            settlements=tuple(self.settlements),
+                            cities=tuple(self.cities),
+                            knights=tuple(self.knights),
+                            largest_army_index=self.largest_army_index,
+                            winner=self.winner,
+                            random_state=self.random_streams.getState())
+
+    def restore(self, snapshot):
+        """
+        Restore the game to the state captured by a snapshot. Lists are updated in place so references held to them
+        stay valid. Moves applied before the restore can no longer be undone
+        :param snapshot: GameSnapshot from snapshot
+        """
+        self.undo_stack.clear()
+        self.game_board.restoreOccupancy(snapshot.board)
+        self.legal_actions.restore(snapshot.legal_actions)
+        self.production.rebuild(snapshot.robber_location)
+        for player, player_snapshot in zip(self.players, snapshot.players):
+            player.restore(player_snapshot)
+        for road_network, road_network_snapshot in zip(self.road_network, snapshot.road_networks):
+            road_network.restore(road_network_snapshot)
+
+        self.development_cards[:] = snapshot.development_cards
+        self.robber_location = snapshot.robber_location
+        self.player_turn = snapshot.player_turn
+        self.starting_player = snapshot.starting_player
+        self.turn_counter = snapshot.turn_counter
+        self.points[:] = snapshot.points
+        self.road_lengths[:] = snapshot.road_lengths
+        self.longest_road_player_index = snapshot.longest_road_player_index
+        self.settlements[:] = snapshot.settlements
+        self.cities[:] = snapshot.cities
+        self.knights[:] = snapshot.knights
+        self.largest_army_index = snapshot.largest_army_index
+        self.winner = snapshot.winner
+        self.random_streams.setState(snapshot.random_state)
+
+    def applyMove(self, move):
+        """
+        Perform a move, recording what it changes so it can be reversed by undoMove
+        :param move: Move instance from src.Moves
+        :return: Bool - was move performed. Moves which aren't performed don't change the game and aren't recorded
+        """
+        counters = self._captureCounters()
+        self._undo_log = []
+        try:
+            performed = self.action_functions[move.key](self.players[move.player_index], move.element)
+            undo_log = self._undo_log
+        finally:
+            self._undo_log = None
+
+        if performed:
+            self.undo_stack.append((move, counters, undo_log))
+        return performed
+
+    def undoMove(self, move=None):
+        """
+        Reverse the most recent move performed by applyMove. Random streams are not rewound
+        :param move: Move expected to be undone. If given, it must be the most recently applied move
+        """
+        if len(self.undo_stack) == 0:
+            raise ValueError('No moves to undo')
+        if move is not None and self.undo_stack[-1][0] is not move:
+            raise ValueError('Moves must be undone in the reverse order they were applied')
+
+        move, counters, undo_log = self.undo_stack.pop()
+        for function, arguments in reversed(undo_log):
+            function(*arguments)
+        self._restoreCounters(counters)
+
+    def _captureCounters(self):
+        """
+        Capture player hands and game tallies, which are small enough to copy whole for each move
+        :return: Tuple for _restoreCounters
+        """
+        return (tuple(player.snapshot() for player in self.players), self.robber_location, tuple(self.road_lengths),
+                self.longest_road_player_index, tuple(self.settlements), tuple(self.cities), tuple(self.knights),
+                self.largest_army_index)
+
+    def _restoreCounters(self, counters):
+        player_snapshots, self.robber_location, self.road_lengths[:], self.longest_road_player_index, \
+            self.settlements[:], self.cities[:], self.knights[:], self.largest_army_index = counters
+        for player, player_snapshot in zip(self.players, player_snapshots):
+            player.restore(player_snapshot)
+        self.production.moveRobber(self.robber_location)
+
+    def _removeSettlement(self, node_index, player_index):
+        self.game_board.setNodeBuilding(node_index, player_index, EMPTY)
+        self.legal_actions.settlementRemoved(node_index, player_index)
+        self.production.buildingChanged(node_index, player_index, -1)
+
+    def _removeCity(self, node_index, player_index):
+        self.game_board.setNodeBuilding(node_index, player_index, SETTLEMENT)
+        self.legal_actions.cityRemoved(node_index, player_index)
+        self.production.buildingChanged(node_index, player_index, -1)
+
+    def _removeRoad(self, edge_index, player_index, new_board_nodes):
+        self.road_network[player_index].removeLastRoad(new_board_nodes)
+        self.game_board.setEdgeRoad(edge_index, None)
+        self.legal_actions.roadRemoved(edge_index, player_index)
+
+    def legalActionMask(self, player):
+        """
+        Get mask of actions player can currently take
+        :param player: Player class instance
+        :return: Dictionary of lists with the same keys as a move function output, 1 marks a legal action. Lists may
+                 be shared with self.legal_actions so must not be modified
+        """
+        return self.legal_actions.mask(player, setup=self.turn_counter == 0)
+
     def endTurn(self):
         """
         Checks whether player can end turn, if so end turn
@@ -292,14 +536,22 @@ class GameManager:
         if not self.game_board.connectedNodesBuiltOn(node_index):
             return False
 
-        # Check 5
+        # Check 5 - Node is empty and open by checks 1 and 4, so it is in the frontier if player has a road to it
         if self.turn_counter != 0:
-            if not self.game_board.nodeHasRoad(node_index, player.player_index):
+            if node_index not in self.legal_actions.settlement_frontier[player.player_index]:
                 return False
 
+        # Check 6
+        if self.turn_counter == 0 and sum(self.game_board.nodes[node_index].ports) != 0:
+            return False
+
         # If gotten this far, settlement passes all checks:
         # Update board
-        self.game_board.nodes[node_index].settlement[player.player_index] = 1
+        self.game_board.placeSettlement(node_index, player.player_index)
+        self.legal_actions.settlementBuilt(node_index, player.player_index)
+        self.production.buildingChanged(node_index, player.player_index, 1)
+        if self._undo_log is not None:
+            self._undo_log.append((self._removeSettlement, (node_index, player.player_index)))
 
         # Update resources in players hand
         if self.turn_counter != 0:
@@ -312,17 +564,15 @@ class GameManager:
         player.building_pieces[1] -= 1
 
         # Break road network for each player apart from player player_index
-        for player_i in range(4):
+        for player_i in range(self.number_of_players):
             if player_i != player.player_index:
-                self.road_network[player_i].breakRoadAtNode(node_index)
+                moved_edges = self.road_network[player_i].breakRoadAtNode(node_index)
+                if self._undo_log is not None and len(moved_edges) != 0:
+                    self._undo_log.append((self.road_network[player_i].joinRoadAtNode, (node_index, moved_edges)))
 
         # Update player best_trade_type if new settlement on port
         if sum(self.game_board.nodes[node_index].ports) != 0:
 
-            # Stop player building by port on setup round
-            if self.turn_counter == 0:
-                return False
-
             # Get index of port
             port_index = 0
             for index in range(6):
@@ -334,17 +584,20 @@ class GameManager:
                 for resource_index in range(5):
                     if player.best_trade_type[resource_index] > 3:
                         player.best_trade_type[resource_index] = 3
-                print('Player ' + str(player.player_index) + ' built a 3:1 port')
+                if self.event_log.active:
+                    self.event_log.emit('generic_port_built', player=player.player_index)
 
             # Else update relevant best_trade_type in Player
             else:
                 player.best_trade_type[port_index - 1] = 2
-                print('Player ' + str(player.player_index) + ' built a 2:1 port  of resource type ' + str(port_index - 1))
+                if self.event_log.active:
+                    self.event_log.emit('resource_port_built', player=player.player_index, resource=port_index - 1)
 
         # Update tally of settlements
         self.settlements[player.player_index] += 1
 
-        print('Player ' + str(player.player_index) + ' built settlement on node ' + str(node_index))
+        if self.event_log.active:
+            self.event_log.emit('settlement_built', player=player.player_index, node=node_index)
         return True
 
     def buildRoad(self, player, edge_index):
@@ -377,13 +630,14 @@ class GameManager:
         if player.building_pieces[0] == 0:
             return False
 
-        # Check 4
-        if not self.game_board.edgeHasRoadOrSettlement(edge_index, player.player_index):
+        # Check 4 - Frontier holds the empty edges connected to player's roads, settlements and cities
+        if edge_index not in self.legal_actions.road_frontier[player.player_index]:
             return False
 
         # If gotten this far, road passes all checks:
         # Update board
-        self.game_board.edges[edge_index].road[player.player_index] = 1
+        self.game_board.placeRoad(edge_index, player.player_index)
+        self.legal_actions.roadBuilt(edge_index, player.player_index)
 
         # Update resources in players hand
         if self.turn_counter != 0:
@@ -394,10 +648,16 @@ class GameManager:
         player.building_pieces[0] -= 1
 
         # Update player RoadNetwork
-        self.road_network[player.player_index].addRoad(edge_index)
+        new_board_nodes = self.road_network[player.player_index].addRoad(edge_index)
+        if self._undo_log is not None:
+            self._undo_log.append((self._removeRoad, (edge_index, player.player_index, new_board_nodes)))
 
         # Check if new road is longest road
+        if self.profile is not None:
+            start_time = time.perf_counter()
         player_road_length, path = self.road_network[player.player_index].longestContinousPath()
+        if self.profile is not None:
+            self.profile.addTime('longest_road', time.perf_counter() - start_time)
         self.road_lengths[player.player_index] = player_road_length
 
         # Check road is long enough for longest road
@@ -406,18 +666,19 @@ class GameManager:
             # Check if new road length is longer than current longest
             max_road_length = max(self.road_lengths)
             number_with_same_length = 0
-            for i in range(4):
+            for i in range(self.number_of_players):
                 if self.road_lengths[i] == max_road_length:
                     number_with_same_length += 1
 
             if number_with_same_length != 1:
                 self.longest_road_player_index = player.player_index
-                print('Player ' + str(player.player_index) + ' has longest road')
+                if self.event_log.active:
+                    self.event_log.emit('longest_road', player=player.player_index)
 
-        print('Player ' + str(player.player_index) + ' built road on edge ' + str(edge_index) +
-              ', connecting nodes ' + str(self.game_board.edges[edge_index].nodes[0]) +
-              ' and ' + str(self.game_board.edges[edge_index].nodes[1]) +
-              '. Players longest road: ' + str(player_road_length))
+        if self.event_log.active:
+            self.event_log.emit('road_built', player=player.player_index, edge=edge_index,
+                                node_0=self.game_board.edges[edge_index].nodes[0],
+                                node_1=self.game_board.edges[edge_index].nodes[1], road_length=player_road_length)
 
         return True
 
@@ -438,7 +699,7 @@ class GameManager:
         """
 
         # Check 1
-        if self.game_board.nodes[node_index].city[player.player_index] == 0:
+        if self.game_board.nodes[node_index].settlement[player.player_index] == 0:
             return False
 
         # Check 2
@@ -451,18 +712,24 @@ class GameManager:
 
         # If gotten this far, city passes all checks:
         # Update board
-        self.game_board.nodes[node_index].city[player.player_index] == 1
+        self.game_board.placeCity(node_index, player.player_index)
+        self.legal_actions.cityBuilt(node_index, player.player_index)
+        self.production.buildingChanged(node_index, player.player_index, 1)
+        if self._undo_log is not None:
+            self._undo_log.append((self._removeCity, (node_index, player.player_index)))
 
         # Update resources in players hand
         player.resource_cards[0] -= 2
         player.resource_cards[1] -= 3
 
-        # Update city pieces
+        # Update city pieces. Settlement piece replaced by city is returned to player
         player.building_pieces[2] -= 1
+        player.building_pieces[1] += 1
         self.cities[player.player_index] += 1
         self.settlements[player.player_index] -= 1
 
-        print('Player ' + str(player.player_index) + ' built a city on node ' + str(node_index))
+        if self.event_log.active:
+            self.event_log.emit('city_built', player=player.player_index, node=node_index)
         return True
 
     def tradeWithGame(self, player, trade_index):
@@ -521,7 +788,9 @@ class GameManager:
         player.resource_cards[resource_index_to_trade] -= required_resources
         player.resource_cards[desired_resource] += 1
 
-        print('Player ' + str(player.player_index) + ' traded ' + str(required_resources) + ' resources of type ' + str(resource_index_to_trade) + ' for 1 resource of type ' + str(desired_resource))
+        if self.event_log.active:
+            self.event_log.emit('traded', player=player.player_index, amount=required_resources,
+                                given_resource=resource_index_to_trade, received_resource=desired_resource)
 
 
         return True
@@ -562,7 +831,8 @@ class GameManager:
         if player.development_cards[0] == 0:
             return False
 
-        print('Player ' + str(player.player_index) + ' has played a knight card')
+        if self.event_log.active:
+            self.event_log.emit('knight_played', player=player.player_index)
 
         # Move robber
         self.moveRobber(player.player_index)
@@ -576,13 +846,14 @@ class GameManager:
             # Check if new army is larger than current largest
             max_army_size = max(self.knights)
             number_with_same_length = 0
-            for i in range(4):
+            for i in range(self.number_of_players):
                 if self.road_lengths[i] == max_army_size:
                     number_with_same_length += 1
 
             if number_with_same_length != 1:
                 self.largest_army_index = player.player_index
-                print('Player ' + str(player.player_index) + ' has largest army')
+                if self.event_log.active:
+                    self.event_log.emit('largest_army', player=player.player_index)
 
         return True
 
@@ -617,6 +888,8 @@ class GameManager:
         development_card_index = self.development_cards[0]
         player.development_cards[development_card_index] += 1
         self.development_cards.remove(development_card_index)
+        if self._undo_log is not None:
+            self._undo_log.append((self.development_cards.insert, (0, development_card_index)))
 
         # Remove resources from player
         player.resource_cards[0] -= 1
@@ -624,16 +897,17 @@ class GameManager:
         player.resource_cards[3] -= 1
 
         # Update all other players
-        for player_index in range(4):
+        for player_index in range(self.number_of_players):
             if player_index != player.player_index:
                 self.players[player_index].number_of_development_cards[player.player_index] += 1
 
-        print('Player ' + str(player.player_index) + ' has purchased a development card.')
+        if self.event_log.active:
+            self.event_log.emit('development_card_bought', player=player.player_index)
 
         return True
 
 
-def loopingIterator(current_index, increment=True, players=4):
+def loopingIterator(current_index, players, increment=True):
     """
     Get index of next player if incrementing or decrementing index
     :param current_index: current index before increment
@@ -655,14 +929,15 @@ def loopingIterator(current_index, increment=True, players=4):
         else:
             return next_value
 
-def rollDice(number_of_die):
+def rollDice(number_of_die, rng=random):
     """
     Simulates rolling of number_of_die die and returns result
     :param number_of_die: Number of die to simulate
+    :param rng: Random stream to roll with. Defaults to the global random module
     :return: Result of roll
     """
     total_value = 0
     for die in range(number_of_die):
-        total_value += random.randrange(1, 7)
+        total_value += rng.randrange(1, 7)
 
     return total_value
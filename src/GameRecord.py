@@ -0,0 +1,308 @@
+import struct
+from collections import namedtuple
+
+from src.BoardLayout import *
+from src.GameManager import *
+from src.Player import *
+
+"""
+Binary game records.
+
+GameRecordWriter is an EventLog sink which writes a compact binary record of each game to a stream as it is played.
+A record holds the game's seed, board geometry and layout, then every turn, dice roll, action and robber outcome. Games
+on the standard board or on any hexGridTopology with ports spread around the coast can be recorded. Many games can be
+written one after another to the same file:
+
+    with open('games.bin', 'wb') as record_file:
+        writer = GameRecordWriter(record_file)
+        game_manager = GameManager(players, event_log=EventLog([writer]), seed=seed)
+        game_manager.startGame()
+
+readGameRecords reads games back one at a time, and replayGame re-simulates a game through the engine, which also
+recovers the input vector each decision was made from:
+
+    with open('games.bin', 'rb') as record_file:
+        for observation, actions in iterateSamples(record_file):
+            ...
+"""
+
+# Record types. Each record is a type byte followed by fixed size values, apart from GAME_START which is followed by
+# the number of hexes in each row of the board, then a (resource index, dice roll) pair for each hex
+GAME_START, TURN, DICE, ACTION, DISCARD, ROBBER, STEAL, GAME_END = range(8)
+
+RECORD_FORMATS = {GAME_START: struct.Struct('<QBBHH'),  # seed, number of players, flags, number of rows, number of hexes
+                  TURN: struct.Struct('<BH'),           # player, round
+                  DICE: struct.Struct('<B'),            # roll
+                  ACTION: struct.Struct('<BBH'),        # player, index in RECORD_ACTION_KEYS, element
+                  DISCARD: struct.Struct('<B5B'),       # player, number of each resource discarded
+                  ROBBER: struct.Struct('<BH'),         # player, hex robber moved to
+                  STEAL: struct.Struct('<BBB'),         # player, victim, resource stolen
+                  GAME_END: struct.Struct('<BH')}       # winner or NO_WINNER, round
+ROW_FORMAT = struct.Struct('<H')
+HEX_FORMAT = struct.Struct('<bB')
+NO_WINNER = 255
+
+# GAME_START flag set when the board was placed from a BoardLayout rather than shuffled from the seed
+LAYOUT_FLAG = 1
+
+# Move function output keys of recorded actions, in order of their index in ACTION records. Ending a turn is recorded
+# by the next TURN record rather than as an action
+RECORD_ACTION_KEYS = tuple(key for key in ACTION_KEYS if key != 'EndTurn')
+
+# One game read back from a stream. layout is the BoardLayout the game was played on, None if the board was shuffled
+# from the seed. records lists (record type, tuple of values) of every record between the start and end of the game
+GameRecord = namedtuple('GameRecord', ['seed', 'number_of_players', 'row_lengths', 'hexes', 'layout', 'records',
+                                       'winner', 'rounds'])
+
+
+class GameRecordWriter:
+    def __init__(self, stream):
+        """
+        Sink which writes games to a binary stream as they are played
+        :param stream: Binary file-like object to write to
+        """
+        self.stream = stream
+        self.round = 0
+
+        # Functions writing a record for each event type, events of other types are not recorded
+        self._writers = {'game_started': self._writeGameStart,
+                         'turn_started': self._writeTurn,
+                         'dice_rolled': self._writeDice,
+                         'settlement_built': self._writeBuild,
+                         'city_built': self._writeBuild,
+                         'road_built': self._writeBuild,
+                         'traded': self._writeTrade,
+                         'development_card_bought': self._writeBuild,
+                         'knight_played': self._writeBuild,
+                         'cards_discarded': self._writeDiscard,
+                         'robber_moved': self._writeRobber,
+                         'resource_stolen': self._writeSteal,
+                         'game_won': self._writeGameEnd,
+                         'no_winner': self._writeGameEnd}
+
+    def receive(self, event, fields):
+        writer = self._writers.get(event)
+        if writer is not None:
+            writer(event, fields)
+
+    def _write(self, record_type, *values):
+        self.stream.write(bytes((record_type,)) + RECORD_FORMATS[record_type].pack(*values))
+
+    def _writeGameStart(self, event, fields):
+        seed = fields['seed']
+        if not 0 <= seed < 2 ** 64:
+            raise ValueError('Game records need a seed from 0 to 2 ** 64 - 1')
+
+        # Only the row lengths are recorded, so the topology must be the one replays rebuild from them
+        row_lengths = fields['topology'].row_lengths
+        if row_lengths is None or recordedTopology(row_lengths) is not fields['topology']:
+            raise ValueError('Game records need the standard board or a hexGridTopology with default ports')
+
+        self.round = 0
+        flags = 0 if fields['shuffled'] else LAYOUT_FLAG
+        self._write(GAME_START, seed, fields['players'], flags, len(row_lengths), len(fields['hexes']))
+        self.stream.write(b''.join(ROW_FORMAT.pack(row_length) for row_length in row_lengths))
+        self.stream.write(b''.join(HEX_FORMAT.pack(*hex_values) for hex_values in fields['hexes']))
+
+    def _writeTurn(self, event, fields):
+        self.round = fields['round']
+        self._write(TURN, fields['player'], fields['round'])
+
+    def _writeDice(self, event, fields):
+        self._write(DICE, fields['roll'])
+
+    def _writeBuild(self, event, fields):
+        if event == 'settlement_built':
+            self._write(ACTION, fields['player'], 0, fields['node'])
+        elif event == 'city_built':
+            self._write(ACTION, fields['player'], 1, fields['node'])
+        elif event == 'road_built':
+            self._write(ACTION, fields['player'], 2, fields['edge'])
+        elif event == 'development_card_bought':
+            self._write(ACTION, fields['player'], 4, 0)
+        else:
+            self._write(ACTION, fields['player'], 5, 0)
+
+    def _writeTrade(self, event, fields):
+        # Trades of each given resource are numbered by the received resource, skipping the given resource
+        given_resource = fields['given_resource']
+        received_resource = fields['received_resource']
+        trade_index = 4 * given_resource + received_resource - (1 if received_resource > given_resource else 0)
+        self._write(ACTION, fields['player'], 3, trade_index)
+
+    def _writeDiscard(self, event, fields):
+        self._write(DISCARD, fields['player'], *fields['resources'])
+
+    def _writeRobber(self, event, fields):
+        self._write(ROBBER, fields['player'], fields['hex'])
+
+    def _writeSteal(self, event, fields):
+        self._write(STEAL, fields['player'], fields['victim'], fields['resource'])
+
+    def _writeGameEnd(self, event, fields):
+        self._write(GAME_END, fields['player'] if event == 'game_won' else NO_WINNER, self.round)
+
+
+def readGameRecords(stream):
+    """
+    Reads games from a binary stream, one at a time. A game left unfinished at the end of the stream is skipped
+    :param stream: Binary file-like object written by GameRecordWriter
+    :return: Generator of GameRecord
+    """
+    seed = number_of_players = row_lengths = hexes = layout = records = None
+    while True:
+        type_byte = stream.read(1)
+        if len(type_byte) == 0:
+            return
+
+        record_type = type_byte[0]
+        record_format = RECORD_FORMATS[record_type]
+        data = stream.read(record_format.size)
+        if len(data) != record_format.size:
+            return
+        values = record_format.unpack(data)
+
+        if record_type == GAME_START:
+            seed, number_of_players, flags, number_of_rows, number_of_hexes = values
+            data = stream.read(number_of_rows * ROW_FORMAT.size + number_of_hexes * HEX_FORMAT.size)
+            if len(data) != number_of_rows * ROW_FORMAT.size + number_of_hexes * HEX_FORMAT.size:
+                return
+            row_lengths = tuple(row_length for (row_length,) in
+                                ROW_FORMAT.iter_unpack(data[:number_of_rows * ROW_FORMAT.size]))
+            hexes = tuple(HEX_FORMAT.iter_unpack(data[number_of_rows * ROW_FORMAT.size:]))
+
+            # Hexes of a layout are recorded in position order, so they give the layout back
+            layout = None
+            if flags & LAYOUT_FLAG:
+                layout = BoardLayout(tuple(resource for resource, dice_roll in hexes),
+                                     tuple(dice_roll for resource, dice_roll in hexes))
+            records = []
+
+        elif record_type == GAME_END:
+            winner, rounds = values
+            yield GameRecord(seed, number_of_players, row_lengths, hexes, layout, records,
+                             None if winner == NO_WINNER else winner, rounds)
+
+        else:
+            records.append((record_type, values))
+
+
+class ReplayPlayer(Player):
+    def __init__(self, decisions, discards, robber_hexes, steal_victims, samples):
+        """
+        Player which repeats the choices made in a recorded game
+        :param decisions: List of decisions in order, each a list of (key, element) actions taken
+        :param discards: List of resources discarded each time a 7 was rolled
+        :param robber_hexes: List of hexes robber was moved to
+        :param steal_victims: List of players stolen from
+        :param samples: List to append (player index, input vector, actions) to for each decision
+        """
+        super(ReplayPlayer, self).__init__(self.replayDecision)
+        self.decisions = iter(decisions)
+        self.discards = iter(discards)
+        self.robber_hexes = iter(robber_hexes)
+        self.steal_victims = iter(steal_victims)
+        self.samples = samples
+
+    def replayDecision(self, input_vector):
+        """
+        Move function which scores the actions of the next recorded decision in the order they were taken, above
+        ending the turn
+        :param input_vector: vector containing all player knowledge of the game state
+        :return: output dictionary, output vector
+        """
+        actions = next(self.decisions)
+        self.samples.append((self.player_index, input_vector, actions))
+
+        layout = self.game_manager.action_layout
+        output_vector = [0] * layout.size
+        output_vector[layout.slot('EndTurn', 0)] = 1
+        for rank, (key, element) in enumerate(actions):
+            output_vector[layout.slot(key, element)] = len(actions) + 1 - rank
+
+        output_dictionary = layout.split(output_vector)
+        return output_dictionary, output_vector
+
+    def discardHalfCards(self):
+        for resource_index, amount in enumerate(next(self.discards)):
+            self.resource_cards[resource_index] -= amount
+
+    def moveRobber(self):
+        self.game_manager.robber_location = next(self.robber_hexes)
+
+    def choosePlayerToStealFrom(self, list_of_players):
+        return next(self.steal_victims)
+
+
+def replayGame(game_record):
+    """
+    Re-simulates a recorded game by playing it again with the recorded choices
+    :param game_record: GameRecord
+    :return: GameManager at end of game, List of (player index, input vector, actions) for every decision in order
+    """
+    number_of_players = game_record.number_of_players
+    decisions = [[] for player_index in range(number_of_players)]
+    discards = [[] for player_index in range(number_of_players)]
+    robber_hexes = [[] for player_index in range(number_of_players)]
+    steal_victims = [[] for player_index in range(number_of_players)]
+    dice_rolls = []
+
+    # In the setup phase each action is a decision of its own, after that a player makes one decision each turn
+    turn_actions = None
+    for record_type, values in game_record.records:
+        if record_type == TURN:
+            turn_actions = []
+            decisions[values[0]].append(turn_actions)
+        elif record_type == ACTION:
+            action = (RECORD_ACTION_KEYS[values[1]], values[2])
+            if turn_actions is None:
+                decisions[values[0]].append([action])
+            else:
+                turn_actions.append(action)
+        elif record_type == DICE:
+            dice_rolls.append(values[0])
+        elif record_type == DISCARD:
+            discards[values[0]].append(values[1:])
+        elif record_type == ROBBER:
+            robber_hexes[values[0]].append(values[1])
+        elif record_type == STEAL:
+            steal_victims[values[0]].append(values[1])
+
+    samples = []
+    players = [ReplayPlayer(decisions[player_index], discards[player_index], robber_hexes[player_index],
+                            steal_victims[player_index], samples) for player_index in range(number_of_players)]
+    game_manager = GameManager(players, seed=game_record.seed, dice_rolls=dice_rolls,
+                               topology=recordedTopology(game_record.row_lengths), layout=game_record.layout)
+
+    if tuple((hex.resource_index, hex.dice_roll) for hex in game_manager.game_board.hexes) != game_record.hexes:
+        raise ValueError('Board layout of seed ' + str(game_record.seed) + ' does not match record')
+
+    game_manager.startGame()
+
+    if game_manager.winner != game_record.winner or game_manager.turn_counter != game_record.rounds:
+        raise ValueError('Replay of seed ' + str(game_record.seed) + ' did not finish as recorded')
+
+    return game_manager, samples
+
+
+def recordedTopology(row_lengths):
+    """
+    Topology of a recorded game
+    :param row_lengths: Number of hexes in each row of the board
+    :return: STANDARD_TOPOLOGY for the standard rows, otherwise the hexGridTopology of the rows with default ports
+    """
+    if tuple(row_lengths) == STANDARD_ROW_LENGTHS:
+        return STANDARD_TOPOLOGY
+    return hexGridTopology(row_lengths)
+
+
+def iterateSamples(stream):
+    """
+    Replays every game in a stream, yielding the input vector and actions of each decision
+    :param stream: Binary file-like object written by GameRecordWriter
+    :return: Generator of (input vector, list of (key, element) actions taken)
+    """
+    for game_record in readGameRecords(stream):
+        game_manager, samples = replayGame(game_record)
+        for player_index, input_vector, actions in samples:
+            yield input_vector, actions
@@ -17,18 +17,51 @@ class Edge:
         self.variables = variable_dictionary
 
 class Graph:
-    def __init__(self, nodes=[], edges=[]):
+    def __init__(self, nodes=None, edges=None):
         """
         Generic graph class
-        :param nodes:
-        :param edges:
+        :param nodes: List of Node instances
+        :param edges: List of Edge instances
         """
 
-        self.nodes = nodes
-        self.edges = edges
+        self.nodes = nodes if nodes is not None else []
+        self.edges = edges if edges is not None else []
+
+        """
+        Connectivity:
+
+        - self.node_edges is an adjacency list. Element i lists the indices of the edges connected to node i
+        - self.edge_index_map maps a pair of node indices (lowest first) to the index of the edge between them
+        - The node connectivity matrix is only built when self.node_connectivity is accessed
+        """
+        self.node_edges = [[] for node in self.nodes]
+        self.edge_index_map = {}
+        self._node_connectivity = None
+
+        """
+        Incremental longest path state:
+
+        - self._edge_component maps each edge index to the ID of the connected component containing it
+        - self._component_paths caches the longest path of each component as (length, path)
+        - self._dirty_nodes are nodes whose component has changed since the cache was last updated
+        """
+        self._edge_component = [None] * len(self.edges)
+        self._component_paths = {}
+        self._dirty_nodes = set()
+
+        for edge_index, edge in enumerate(self.edges):
+            self._connectEdge(edge_index)
+
+    @property
+    def node_connectivity(self):
+        """
+        Node connectivity matrix, built from the adjacency list the first time it is needed after a change
+        :return: Matrix of connectivity. For element in row i, column j, a value of 1 represents a connection between node i and node j
+        """
+        if self._node_connectivity is None:
+            self._node_connectivity = constructNodeConnectivityMatrix(self.listEdgeNodeIndices(), len(self.nodes))
 
-        # Node connectivity matrix
-        self.node_connectivity = constructNodeConnectivityMatrix(self.edges)
+        return self._node_connectivity
 
     def appendNodeToGraph(self, variable_dictionary={}):
         """
@@ -38,6 +71,8 @@ class Graph:
         """
         index = len(self.nodes)
         self.nodes.append(Node(variable_dictionary))
+        self.node_edges.append([])
+        self._node_connectivity = None
 
         return index
 
@@ -52,12 +87,136 @@ class Graph:
         # Create edge
         index = len(self.edges)
         self.edges.append(Edge(nodes, variable_dictionary))
+        self._edge_component.append(None)
 
-        # Update graph connectivity matrix
-        self.node_connectivity = constructNodeConnectivityMatrix(self.listEdgeNodeIndices())
+        # Update graph connectivity
+        self._connectEdge(index)
 
         return index
 
+    def removeLastNode(self):
+        """
+        Removes the most recently appended node, reversing appendNodeToGraph. The node must have no edges
+        """
+        index = len(self.nodes) - 1
+        self.nodes.pop()
+        self.node_edges.pop()
+        self._dirty_nodes.discard(index)
+        self._node_connectivity = None
+
+    def removeLastEdge(self):
+        """
+        Removes the most recently appended edge, reversing appendEdgeToGraph
+        """
+        index = len(self.edges) - 1
+        self._disconnectEdge(index)
+
+        # The rest of the component is re-explored from the dirty end nodes, but a component made up of only this
+        # edge would leave a cached path behind
+        self._component_paths.pop(self._edge_component.pop(), None)
+        self.edges.pop()
+
+    def reassignEdgeNode(self, edge_index, old_node, new_node):
+        """
+        Moves one end of an edge from one node to another
+        :param edge_index: Index of edge to update
+        :param old_node: Node currently at the end of the edge
+        :param new_node: Node to move the end of the edge to
+        """
+        self._disconnectEdge(edge_index)
+
+        edge = self.edges[edge_index]
+        edge_nodes = list(edge.nodes)
+        edge_nodes[edge_nodes.index(old_node)] = new_node
+        edge.nodes = edge_nodes
+
+        self._connectEdge(edge_index)
+
+    def neighbours(self, node):
+        """
+        Lists nodes connected to a node by an edge
+        :param node: Index of node
+        :return: List of node indices
+        """
+        neighbour_nodes = []
+        for edge_index in self.node_edges[node]:
+            edge_nodes = self.edges[edge_index].nodes
+            neighbour_nodes.append(edge_nodes[1] if edge_nodes[0] == node else edge_nodes[0])
+
+        return neighbour_nodes
+
+    def edgeBetween(self, node_0, node_1):
+        """
+        Finds edge connecting two nodes
+        :param node_0: Index of first node
+        :param node_1: Index of second node
+        :return: Index of edge, None if nodes aren't connected
+        """
+        return self.edge_index_map.get((min(node_0, node_1), max(node_0, node_1)))
+
+    def _connectEdge(self, edge_index):
+        """
+        Adds an edge to the adjacency list and edge index map. Only the component containing the edge will need
+        re-exploring to find the longest path
+        :param edge_index: Index of edge
+        """
+        edge_nodes = self.edges[edge_index].nodes
+        for node in edge_nodes:
+            self.node_edges[node].append(edge_index)
+
+        self.edge_index_map[(min(edge_nodes), max(edge_nodes))] = edge_index
+        self._node_connectivity = None
+        self._dirty_nodes.update(edge_nodes)
+
+    def _disconnectEdge(self, edge_index):
+        """
+        Removes an edge from the adjacency list and edge index map
+        :param edge_index: Index of edge
+        """
+        edge_nodes = self.edges[edge_index].nodes
+        for node in edge_nodes:
+            self.node_edges[node].remove(edge_index)
+
+        node_pair = (min(edge_nodes), max(edge_nodes))
+        if self.edge_index_map.get(node_pair) == edge_index:
+            del self.edge_index_map[node_pair]
+        self._node_connectivity = None
+        self._dirty_nodes.update(edge_nodes)
+
+    def snapshot(self):
+        """
+        Capture graph structure and cached longest paths in an immutable form
+        :return: Tuple of graph state for restore
+        """
+        return (tuple(node.variables for node in self.nodes),
+                tuple((tuple(edge.nodes), edge.variables) for edge in self.edges),
+                tuple(self._edge_component),
+                tuple(self._component_paths.items()),
+                frozenset(self._dirty_nodes))
+
+    def restore(self, snapshot):
+        """
+        Restore graph to state captured by snapshot
+        :param snapshot: Tuple from snapshot
+        """
+        node_variables, edges, edge_component, component_paths, dirty_nodes = snapshot
+
+        self.nodes = [Node(variables) for variables in node_variables]
+        self.edges = [Edge(list(edge_nodes), variables) for edge_nodes, variables in edges]
+
+        self.node_edges = [[] for node in self.nodes]
+        self.edge_index_map = {}
+        for edge_index, edge in enumerate(self.edges):
+            for node in edge.nodes:
+                self.node_edges[node].append(edge_index)
+            self.edge_index_map[(min(edge.nodes), max(edge.nodes))] = edge_index
+        self._node_connectivity = None
+
+        # Cached paths are still valid for the restored edges
+        self._edge_component = list(edge_component)
+        self._component_paths = dict(component_paths)
+        self._dirty_nodes = set(dirty_nodes)
+
     def listEdgeNodeIndices(self):
         """
         Constructs a list with each element containing the node indices connected by an edge
@@ -71,77 +230,276 @@ class Graph:
 
     def longestContinousPath(self):
         """
-        Calculates longest continuous path in graph
+        Calculates longest continuous path in graph. Only components changed since the last call are re-explored,
+        the longest path of every other component is taken from the cache
         :return: Length of path, List of edges which make path
         """
-        # Start recursion from each node
-        starting_nodes = range(len(self.nodes))
+        if len(self._dirty_nodes) != 0:
+            self._updateDirtyComponents()
 
-        # Recursively search through connected edges from each node in starting nodes. Store maximum combinations
+        # Longest path in graph is the longest path of any component
         max_length = 0
         max_path = []
-        for starting_node in starting_nodes:
-            path = self._recursivePathLength(starting_node, [], [])
-
-            if len(path) > max_length:
-                max_length = len(path)
+        for length, path in self._component_paths.values():
+            if length > max_length:
+                max_length = length
                 max_path = path
 
-        return max_length, max_path
+        return max_length, list(max_path)
+
+    def _updateDirtyComponents(self):
+        """
+        Re-explores every component containing a dirty node and updates the cache of component longest paths
+        """
+        dirty_nodes = self._dirty_nodes
+        self._dirty_nodes = set()
+
+        # Find each distinct component containing a dirty node
+        components = []
+        explored_nodes = set()
+        for node in dirty_nodes:
+            if node in explored_nodes:
+                continue
+
+            component_nodes, component_edges = self._exploreComponent(node)
+            explored_nodes.update(component_nodes)
+            if len(component_edges) != 0:
+                components.append((component_nodes, component_edges))
+
+        # Discard cached paths of components which have been merged into or split from the dirty components. Done
+        # before any new paths are cached as a new component can take the ID of a discarded one
+        for component_nodes, component_edges in components:
+            for edge_index in component_edges:
+                self._component_paths.pop(self._edge_component[edge_index], None)
+
+        # Search each component and cache result against the lowest edge index in the component
+        for component_nodes, component_edges in components:
+            component_id = min(component_edges)
+            for edge_index in component_edges:
+                self._edge_component[edge_index] = component_id
+
+            path = self._longestPathInComponent(component_nodes, len(component_edges))
+            self._component_paths[component_id] = (len(path), path)
+
+    def _exploreComponent(self, starting_node):
+        """
+        Finds all nodes and edges in the same component as a node
+        :param starting_node: Node to search from
+        :return: List of nodes in component, Set of edge indices in component
+        """
+        component_nodes = [starting_node]
+        component_edges = set()
+        visited_nodes = bytearray(len(self.nodes))
+        visited_nodes[starting_node] = 1
+
+        # Stack of nodes to visit, preallocated as each node is pushed at most once
+        nodes_to_visit = [0] * len(self.nodes)
+        nodes_to_visit[0] = starting_node
+        stack_size = 1
+
+        while stack_size != 0:
+            stack_size -= 1
+            node = nodes_to_visit[stack_size]
+            for edge_index in self.node_edges[node]:
+                if edge_index in component_edges:
+                    continue
+
+                component_edges.add(edge_index)
+                for next_node in self.edges[edge_index].nodes:
+                    if not visited_nodes[next_node]:
+                        visited_nodes[next_node] = 1
+                        component_nodes.append(next_node)
+                        nodes_to_visit[stack_size] = next_node
+                        stack_size += 1
+
+        return component_nodes, component_edges
 
-    def _recursivePathLength(self, current_node, visited_edges, current_longest_path):
+    def _longestPathInComponent(self, component_nodes, number_of_edges):
         """
-        Recursive function to find the longest path in a graph from a node
-        :param current_node: Node to search from
-        :param visited_edges: List of edges which have already been visted
-        :return: Max length of path, List of edges which make path
+        Calculates longest continuous path in a single component
+        :param component_nodes: List of nodes in component
+        :param number_of_edges: Number of edges in component
+        :return: List of edges which make path
         """
 
-        # Assemble list of connected edges
-        connected_edges = []
-        connected_nodes = self.node_connectivity[current_node]
-        for index, node in enumerate(connected_nodes):
-            if node == 1:
-                connected_edges.append([current_node, index])
+        # A longest path can always be found starting from a node which doesn't have exactly two edges, unless every
+        # node has two edges (a single loop) in which case any node can be used
+        starting_nodes = [node for node in component_nodes if len(self.node_edges[node]) != 2]
+        if len(starting_nodes) == 0:
+            starting_nodes = component_nodes[:1]
 
+        # Stack shared by every search, a trail can't be longer than the number of edges in the graph
+        stack_nodes = [0] * (len(self.edges) + 1)
+        stack_edges = [0] * len(self.edges)
+
+        max_path = []
+        for starting_node in starting_nodes:
+            for depth in self._walkTrails(starting_node, stack_nodes, stack_edges):
+                if depth > len(max_path):
+                    max_path = [[stack_nodes[step], stack_nodes[step + 1]] for step in range(depth)]
 
-        # Iterate over connected edges
-        for edge in connected_edges:
-            if edge not in visited_edges and edge[::-1] not in visited_edges:
-                # Have not already visited edge so append this edge to visited edges and call recursive function at next node
-                current_longest_path = self._recursivePathLength(edge[1], visited_edges + [edge], current_longest_path)
+                    # Can't do better than a path using every edge
+                    if depth == number_of_edges:
+                        break
 
+            if len(max_path) == number_of_edges:
+                break
+
+        return max_path
+
+    def trails(self, starting_node):
+        """
+        Enumerates every trail from a node which can't be extended any further. A trail can pass through a node more
+        than once but never uses an edge twice
+        :param starting_node: Node to start trails from
+        :return: Generator of lists of edge indices, in the order trails are found by a depth first search
+        """
+        stack_nodes = [0] * (len(self.edges) + 1)
+        stack_edges = [0] * len(self.edges)
+        for depth in self._walkTrails(starting_node, stack_nodes, stack_edges):
+            yield stack_edges[:depth]
+
+    def _walkTrails(self, starting_node, stack_nodes, stack_edges):
+        """
+        Depth first search over trails from a node, using an explicit stack rather than recursion. Each time the search
+        reaches a dead end, the trail is left on the stack and its length is yielded
+        :param starting_node: Node to start trails from
+        :param stack_nodes: List of at least number of edges + 1 elements. Element i is set to node i of the trail
+        :param stack_edges: List of at least number of edges elements. Element i is set to edge i of the trail
+        :return: Generator of trail lengths
+        """
+        node_edges = self.node_edges
+        edges = self.edges
+        visited_edges = bytearray(len(edges))
+
+        # Iterator over the edges of the node at each depth, left part way through while the trail goes deeper
+        edge_iterators = [None] * len(stack_nodes)
+
+        stack_nodes[0] = starting_node
+        edge_iterators[0] = iter(node_edges[starting_node])
+        depth = 0
+        extended = True
+        while depth >= 0:
+            for edge_index in edge_iterators[depth]:
+                if not visited_edges[edge_index]:
+                    break
             else:
-                # Reached 'dead-end'. If current path is longer than maximum so far, record it
-                if len(visited_edges) > len(current_longest_path):
-                    current_longest_path = visited_edges
+                # Every edge from node has been tried. If none could be taken the trail is at a dead end
+                if extended:
+                    yield depth
+                    extended = False
+
+                depth -= 1
+                if depth >= 0:
+                    visited_edges[stack_edges[depth]] = 0
+                continue
+
+            # Extend trail along the unvisited edge
+            visited_edges[edge_index] = 1
+            stack_edges[depth] = edge_index
+
+            node = stack_nodes[depth]
+            edge_nodes = edges[edge_index].nodes
+            next_node = edge_nodes[1] if edge_nodes[0] == node else edge_nodes[0]
+            depth += 1
+            stack_nodes[depth] = next_node
+            edge_iterators[depth] = iter(node_edges[next_node])
+            extended = True
+
+    def connectedComponents(self):
+        """
+        Finds every connected component of the graph
+        :return: List of (list of nodes, set of edge indices) for each component, including single unconnected nodes
+        """
+        components = []
+        explored_nodes = bytearray(len(self.nodes))
+        for node in range(len(self.nodes)):
+            if not explored_nodes[node]:
+                component_nodes, component_edges = self._exploreComponent(node)
+                for component_node in component_nodes:
+                    explored_nodes[component_node] = 1
+                components.append((component_nodes, component_edges))
+
+        return components
+
+    def reachableNodes(self, starting_node, blocked_nodes=()):
+        """
+        Breadth first search for the nodes which can be reached from a node
+        :param starting_node: Node to search from
+        :param blocked_nodes: Nodes which can be reached but not passed through
+        :return: List of nodes in order of the number of edges needed to reach them, starting with starting_node
+        """
+        blocked = bytearray(len(self.nodes))
+        for node in blocked_nodes:
+            blocked[node] = 1
 
-        return current_longest_path
+        # Queue of nodes to visit, preallocated as each node is queued at most once
+        visited_nodes = bytearray(len(self.nodes))
+        queue = [0] * len(self.nodes)
+        queue[0] = starting_node
+        visited_nodes[starting_node] = 1
+        head = 0
+        tail = 1
+        while head < tail:
+            node = queue[head]
+            head += 1
+            if blocked[node] and node != starting_node:
+                continue
 
+            for edge_index in self.node_edges[node]:
+                edge_nodes = self.edges[edge_index].nodes
+                next_node = edge_nodes[1] if edge_nodes[0] == node else edge_nodes[0]
+                if not visited_nodes[next_node]:
+                    visited_nodes[next_node] = 1
+                    queue[tail] = next_node
+                    tail += 1
 
-def constructNodeConnectivityMatrix(edges):
+        return queue[:tail]
+
+
+def constructNodeConnectivityMatrix(edges, number_of_nodes=None):
     """
     Calculates Matrix of connectivity for graph given list of edges
     :param edges: List of edges in form: [[node 0, node 1], [node 0, node 1],...]
+    :param number_of_nodes: Number of nodes in graph. If not given, taken as the number of distinct nodes in edges
     :return: Matrix of connectivity. For element in row i, column j, a value of 1 represents a connection between node i and node j
     """
 
-    # First get a list of nodes in graph
-    nodes = []
-    for edge in edges:
-        for node in range(2):
-            if edge[node] not in nodes:
-                nodes.append(edge[node])
-
+    # First get number of nodes in graph
+    if number_of_nodes is None:
+        nodes = set()
+        for edge in edges:
+            nodes.update(edge)
+        number_of_nodes = len(nodes)
 
     # Initialise empty connectivity matrix
     connectivity_matrix = []
-    for row in range(len(nodes)):
-        connectivity_matrix.append([0] * len(nodes))
+    for row in range(number_of_nodes):
+        connectivity_matrix.append([0] * number_of_nodes)
 
     # Iterate over each edge. Add edge to matrix
     for edge in edges:
         connectivity_matrix[edge[0]][edge[1]] = 1
         connectivity_matrix[edge[1]][edge[0]] = 1
 
-    return connectivity_matrix
\ No newline at end of file
+    return connectivity_matrix
+
+
+def constructNodeAdjacencyList(edges, number_of_nodes=None):
+    """
+    Calculates adjacency list for graph given list of edges
+    :param edges: List of edges in form: [[node 0, node 1], [node 0, node 1],...]
+    :param number_of_nodes: Number of nodes in graph. If not given, taken as the largest node index + 1
+    :return: List where element i is a list of the nodes connected to node i
+    """
+    if number_of_nodes is None:
+        number_of_nodes = 0
+        for edge in edges:
+            number_of_nodes = max(number_of_nodes, edge[0] + 1, edge[1] + 1)
+
+    adjacency_list = [[] for node in range(number_of_nodes)]
+    for edge in edges:
+        adjacency_list[edge[0]].append(edge[1])
+        adjacency_list[edge[1]].append(edge[0])
+
+    return adjacency_list
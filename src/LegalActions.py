@@ -0,0 +1,266 @@
+"""
+Legal action masks.
+
+LegalActions keeps, for each player, a mask of the board positions they could build on if they had the resources and
+pieces. The masks are updated incrementally as pieces are placed, so a full mask of legal actions only needs the
+resource and piece checks applying on top.
+
+Masks use the same keys and element order as the output dictionary of a move function, with 1 marking a legal action.
+"""
+
+# Resources needed for each type of action in order [Wheat, Stone, Brick, Sheep, Wood]
+SETTLEMENT_COST = [1, 0, 1, 1, 1]
+CITY_COST = [2, 3, 0, 0, 0]
+ROAD_COST = [0, 0, 1, 0, 1]
+DEVELOPMENT_CARD_COST = [1, 1, 0, 1, 0]
+
+# Resource given away for each trade index of GameManager.tradeWithGame
+TRADE_RESOURCE_GIVEN = [0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4]
+
+
+class LegalActions:
+    def __init__(self, game_board, number_of_players):
+        """
+        Class to track which board positions each player can build on
+        :param game_board: Instance of Board class for current game
+        :param number_of_players: number of players in game
+        """
+        self.game_board = game_board
+        number_of_nodes = len(game_board.nodes)
+        number_of_edges = len(game_board.edges)
+
+        """
+        Counters:
+
+        - self.node_block_count is the board's count of built on nodes within one edge of each node (including itself),
+          kept up to date by the board. A settlement can only be built on a node with a count of 0
+        - self.road_count[player][node] is the number of player's roads connected to node
+        """
+        self.node_block_count = game_board.node_block_count
+        self.road_count = [[0] * number_of_nodes for player in range(number_of_players)]
+
+        """
+        Masks:
+
+        - self.setup_settlement_mask marks nodes which can be built on in the setup phase (Turn 0)
+        - self.settlement_mask[player] marks nodes player can build a settlement on after the setup phase
+        - self.city_mask[player] marks nodes where player has a settlement to upgrade
+        - self.road_mask[player] marks empty edges connected to one of player's roads, settlements or cities
+        """
+        self.setup_settlement_mask = [0] * number_of_nodes
+        for node_index in range(number_of_nodes):
+            self._updateSetupSettlementMask(node_index)
+
+        self.settlement_mask = [[0] * number_of_nodes for player in range(number_of_players)]
+        self.city_mask = [[0] * number_of_nodes for player in range(number_of_players)]
+        self.road_mask = [[0] * number_of_edges for player in range(number_of_players)]
+
+        """
+        Frontiers, the marked elements of the masks above as sets so candidates can be listed or looked up directly:
+
+        - self.settlement_frontier[player] is nodes reached by player's roads which are open under the distance rule
+        - self.road_frontier[player] is empty edges next to player's roads, settlements or cities
+        """
+        self.settlement_frontier = [set() for player in range(number_of_players)]
+        self.road_frontier = [set() for player in range(number_of_players)]
+
+        # Masks of actions a player can never take, returned when a resource or piece check fails
+        self._no_nodes = [0] * number_of_nodes
+        self._no_edges = [0] * number_of_edges
+        self._no_trades = [0] * len(TRADE_RESOURCE_GIVEN)
+
+    def settlementBuilt(self, node_index, player_index):
+        """
+        Update masks after a settlement is placed
+        :param node_index: Index of node built on
+        :param player_index: Index of player who built settlement
+        """
+        self._updateBlockedNodeMasks(node_index)
+        self.city_mask[player_index][node_index] = 1
+        self._updateRoadMasksAroundNode(node_index, player_index)
+
+    def cityBuilt(self, node_index, player_index):
+        """
+        Update masks after a settlement is upgraded to a city
+        :param node_index: Index of node built on
+        :param player_index: Index of player who built city
+        """
+        self.city_mask[player_index][node_index] = 0
+
+    def roadBuilt(self, edge_index, player_index):
+        """
+        Update masks after a road is placed
+        :param edge_index: Index of edge built on
+        :param player_index: Index of player who built road
+        """
+        self._changeRoadCount(edge_index, player_index, 1)
+
+    def settlementRemoved(self, node_index, player_index):
+        """
+        Update masks after a settlement is removed from the board, reversing settlementBuilt
+        :param node_index: Index of node settlement was on
+        :param player_index: Index of player who owned settlement
+        """
+        self._updateBlockedNodeMasks(node_index)
+        self.city_mask[player_index][node_index] = 0
+        self._updateRoadMasksAroundNode(node_index, player_index)
+
+    def cityRemoved(self, node_index, player_index):
+        """
+        Update masks after a city is turned back into a settlement, reversing cityBuilt
+        :param node_index: Index of node city was on
+        :param player_index: Index of player who owned city
+        """
+        self.city_mask[player_index][node_index] = 1
+
+    def roadRemoved(self, edge_index, player_index):
+        """
+        Update masks after a road is removed from the board, reversing roadBuilt
+        :param edge_index: Index of edge road was on
+        :param player_index: Index of player who owned road
+        """
+        self._changeRoadCount(edge_index, player_index, -1)
+
+    def snapshot(self):
+        """
+        Capture counters and masks in an immutable form
+        :return: Tuple for restore
+        """
+        return (tuple(tuple(counts) for counts in self.road_count),
+                tuple(self.setup_settlement_mask),
+                tuple(tuple(mask) for mask in self.settlement_mask),
+                tuple(tuple(mask) for mask in self.city_mask),
+                tuple(tuple(mask) for mask in self.road_mask))
+
+    def restore(self, snapshot):
+        """
+        Restore counters and masks to state captured by snapshot. Lists are updated in place. Node block counts belong to
+        the board, so its occupancy must be restored too
+        :param snapshot: Tuple from snapshot
+        """
+        road_count, setup_settlement_mask, settlement_mask, city_mask, road_mask = snapshot
+
+        self.setup_settlement_mask[:] = setup_settlement_mask
+        for player_index in range(len(self.road_count)):
+            self.road_count[player_index][:] = road_count[player_index]
+            self.settlement_mask[player_index][:] = settlement_mask[player_index]
+            self.city_mask[player_index][:] = city_mask[player_index]
+            self.road_mask[player_index][:] = road_mask[player_index]
+
+            self.settlement_frontier[player_index].clear()
+            self.settlement_frontier[player_index].update(
+                node_index for node_index, legal in enumerate(settlement_mask[player_index]) if legal)
+            self.road_frontier[player_index].clear()
+            self.road_frontier[player_index].update(
+                edge_index for edge_index, legal in enumerate(road_mask[player_index]) if legal)
+
+    def mask(self, player, setup=False):
+        """
+        Get mask of legal actions for a player. Lists in the mask may be shared with LegalActions so must not be
+        modified
+        :param player: Player instance
+        :param setup: True if game is in setup phase (Turn 0), when settlements and roads cost nothing
+        :return: Dictionary of lists with the same keys as a move function output, 1 marks a legal action
+        """
+        player_index = player.player_index
+        resource_cards = player.resource_cards
+
+        # Building
+        if player.building_pieces[1] == 0:
+            settlements = self._no_nodes
+        elif setup:
+            settlements = self.setup_settlement_mask
+        elif player.hasResources(SETTLEMENT_COST):
+            settlements = self.settlement_mask[player_index]
+        else:
+            settlements = self._no_nodes
+
+        if not setup and player.building_pieces[2] != 0 and player.hasResources(CITY_COST):
+            cities = self.city_mask[player_index]
+        else:
+            cities = self._no_nodes
+
+        if player.building_pieces[0] != 0 and (setup or player.hasResources(ROAD_COST)):
+            roads = self.road_mask[player_index]
+        else:
+            roads = self._no_edges
+
+        # Trading
+        if setup:
+            trade_with_game = self._no_trades
+        else:
+            trade_with_game = [0] * len(TRADE_RESOURCE_GIVEN)
+            for trade_index, resource_index in enumerate(TRADE_RESOURCE_GIVEN):
+                if resource_cards[resource_index] >= player.best_trade_type[resource_index]:
+                    trade_with_game[trade_index] = 1
+
+        # Development cards
+        buy_development_card = 0
+        if not setup and len(player.game_manager.development_cards) != 0 and player.hasResources(DEVELOPMENT_CARD_COST):
+            buy_development_card = 1
+
+        knight = 0
+        if not setup and player.development_cards[0] != 0:
+            knight = 1
+
+        return {'Settlements': settlements, 'Cities': cities, 'Roads': roads, 'EndTurn': [0 if setup else 1],
+                'TradeWithGame': trade_with_game, 'BuyDevelopmentCard': [buy_development_card], 'Knight': [knight]}
+
+    def _updateBlockedNodeMasks(self, node_index):
+        """
+        Update settlement masks of a node and its neighbours after the board changed their block counts
+        :param node_index: Index of node built on or cleared
+        """
+        for blocked_node in (node_index,) + self.game_board.node_neighbours[node_index]:
+            self._updateSetupSettlementMask(blocked_node)
+            for player_index in range(len(self.settlement_mask)):
+                self._updateSettlementMask(blocked_node, player_index)
+
+    def _changeRoadCount(self, edge_index, player_index, change):
+        """
+        Change road counts at each end of an edge and update affected masks
+        :param edge_index: Index of edge built on
+        :param player_index: Index of player who owns road
+        :param change: 1 when road is built, -1 when road is removed
+        """
+        for node_index in self.game_board.edges[edge_index].nodes:
+            self.road_count[player_index][node_index] += change
+            self._updateSettlementMask(node_index, player_index)
+            self._updateRoadMasksAroundNode(node_index, player_index)
+
+        # Edge is no longer (or is again) available to all other players
+        for other_player_index in range(len(self.road_mask)):
+            self._updateRoadMask(edge_index, other_player_index)
+
+    def _updateSetupSettlementMask(self, node_index):
+        # Settlements can't be built next to ports in the setup phase
+        node = self.game_board.nodes[node_index]
+        self.setup_settlement_mask[node_index] = int(self.node_block_count[node_index] == 0 and sum(node.ports) == 0)
+
+    def _updateSettlementMask(self, node_index, player_index):
+        if self.node_block_count[node_index] == 0 and self.road_count[player_index][node_index] != 0:
+            self.settlement_mask[player_index][node_index] = 1
+            self.settlement_frontier[player_index].add(node_index)
+        else:
+            self.settlement_mask[player_index][node_index] = 0
+            self.settlement_frontier[player_index].discard(node_index)
+
+    def _updateRoadMasksAroundNode(self, node_index, player_index):
+        for edge_index in self.game_board.topology.node_edges[node_index]:
+            self._updateRoadMask(edge_index, player_index)
+
+    def _updateRoadMask(self, edge_index, player_index):
+        # Edge must be empty and connected at either end to player's road, settlement or city
+        legal = 0
+        if self.game_board.edge_owner[edge_index] == 0:
+            for node_index in self.game_board.topology.edge_pairs[edge_index]:
+                if self.road_count[player_index][node_index] != 0 or \
+                        self.game_board.node_owner[node_index] == player_index + 1:
+                    legal = 1
+                    break
+
+        self.road_mask[player_index][edge_index] = legal
+        if legal:
+            self.road_frontier[player_index].add(edge_index)
+        else:
+            self.road_frontier[player_index].discard(edge_index)
@@ -0,0 +1,131 @@
+"""
+Move objects.
+
+A move is one action a player can take, named by the same key as the output dictionary of a move function. Moves are
+applied to a GameManager and undone again without copying the game, so a search can walk the game tree in place:
+
+    move = BuildRoad(player_index=0, edge_index=14)
+    if move.apply(game_manager):
+        ...
+        move.undo(game_manager)
+
+Moves must be undone in the reverse order they were applied.
+"""
+
+
+class Move:
+    # Key of GameManager.action_functions which performs the move
+    key = None
+
+    def __init__(self, player_index, element=0):
+        """
+        Base class for moves
+        :param player_index: Index of player making move
+        :param element: Index of element in the move function output list for this type of move
+        """
+        self.player_index = player_index
+        self.element = element
+
+    def apply(self, game_manager):
+        """
+        Perform move, recording what it changes
+        :param game_manager: GameManager instance
+        :return: Bool - was move performed
+        """
+        return game_manager.applyMove(self)
+
+    def undo(self, game_manager):
+        """
+        Reverse move. Must be the most recent move applied to game_manager
+        :param game_manager: GameManager instance
+        """
+        game_manager.undoMove(self)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.player_index == other.player_index and self.element == other.element
+
+    def __hash__(self):
+        return hash((self.key, self.player_index, self.element))
+
+    def __repr__(self):
+        return type(self).__name__ + '(' + str(self.player_index) + ', ' + str(self.element) + ')'
+
+
+class BuildSettlement(Move):
+    key = 'Settlements'
+
+    def __init__(self, player_index, node_index):
+        super(BuildSettlement, self).__init__(player_index, node_index)
+
+
+class BuildCity(Move):
+    key = 'Cities'
+
+    def __init__(self, player_index, node_index):
+        super(BuildCity, self).__init__(player_index, node_index)
+
+
+class BuildRoad(Move):
+    key = 'Roads'
+
+    def __init__(self, player_index, edge_index):
+        super(BuildRoad, self).__init__(player_index, edge_index)
+
+
+class TradeWithGame(Move):
+    key = 'TradeWithGame'
+
+    def __init__(self, player_index, trade_index):
+        super(TradeWithGame, self).__init__(player_index, trade_index)
+
+
+class BuyDevelopmentCard(Move):
+    key = 'BuyDevelopmentCard'
+
+
+class PlayKnight(Move):
+    key = 'Knight'
+
+
+# Move class for each key of a move function output dictionary, apart from EndTurn
+MOVE_TYPES = {move_type.key: move_type for move_type in
+              (BuildSettlement, BuildCity, BuildRoad, TradeWithGame, BuyDevelopmentCard, PlayKnight)}
+
+
+def moveFromAction(key, player_index, element=0):
+    """
+    Creates a move from an element of a move function output or legal action mask
+    :param key: Dictionary key, e.g. 'Roads'
+    :param player_index: Index of player making move
+    :param element: Index of element in list
+    :return: Move instance
+    """
+    return MOVE_TYPES[key](player_index, element)
+
+
+def legalMoves(game_manager, player_index):
+    """
+    Lists every move a player can currently make
+    :param game_manager: GameManager instance
+    :param player_index: Index of player
+    :return: List of Move instances
+    """
+    mask = game_manager.legalActionMask(game_manager.players[player_index])
+
+    # Where the mask is the player's own settlement or road mask, the marked elements are read from its frontier
+    legal_actions = game_manager.legal_actions
+    frontiers = {'Settlements': (legal_actions.settlement_mask[player_index],
+                                 legal_actions.settlement_frontier[player_index]),
+                 'Roads': (legal_actions.road_mask[player_index], legal_actions.road_frontier[player_index])}
+
+    moves = []
+    for key in MOVE_TYPES:
+        if key in frontiers and mask[key] is frontiers[key][0]:
+            elements = sorted(frontiers[key][1])
+        else:
+            elements = [element for element, legal in enumerate(mask[key]) if legal == 1]
+
+        for element in elements:
+            moves.append(moveFromAction(key, player_index, element))
+
+    return moves
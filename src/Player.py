@@ -1,5 +1,10 @@
-import random
+import functools
+import inspect
 import math
+import random
+import time
+
+from src.ActionLayout import *
 
 
 class Player:
@@ -13,7 +18,11 @@ class Player:
         self.game_manager = None
         self.move_function = move_function
 
-        # Information known about other players (ignore element corresponding to self)
+        # Random stream for the player's own random choices, replaced by the game's agent stream for this player
+        self.rng = random
+
+        # Information known about other players (ignore element corresponding to self). Resized to the number of players
+        # in the game the player joins
         self.number_of_resource_cards = [0, 0, 0, 0]
         self.number_of_development_cards = [0, 0, 0, 0]
 
@@ -49,43 +58,46 @@ class Player:
     def setup(self):
         """
         Defines player logic for set-up phase of game (Turn 0)
-        :return: node_index of settlement, edge_index of road
+        :return: node_index of settlement, edge_index of road or None if no road could be placed
         """
-        print('\nPlayer ' + str(self.player_index) + ':')
-        print('Placing settlement')
+        event_log = self.game_manager.event_log
+        if event_log.active:
+            event_log.emit('placing_settlement', player=self.player_index)
+
         # Evaluate network to get output vector and dictionary
         network_output, vector_output = self.evaluateNetwork(self.assembleInputVector())
         settlements_vector = network_output['Settlements']
 
-        # Whilst settlement hasn't been placed, find maximum node in settlements_vector and try and build there. If can't, choose next best
-        settlement_built = False
-        nodes_tested = 0
-        while not settlement_built:
-            nodes_tested += 1
-            desired_node = settlements_vector.index(max(settlements_vector))
-            if self.game_manager.buildSettlement(self, desired_node):
-                settlement_built = True
-            else:
-                settlements_vector[desired_node] = 0
+        # Build on the legal node with the highest value in settlements_vector
+        legal_nodes = self.game_manager.legalActionMask(self)['Settlements']
+        desired_node = None
+        for node_index, legal in enumerate(legal_nodes):
+            if legal == 1 and (desired_node is None or settlements_vector[node_index] > settlements_vector[desired_node]):
+                desired_node = node_index
+
+        self.game_manager.buildSettlement(self, desired_node)
 
-            if nodes_tested == 53:
-                break
+        # Get list of legal edges connected to node which player has built settlement on
+        legal_edges = self.game_manager.legalActionMask(self)['Roads']
+        available_edges = [edge.ID for edge in self.game_manager.game_board.nodes[desired_node].connected_edges
+                           if legal_edges[edge.ID] == 1]
+
+        # Other players' roads can take every edge of the node, leaving nowhere to place a road
+        if len(available_edges) == 0:
+            return desired_node, None
+
+        if event_log.active:
+            event_log.emit('placing_road', player=self.player_index)
 
-        print('Placing road')
         # Evaluate network to get output vector and dictionary
         network_output, vector_output = self.evaluateNetwork(self.assembleInputVector())
         roads_vector = network_output['Roads']
 
-        # Get list of connected edges which player has built settlement on
-        available_edges = self.game_manager.game_board.nodes[desired_node].connected_edges
-
         # Find edge from available edges with highest value of roads vector
-        road_location = available_edges[0].ID
-        max_output = roads_vector[road_location]
-        for edge in available_edges:
-            if roads_vector[edge.ID] > max_output:
-                road_location = edge.ID
-                max_output = roads_vector[edge.ID]
+        road_location = available_edges[0]
+        for edge_index in available_edges:
+            if roads_vector[edge_index] > roads_vector[road_location]:
+                road_location = edge_index
 
         self.game_manager.buildRoad(self, road_location)
 
@@ -96,26 +108,65 @@ class Player:
         Wrapper around controller for player. Continuously makes decisions until pass decision made
         """
 
+        profile = self.game_manager.profile
+        actions_taken = 0
+        rejected_actions = 0
+
         # Evaluate network and return decision
         network_output, vector_output = self.evaluateNetwork(self.assembleInputVector())
 
-        # Go through output from decision corresponding to highest output to lowest until valid move found
+        # Repeatedly take the highest valued legal action until ending turn is the best legal action
+        layout = self.game_manager.action_layout
+        scores = layout.flatten(network_output)
         while True:
 
-            # Find highest decision
-            key, element = getHighestAcrossDictionaries(network_output)
+            # Find highest legal decision
+            if profile is not None:
+                start_time = time.perf_counter()
+            key, element = layout.popHighestLegalAction(scores, self.game_manager.legalActionMask(self))
+            if profile is not None:
+                profile.addTime('legality_checks', time.perf_counter() - start_time)
 
             # Check for ending turn
-            if key == 'EndTurn':
+            if key == 'EndTurn' or key is None:
+                if profile is not None:
+                    profile.count('decisions')
+                    profile.count('actions', actions_taken)
+                    profile.count('rejected_actions', rejected_actions)
+                    profile.observe('actions_per_decision', actions_taken)
+                    profile.observe('rejected_actions_per_decision', rejected_actions)
                 return
             else:
-                # If not ending turn, attempt action or set corresponding element to 0 if not possible
-                self.game_manager.action_functions[key](self, element)
-                network_output[key][element] = 0
+                # If not ending turn, perform action. Its score has been set to 0 so it isn't repeated
+                if profile is not None:
+                    start_time = time.perf_counter()
+                if self.game_manager.action_functions[key](self, element):
+                    actions_taken += 1
+                else:
+                    rejected_actions += 1
+                if profile is not None:
+                    profile.addTime('actions', time.perf_counter() - start_time)
 
         # If not returned, call action again to make next decision
         self.action()
 
+    def snapshot(self):
+        """
+        Capture player's game state in an immutable form
+        :return: Tuple for restore
+        """
+        return (tuple(self.resource_cards), tuple(self.development_cards), tuple(self.building_pieces),
+                tuple(self.best_trade_type), tuple(self.number_of_resource_cards),
+                tuple(self.number_of_development_cards))
+
+    def restore(self, snapshot):
+        """
+        Restore player's game state captured by snapshot. Lists are updated in place
+        :param snapshot: Tuple from snapshot
+        """
+        (self.resource_cards[:], self.development_cards[:], self.building_pieces[:], self.best_trade_type[:],
+         self.number_of_resource_cards[:], self.number_of_development_cards[:]) = snapshot
+
     def endGame(self, points):
         pass
 
@@ -127,12 +178,19 @@ class Player:
         Assembles input vector for network based on current state of board
         :return: input vector
         """
-        # Assemble all input values
+        # Board values are kept up to date by the board so only need joining to the player's own values
         board_vector = self.game_manager.game_board.getInputValues()
         return board_vector + self.number_of_resource_cards + self.number_of_development_cards + self.development_cards + self.resource_cards
 
     def evaluateNetwork(self, input_vector):
-        return self.move_function(input_vector)
+        profile = self.game_manager.profile
+        if profile is None:
+            return self.move_function(input_vector)
+
+        start_time = time.perf_counter()
+        output = self.move_function(input_vector)
+        profile.addTime('policy_evaluation', time.perf_counter() - start_time)
+        return output
 
     def hasResources(self, resources):
         """
@@ -158,7 +216,7 @@ class Player:
 
         # Discard cards
         while number_to_discard != 0:
-            index_to_discard = random.randint(0, 4)
+            index_to_discard = self.rng.randint(0, 4)
             if self.resource_cards[index_to_discard] != 0:
                 self.resource_cards[index_to_discard] -= 1
                 number_to_discard -= 1
@@ -169,7 +227,7 @@ class Player:
         """
 
         # Now random!
-        self.game_manager.robber_location = random.randint(0, 17)
+        self.game_manager.robber_location = self.rng.randint(0, self.game_manager.game_board.number_of_hex_ids - 1)
 
     def choosePlayerToStealFrom(self, list_of_players):
         """
@@ -177,7 +235,7 @@ class Player:
         """
 
         # Currently random
-        random.shuffle(list_of_players)
+        self.rng.shuffle(list_of_players)
         return list_of_players[0]
 
 
@@ -211,43 +269,45 @@ def getHighestAcrossDictionaries(output_dictionary):
     return max_key, element_index
 
 
-def randomAction(inputVector):
+def seedMoveFunction(move_function, rng, layout=None):
+    """
+    Binds a random stream, and optionally an action layout, to a move function which accepts them as rng and layout
+    keyword arguments
+    :param move_function: Move function
+    :param rng: Random stream, e.g. GameManager.random_streams.agent[player_index]
+    :param layout: ActionLayout of the board played on, e.g. GameManager.action_layout. None leaves layout unbound
+    :return: Move function using rng and layout, or move_function unchanged if it takes neither
+    """
+    try:
+        parameters = inspect.signature(move_function).parameters
+    except (TypeError, ValueError):
+        return move_function
+
+    bound = {}
+    if 'rng' in parameters:
+        bound['rng'] = rng
+    if layout is not None and 'layout' in parameters:
+        bound['layout'] = layout
+
+    if len(bound) != 0:
+        return functools.partial(move_function, **bound)
+    return move_function
+
+
+def randomAction(inputVector, rng=random, layout=STANDARD_LAYOUT):
     """
     Sample wrapper function for network
     :param inputVector: vector containing all player knowledge of the game state
+    :param rng: Random stream to draw values from. Defaults to the global random module
+    :param layout: ActionLayout of the board played on
     :return: dictionary made up of vectors containing the choices made by the network broken up by category for convenience
     """
 
-    # Generate random values for choices of settlement placement
-    settlements = [0] * 54
-    cities = [0] * 54
-    for i in range(54):
-        settlements[i] = random.uniform(0, 1)
-        cities[i] = random.uniform(0, 1)
-
-    # Generate random values for choices of settlement placement
-    roads = [0] * 72
-    for i in range(72):
-        roads[i] = random.uniform(0, 1)
-
-    # Trading
-    trade_with_game = [0] * 20
-    for i in range(20):
-        trade_with_game[i] = random.uniform(0, 1)
-
-    # Ending turn
-    end_turn = [random.uniform(0, 1)]
-
-    # Purchasing development card
-    buy_development_card = [random.uniform(0, 1)]
-
-    # Use development card
-    knight = [random.uniform(0, 1)]
-
-    output_dictionary = {'Settlements': settlements, 'Cities': cities, 'Roads': roads,
-                         'EndTurn': end_turn, 'TradeWithGame': trade_with_game,
-                         'BuyDevelopmentCard': buy_development_card,
-                         'Knight': knight}
-    output_vector = settlements + cities + roads + end_turn + trade_with_game + buy_development_card + knight
+    # One value per slot, in slot order: settlements, cities, roads, ending turn, trading, buying and using development
+    # cards
+    uniform = rng.uniform
+    output_vector = [uniform(0, 1) for slot in range(layout.size)]
+
+    output_dictionary = layout.split(output_vector)
 
     return output_dictionary, output_vector
\ No newline at end of file
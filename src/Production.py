@@ -0,0 +1,103 @@
+"""
+Resource production table.
+
+ProductionTable keeps, for each dice roll, the resources each player receives with the robber where it currently is.
+The table is updated when a settlement or city is built or the robber moves, so handing out resources on a roll is a
+lookup rather than a walk over hexes, nodes and players.
+"""
+
+
+class ProductionTable:
+    def __init__(self, game_board, number_of_players, robber_location):
+        """
+        Class to track resources produced by each dice roll
+        :param game_board: Instance of Board class for current game. Hexes must already have dice rolls
+        :param number_of_players: number of players in game
+        :param robber_location: ID of hex the robber starts on
+        """
+        self.game_board = game_board
+        self.number_of_players = number_of_players
+
+        # (dice roll, resource index) produced by each hex position, None for positions which produce nothing
+        self.hex_yield = [None] * len(game_board.hex_node_connectivity)
+        for hexagon in game_board.hexes:
+            if hexagon.resource_index != -1:
+                self.hex_yield[hexagon.ID] = (hexagon.dice_roll, hexagon.resource_index)
+
+        """
+        Production:
+
+        - self.hex_amounts[hex][player] is the number of resources player gets from hex, ignoring the robber
+        - self.table[roll][player] lists the amount of each resource player receives when roll is made
+        - self.roll_totals[roll][player] is the total number of resources player receives when roll is made
+        """
+        self.hex_amounts = [[0] * number_of_players for hex_yield in self.hex_yield]
+        self.table = [[[0] * 5 for player in range(number_of_players)] for roll in range(13)]
+        self.roll_totals = [[0] * number_of_players for roll in range(13)]
+        self.robber_location = robber_location
+
+        self.rebuild(robber_location)
+
+    def buildingChanged(self, node_index, player_index, change):
+        """
+        Update production after a building is placed, upgraded or removed
+        :param node_index: Index of node built on
+        :param player_index: Index of player who owns building
+        :param change: Change in resources per roll of the node's hexes. 1 for a new settlement or a settlement upgraded
+                       to a city, -1 to reverse either
+        """
+        for hex_index in self.game_board.topology.node_hexes[node_index]:
+            if self.hex_yield[hex_index] is not None:
+                self.hex_amounts[hex_index][player_index] += change
+                if hex_index != self.robber_location:
+                    self._changeTable(hex_index, player_index, change)
+
+    def moveRobber(self, robber_location):
+        """
+        Update production after the robber moves
+        :param robber_location: ID of hex robber has moved to
+        """
+        if robber_location == self.robber_location:
+            return
+
+        self._blockHex(self.robber_location, -1)
+        self.robber_location = robber_location
+        self._blockHex(robber_location, 1)
+
+    def rebuild(self, robber_location):
+        """
+        Recalculate the whole table from the buildings on the board
+        :param robber_location: ID of hex robber is on
+        """
+        for amounts in self.hex_amounts:
+            amounts[:] = [0] * self.number_of_players
+        for roll in range(13):
+            for amounts in self.table[roll]:
+                amounts[:] = [0] * 5
+            self.roll_totals[roll][:] = [0] * self.number_of_players
+        self.robber_location = robber_location
+
+        for hex_index, hex_nodes in enumerate(self.game_board.hex_node_connectivity):
+            if self.hex_yield[hex_index] is None:
+                continue
+
+            for node_index in hex_nodes:
+                if self.game_board.node_owner[node_index] != 0:
+                    player_index = self.game_board.node_owner[node_index] - 1
+                    self.hex_amounts[hex_index][player_index] += self.game_board.node_building[node_index]
+
+            if hex_index != robber_location:
+                for player_index in range(self.number_of_players):
+                    self._changeTable(hex_index, player_index, self.hex_amounts[hex_index][player_index])
+
+    def _blockHex(self, hex_index, direction):
+        # Remove (direction 1) or restore (direction -1) everything produced by a hex
+        if self.hex_yield[hex_index] is not None:
+            for player_index, amount in enumerate(self.hex_amounts[hex_index]):
+                if amount != 0:
+                    self._changeTable(hex_index, player_index, -direction * amount)
+
+    def _changeTable(self, hex_index, player_index, change):
+        dice_roll, resource_index = self.hex_yield[hex_index]
+        self.table[dice_roll][player_index][resource_index] += change
+        self.roll_totals[dice_roll][player_index] += change
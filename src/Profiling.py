@@ -0,0 +1,139 @@
+"""
+Opt-in game profiling.
+
+A GameProfile passed to a GameManager records where time goes in the turn loop and how players' decisions go. Games
+without a profile skip all of it, as every call site checks for one first:
+
+    if self.profile is not None:
+        self.profile.addTime('dice_distribution', time.perf_counter() - start_time)
+
+Profiles from many games can be merged into one, e.g. to summarise a batch.
+"""
+
+# Timed phases, in the order they are reported
+PROFILE_PHASES = ['turn', 'dice_distribution', 'robber', 'policy_evaluation', 'legality_checks', 'actions',
+                  'longest_road']
+
+
+class GameProfile:
+    def __init__(self):
+        """
+        Timers, counters and histograms for one or more games
+
+        - self.times[phase] is total seconds spent in phase and self.calls[phase] is number of times it was timed
+        - self.counters[name] is a running count, e.g. 'rejected_actions'
+        - self.histograms[name][value] is number of times value was observed, e.g. rejected actions per decision
+        """
+        self.times = {}
+        self.calls = {}
+        self.counters = {}
+        self.histograms = {}
+
+    def addTime(self, phase, seconds):
+        """
+        Record time spent in a phase
+        :param phase: Name of phase
+        :param seconds: Time spent
+        """
+        self.times[phase] = self.times.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def count(self, name, amount=1):
+        """
+        Add to a counter
+        :param name: Name of counter
+        :param amount: Amount to add
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, value):
+        """
+        Add an integer value to a histogram
+        :param name: Name of histogram
+        :param value: Value observed
+        """
+        histogram = self.histograms.setdefault(name, {})
+        histogram[value] = histogram.get(value, 0) + 1
+
+    def merge(self, other):
+        """
+        Add everything recorded by another profile to this one
+        :param other: GameProfile
+        """
+        for phase, seconds in other.times.items():
+            self.times[phase] = self.times.get(phase, 0.0) + seconds
+            self.calls[phase] = self.calls.get(phase, 0) + other.calls[phase]
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+        for name, other_histogram in other.histograms.items():
+            histogram = self.histograms.setdefault(name, {})
+            for value, frequency in other_histogram.items():
+                histogram[value] = histogram.get(value, 0) + frequency
+
+    def meanTime(self, phase):
+        """
+        Mean time of a phase
+        :param phase: Name of phase
+        :return: Mean seconds per call, 0 if phase was never timed
+        """
+        if self.calls.get(phase, 0) == 0:
+            return 0.0
+        return self.times[phase] / self.calls[phase]
+
+    def histogramMean(self, name):
+        """
+        Mean of values in a histogram
+        :param name: Name of histogram
+        :return: Mean value, 0 if histogram is empty
+        """
+        histogram = self.histograms.get(name, {})
+        observations = sum(histogram.values())
+        if observations == 0:
+            return 0.0
+        return sum(value * frequency for value, frequency in histogram.items()) / observations
+
+
+def mergeProfiles(profiles):
+    """
+    Merges profiles, e.g. one per game of a batch
+    :param profiles: Iterable of GameProfile instances, None entries are skipped
+    :return: GameProfile
+    """
+    merged_profile = GameProfile()
+    for profile in profiles:
+        if profile is not None:
+            merged_profile.merge(profile)
+
+    return merged_profile
+
+
+def formatProfile(profile):
+    """
+    Formats a profile as a printable table
+    :param profile: GameProfile
+    :return: String
+    """
+    # The turn phase contains the others apart from setup decisions, so percentages are of turn time
+    turn_time = profile.times.get('turn', 0.0)
+
+    lines = ['{:<20} {:>10} {:>12} {:>14} {:>8}'.format('Phase', 'Calls', 'Total (s)', 'Mean (us)', '% turn')]
+    phases = PROFILE_PHASES + sorted(phase for phase in profile.times if phase not in PROFILE_PHASES)
+    for phase in phases:
+        if phase not in profile.times:
+            continue
+        share = profile.times[phase] / turn_time if turn_time > 0 else 0.0
+        lines.append('{:<20} {:>10} {:>12.3f} {:>14.2f} {:>8.1%}'.format(phase, profile.calls[phase],
+                                                                         profile.times[phase],
+                                                                         profile.meanTime(phase) * 1e6, share))
+
+    lines.append('')
+    for name, amount in sorted(profile.counters.items()):
+        lines.append('{:<32} {:>12}'.format(name, amount))
+
+    for name, histogram in sorted(profile.histograms.items()):
+        lines.append('')
+        lines.append(name + ' (mean ' + '{:.2f}'.format(profile.histogramMean(name)) + ')')
+        for value in sorted(histogram):
+            lines.append('  {:>6} {:>12}'.format(value, histogram[value]))
+
+    return '\n'.join(lines)
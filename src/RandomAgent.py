@@ -0,0 +1,83 @@
+import operator
+import random
+import struct
+from itertools import repeat
+
+from src.ActionLayout import *
+
+"""
+Fast random baseline agent.
+
+RandomAgent is a drop-in replacement for randomAction. All of its scores come from a single getrandbits call, which is
+unpacked into one integer per action in C rather than drawing every score with its own call. Priors make some kinds of
+action more likely than others:
+
+    cautious_agent = RandomAgent({'EndTurn': 4, 'TradeWithGame': 0.25})
+    players = [Player(cautious_agent) for i in range(4)]
+
+With every prior 1, scores are the drawn integers from 0 to 2 ** 32 - 1, which rank actions the same way uniform floats
+would. Otherwise each score is u ** (1 / prior) for u uniform between 0 and 1, so among the legal actions, each is the
+highest scoring with probability proportional to its prior. Actions with a prior of 0 are never taken.
+"""
+
+# Bits drawn per score
+SCORE_BITS = 32
+
+
+class RandomAgent:
+    def __init__(self, priors=None, layout=STANDARD_LAYOUT):
+        """
+        Move function giving actions random scores
+        :param priors: Dictionary of move function output key to a prior of at least 0. Keys left out have prior 1
+        :param layout: ActionLayout of the board played on
+        """
+        self.priors = dict(priors or {})
+        self.layout = layout
+
+        # Name identifying agent in batch results, so agents with different priors are summarised separately
+        self.name = 'RandomAgent(' + ', '.join(key + '=' + str(prior) for key, prior in self.priors.items()) + ')'
+
+        for key, prior in self.priors.items():
+            if key not in layout.keys:
+                raise ValueError('Unknown action key ' + repr(key))
+            if prior < 0:
+                raise ValueError('Prior of ' + key + ' must be at least 0')
+
+        # Format unpacking the drawn bits into one integer per slot. Kept as a string so agents can be pickled to
+        # worker processes, struct caches its compiled form
+        self._format = '<' + str(layout.size) + 'I'
+        self._bytes = 4 * layout.size
+
+        # Exponent applied to each slot's uniform value, None when every prior is 1 and the integers are used as drawn.
+        # A prior of 0 gives an infinite exponent, which takes any value below 1 to 0
+        self._exponents = None
+        if any(prior != 1 for prior in self.priors.values()):
+            self._exponents = []
+            for key in layout.keys:
+                prior = self.priors.get(key, 1)
+                self._exponents += [1 / prior if prior > 0 else float('inf')] * layout.sizes[key]
+
+    def __call__(self, input_vector, rng=random):
+        """
+        Move function drawing a score for every action
+        :param input_vector: vector containing all player knowledge of the game state
+        :param rng: Random stream to draw scores from. Defaults to the global random module
+        :return: output dictionary, output vector
+        """
+        bits = rng.getrandbits(SCORE_BITS * self.layout.size)
+        values = struct.unpack(self._format, bits.to_bytes(self._bytes, 'little'))
+
+        if self._exponents is None:
+            output_vector = list(values)
+        else:
+            uniforms = map(operator.mul, values, repeat(2.0 ** -SCORE_BITS))
+            output_vector = list(map(pow, uniforms, self._exponents))
+
+        return self.layout.split(output_vector), output_vector
+
+    def __repr__(self):
+        return self.name
+
+
+# Agent with every prior 1, for use wherever randomAction is
+fastRandomAction = RandomAgent()
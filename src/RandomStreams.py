@@ -0,0 +1,93 @@
+import random
+
+"""
+Random number streams for a game.
+
+Each game owns independent streams derived from one seed, so a game can be replayed from its seed and games running in
+parallel threads don't share random state. Keeping the streams separate means that changing how players decide doesn't
+change the board or the dice, so different agents can be compared on the same dice rolls.
+"""
+
+
+class RandomStreams:
+    def __init__(self, seed=None, number_of_players=4, dice_rolls=None):
+        """
+        Creates the random streams for a game
+        :param seed: Integer seed. None draws a seed from the global random module, so random.seed still makes games
+                     repeatable
+        :param number_of_players: Number of players in game, each gets their own agent stream
+        :param dice_rolls: Optional sequence of pre-drawn dice rolls, used in order before the dice stream
+        """
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+
+        """
+        Streams:
+
+        - self.board lays out the board and chooses the starting player
+        - self.dice is only used to roll dice
+        - self.deck shuffles development cards and picks cards stolen by the robber
+        - self.agent[player] makes the random choices of each player
+        """
+        self.board = deriveStream(seed, 'board')
+        self.dice = deriveStream(seed, 'dice')
+        self.deck = deriveStream(seed, 'deck')
+        self.agent = [deriveStream(seed, 'agent' + str(player_index)) for player_index in range(number_of_players)]
+
+        self.dice_rolls = list(dice_rolls) if dice_rolls is not None else []
+        self.dice_roll_index = 0
+
+    def rollDice(self):
+        """
+        Rolls two dice, using pre-drawn dice rolls first
+        :return: Total of roll
+        """
+        if self.dice_roll_index < len(self.dice_rolls):
+            dice_roll = self.dice_rolls[self.dice_roll_index]
+            self.dice_roll_index += 1
+            return dice_roll
+
+        return self.dice.randrange(1, 7) + self.dice.randrange(1, 7)
+
+    def getState(self):
+        """
+        Capture the state of every stream
+        :return: Tuple for setState
+        """
+        return (self.board.getstate(), self.dice.getstate(), self.deck.getstate(),
+                tuple(agent.getstate() for agent in self.agent), self.dice_roll_index)
+
+    def setState(self, state):
+        """
+        Return every stream to a state captured by getState
+        :param state: Tuple from getState
+        """
+        board_state, dice_state, deck_state, agent_states, self.dice_roll_index = state
+        self.board.setstate(board_state)
+        self.dice.setstate(dice_state)
+        self.deck.setstate(deck_state)
+        for agent, agent_state in zip(self.agent, agent_states):
+            agent.setstate(agent_state)
+
+
+def deriveStream(seed, name):
+    """
+    Creates a random stream for one purpose from a game seed
+    :param seed: Game seed
+    :param name: Name of stream
+    :return: random.Random instance
+    """
+    # String seeds are hashed with SHA-512, so streams with different names are independent
+    return random.Random(str(seed) + '/' + name)
+
+
+def drawDiceRolls(seed, number_of_rolls):
+    """
+    Draws a sequence of dice rolls, e.g. to play several games with the same rolls
+    :param seed: Integer seed
+    :param number_of_rolls: Number of rolls to draw
+    :return: List of dice roll totals
+    """
+    dice = deriveStream(seed, 'dice')
+    return [dice.randrange(1, 7) + dice.randrange(1, 7) for roll in range(number_of_rolls)]
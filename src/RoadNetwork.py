@@ -1,11 +1,15 @@
+from src.EventLog import *
 from src.Graph import *
 
 class RoadNetwork(Graph):
-    def __init__(self, game_board, player_index):
+    def __init__(self, game_board, player_index, event_log=None):
         """
         Class to represent a players road network
         :param game_board: Instance of Board class for current game
+        :param player_index: Index of player who owns road network
+        :param event_log: EventLog to report road network events to. Defaults to a silent log
         """
+        self.event_log = event_log if event_log is not None else EventLog()
 
         # Initialise board variables
         self.game_board = game_board
@@ -20,16 +24,19 @@ class RoadNetwork(Graph):
         """
         Add a road to the road network
         :param edge_index: Index of edge to build on (referring to the board graph)
+        :return: List of board node indices which new road network nodes were added for, for removeLastRoad
         """
+        new_board_nodes = []
 
         # For each node connected to board edge, find corresponding node in road network
         road_network_nodes = [None, None]
         for index, node in enumerate(self.game_board.edges[edge_index].nodes):
 
             # If node is occupied by another players settlement or city - Add new node to RoadNetwork
-            if not self.game_board.nodes[node].isEmpty() and self.game_board.nodes[node].settlement[self.player_index] == 0 and self.game_board.nodes[node].city[self.player_index] == 0:
+            if self.game_board.node_owner[node] not in (0, self.player_index + 1):
                 road_network_nodes[index] = self.appendNodeToGraph({'board_index': self.game_board.edges[edge_index].nodes[index]})
                 self.board_node_to_road_node[node].append(road_network_nodes[index])
+                new_board_nodes.append(node)
 
             # Else find corresponding road network node in self.board_node_to_road_node
             elif len(self.board_node_to_road_node[node]) != 0:
@@ -39,45 +46,94 @@ class RoadNetwork(Graph):
             else:
                 road_network_nodes[index] = self.appendNodeToGraph({'board_index': self.game_board.edges[edge_index].nodes[index]})
                 self.board_node_to_road_node[node].append(road_network_nodes[index])
+                new_board_nodes.append(node)
 
         # Add edge between nodes
         self.appendEdgeToGraph(road_network_nodes, {'edge_index': edge_index})
 
+        return new_board_nodes
+
+    def removeLastRoad(self, new_board_nodes):
+        """
+        Remove the most recently added road, reversing addRoad
+        :param new_board_nodes: List returned by addRoad
+        """
+        self.removeLastEdge()
+
+        # Nodes were appended in order, so remove them in reverse
+        for node in reversed(new_board_nodes):
+            self.board_node_to_road_node[node].pop()
+            self.removeLastNode()
+
+    def snapshot(self):
+        """
+        Capture road network in an immutable form
+        :return: Tuple of road network state for restore
+        """
+        return super(RoadNetwork, self).snapshot(), tuple(tuple(nodes) for nodes in self.board_node_to_road_node)
+
+    def restore(self, snapshot):
+        """
+        Restore road network to state captured by snapshot
+        :param snapshot: Tuple from snapshot
+        """
+        graph_snapshot, board_node_to_road_node = snapshot
+        super(RoadNetwork, self).restore(graph_snapshot)
+        self.board_node_to_road_node = [list(nodes) for nodes in board_node_to_road_node]
+
     def breakRoadAtNode(self, board_node_index):
         """
         Handle event where this players road is broken by another players settlement
         :param node_index: Index of node which settlement was built on
+        :return: List of (edge index, new node index) for each edge moved onto a new node, for joinRoadAtNode
         """
 
         # Check if node is in self.board_node_to_road_node
         graph_nodes = self.board_node_to_road_node[board_node_index]
         if len(graph_nodes) == 0:
-            return
-
-        # Find graph edges connected to graph node
-        connection_index = 0
-        for index, connectivity in enumerate(self.node_connectivity[graph_nodes[0]]):
-            # For each connected edge apart from the first, add a new node and update the nodes on the edge
-            if connectivity == 1:
-                if connection_index != 0:
-                    new_id = self.appendNodeToGraph({'board_index': board_node_index})
-
-                    # Get edge object
-                    for edge in self.edges:
-                        if edge.nodes == [index, graph_nodes[0]] or edge.nodes == [graph_nodes[0], index]:
-                            # Update edge with new node
-                            edge.nodes = [new_id, index]
-
-                connection_index += 1
-
-        # Update node connectivity
-        self.node_connectivity = constructNodeConnectivityMatrix(self.listEdgeNodeIndices())
-
-        print('Player ' + str(self.player_index) + '\'s RoadNetwork broken at node ' + str(board_node_index))
-
+            return []
 
+        # For each connected edge apart from the first, add a new node and move the end of the edge onto it
+        moved_edges = []
+        for edge_index in self.node_edges[graph_nodes[0]][1:]:
+            new_id = self.appendNodeToGraph({'board_index': board_node_index})
+            self.reassignEdgeNode(edge_index, graph_nodes[0], new_id)
+            moved_edges.append((edge_index, new_id))
 
+        if self.event_log.active:
+            self.event_log.emit('road_network_broken', player=self.player_index, node=board_node_index)
 
+        return moved_edges
 
+    def joinRoadAtNode(self, board_node_index, moved_edges):
+        """
+        Rejoin road broken at a node, reversing breakRoadAtNode
+        :param board_node_index: Index of node road was broken at
+        :param moved_edges: List returned by breakRoadAtNode
+        """
+        if len(moved_edges) == 0:
+            return
 
+        original_node = self.board_node_to_road_node[board_node_index][0]
+        for edge_index, new_id in reversed(moved_edges):
+            self.reassignEdgeNode(edge_index, new_id, original_node)
+            self.removeLastNode()
 
+    def connectedBoardNodes(self, board_node_index):
+        """
+        Finds the board nodes which can be reached from a board node along this player's roads. Roads can't be
+        followed through another player's settlement or city, as the network is broken there
+        :param board_node_index: Index of board node to start from
+        :return: List of board node indices, nearest first and starting with board_node_index. Empty if none of this
+                 player's roads reach board_node_index
+        """
+        connected_board_nodes = []
+        reached = set()
+        for road_node in self.board_node_to_road_node[board_node_index]:
+            for node in self.reachableNodes(road_node):
+                board_index = self.nodes[node].variables['board_index']
+                if board_index not in reached:
+                    reached.add(board_index)
+                    connected_board_nodes.append(board_index)
+
+        return connected_board_nodes
@@ -0,0 +1,113 @@
+import random
+import unittest
+
+from src.ActionLayout import *
+from src.GameManager import *
+from src.Player import *
+
+
+def getHighestLegalAcrossDictionaries(output_dictionary, legal_dictionary):
+    """
+    Given a dictionary of lists and a matching dictionary of legal action masks, find the dictionary key and element
+    index of the highest valued legal element
+    :param output_dictionary: Dictionary to search
+    :param legal_dictionary: Dictionary with the same keys and list lengths, 1 marks a legal element
+    :return: key - Key of dictionary with highest valued legal element, index - index of highest valued legal element in key
+    """
+    max_key = None
+    element_index = None
+    current_max = 0
+
+    for key, legal_elements in legal_dictionary.items():
+        values = output_dictionary[key]
+        for index, legal in enumerate(legal_elements):
+            if legal == 1 and values[index] > current_max:
+                max_key = key
+                element_index = index
+                current_max = values[index]
+
+    return max_key, element_index
+
+
+class ActionLayoutTest(unittest.TestCase):
+
+    def testStandardLayout(self):
+        """
+        Test that slots of the standard board are in output vector order
+        """
+        self.assertEqual(STANDARD_LAYOUT.size, 203)
+        self.assertEqual(STANDARD_LAYOUT.slot('Settlements', 0), 0)
+        self.assertEqual(STANDARD_LAYOUT.slot('Cities', 0), 54)
+        self.assertEqual(STANDARD_LAYOUT.slot('Roads', 71), 179)
+        self.assertEqual(STANDARD_LAYOUT.slot('EndTurn', 0), 180)
+        self.assertEqual(STANDARD_LAYOUT.slot('TradeWithGame', 19), 200)
+        self.assertEqual(STANDARD_LAYOUT.slot('Knight', 0), 202)
+
+        for slot, (key, element) in enumerate(STANDARD_LAYOUT.slot_actions):
+            self.assertEqual(STANDARD_LAYOUT.slot(key, element), slot)
+
+    def testFlattenAndSplit(self):
+        """
+        Test that randomAction's output vector is its dictionary flattened
+        """
+        output_dictionary, output_vector = randomAction([], random.Random(0))
+        self.assertEqual(STANDARD_LAYOUT.flatten(output_dictionary), output_vector)
+        self.assertEqual(STANDARD_LAYOUT.split(output_vector), output_dictionary)
+
+    def testRankLegalActions(self):
+        """
+        Test that legal actions scoring above 0 are ranked highest first, with ties kept in slot order
+        """
+        scores = [0] * STANDARD_LAYOUT.size
+        scores[STANDARD_LAYOUT.slot('Roads', 3)] = 0.5
+        scores[STANDARD_LAYOUT.slot('Roads', 4)] = 0.8
+        scores[STANDARD_LAYOUT.slot('Settlements', 7)] = 0.9
+        scores[STANDARD_LAYOUT.slot('EndTurn', 0)] = 0.5
+        scores[STANDARD_LAYOUT.slot('Knight', 0)] = 0.7
+
+        legal_dictionary = {key: [1] * STANDARD_LAYOUT.sizes[key] for key in ACTION_KEYS}
+        legal_dictionary['Roads'][4] = 0
+        self.assertEqual(STANDARD_LAYOUT.rankLegalActions(scores, legal_dictionary),
+                         [('Settlements', 7), ('Knight', 0), ('Roads', 3), ('EndTurn', 0)])
+
+    def testPopMatchesSearch(self):
+        """
+        Test that popping legal actions finds the same actions as searching the whole output dictionary with
+        getHighestLegalAcrossDictionaries
+        """
+        random.seed(3)
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players, seed=3)
+        game_manager.turn_counter = 1
+        players[0].resource_cards = [5, 5, 5, 5, 5]
+
+        rng = random.Random(1)
+        for decision in range(20):
+            output_dictionary, output_vector = randomAction([], rng)
+
+            # Legal actions change between pops as they would after taking actions
+            for step in range(5):
+                legal_dictionary = {key: [rng.randint(0, 1) for value in values]
+                                    for key, values in game_manager.legalActionMask(players[0]).items()}
+                expected = getHighestLegalAcrossDictionaries(output_dictionary, legal_dictionary)
+                self.assertEqual(STANDARD_LAYOUT.popHighestLegalAction(output_vector, legal_dictionary), expected)
+                if expected[0] is not None:
+                    output_dictionary[expected[0]][expected[1]] = 0
+
+    def testNoLegalAction(self):
+        """
+        Test that None is returned when no legal action scores above 0
+        """
+        scores = [0] * STANDARD_LAYOUT.size
+        scores[STANDARD_LAYOUT.slot('Roads', 3)] = 0.5
+
+        legal_dictionary = {key: [0] * STANDARD_LAYOUT.sizes[key] for key in ACTION_KEYS}
+        legal_dictionary['Settlements'][0] = 1
+        self.assertEqual(STANDARD_LAYOUT.popHighestLegalAction(scores, legal_dictionary), (None, None))
+
+        legal_dictionary['Settlements'][0] = 0
+        self.assertEqual(STANDARD_LAYOUT.popHighestLegalAction(scores, legal_dictionary), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from src.BatchRunner import *
+
+
+class BatchResults(unittest.TestCase):
+
+    def testRunBatch(self):
+        """
+        Test that a batch is played and summarised per move function
+        """
+        move_functions = [randomAction] * 4
+        summary, results = runBatch(move_functions, 2, processes=1, seed=3)
+
+        # Results are in seed order
+        self.assertEqual([result['seed'] for result in results], [3, 4])
+
+        # Every seat is counted against the only move function
+        self.assertEqual(summary['games'], 2)
+        name = moveFunctionName(randomAction)
+        self.assertEqual(list(summary['move_functions'].keys()), [name])
+        self.assertEqual(summary['move_functions'][name]['seats_played'], 8)
+
+        wins = 0
+        for result in results:
+            if result['winner'] is not None:
+                wins += 1
+        self.assertEqual(summary['move_functions'][name]['wins'], wins)
+
+    def testSeededGamesRepeat(self):
+        """
+        Test that playing a game with the same seed gives the same result
+        """
+        result_1 = playGame(GameArguments(11, [randomAction] * 4))
+        result_2 = playGame(GameArguments(11, [randomAction] * 4))
+        self.assertEqual(result_1['points'], result_2['points'])
+        self.assertEqual(result_1['turns'], result_2['turns'])
+
+    def testPlayerCounts(self):
+        """
+        Test that batches can be played with fewer or more players than 4
+        """
+        for number_of_players in (2, 3, 5):
+            summary, results = runBatch([randomAction] * number_of_players, 2, processes=1, seed=5)
+            self.assertEqual(summary['move_functions'][moveFunctionName(randomAction)]['seats_played'],
+                             2 * number_of_players)
+            for result in results:
+                self.assertEqual(len(result['points']), number_of_players)
+
+    def testLoadMoveFunction(self):
+        """
+        Test move functions can be imported from a module:function string
+        """
+        self.assertIs(loadMoveFunction('src.Player:randomAction'), randomAction)
+
+
+if __name__ == '__main__':
+    unittest.main()
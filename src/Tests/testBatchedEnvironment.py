@@ -0,0 +1,80 @@
+import unittest
+
+from src.BatchedEnvironment import *
+
+
+class LockstepGames(unittest.TestCase):
+
+    def testDecisionsBatched(self):
+        """
+        Test that all games finish and pending decisions from several games are evaluated together
+        """
+        batch_sizes = []
+
+        def policy(input_vectors):
+            batch_sizes.append(len(input_vectors))
+            return [randomAction(input_vector) for input_vector in input_vectors]
+
+        environment = BatchedEnvironment(policy, 3)
+        results = environment.run()
+
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertTrue(result['winner'] is not None or result['turns'] == 200)
+
+        # Policy called once per batch, batches of up to one decision per game
+        self.assertEqual(environment.policy_calls, len(batch_sizes))
+        self.assertEqual(environment.decisions, sum(batch_sizes))
+        self.assertEqual(environment.largest_batch, 3)
+        self.assertTrue(max(batch_sizes) <= 3)
+
+    def testMixedSeats(self):
+        """
+        Test that only seats without a move function are played by the batched policy
+        """
+        input_lengths = set()
+
+        def policy(input_vectors):
+            for input_vector in input_vectors:
+                input_lengths.add(len(input_vector))
+            return [randomAction(input_vector) for input_vector in input_vectors]
+
+        environment = BatchedEnvironment(policy, 2, seats=[None, randomAction, randomAction, randomAction])
+        environment.run()
+
+        for game_manager in environment.game_managers:
+            self.assertIsInstance(game_manager.players[0].move_function, BatchedMoveFunction)
+            self.assertIs(game_manager.players[1].move_function.func, randomAction)
+
+        self.assertTrue(environment.decisions > 0)
+        self.assertEqual(len(input_lengths), 1)
+
+    def testSeededGamesRepeat(self):
+        """
+        Test that a seeded batch plays the same games every time
+        """
+        def policy(input_vectors):
+            # Decisions depend only on the input, so the order games reach the policy doesn't matter
+            return [randomAction(input_vector, random.Random(str(input_vector))) for input_vector in input_vectors]
+
+        seats = [None, randomAction, randomAction, randomAction]
+        results_1 = BatchedEnvironment(policy, 3, seats=seats, seed=5).run()
+        results_2 = BatchedEnvironment(policy, 3, seats=seats, seed=5).run()
+
+        self.assertEqual(results_1, results_2)
+        self.assertNotEqual(results_1[0], results_1[1])
+
+    def testMissingOutputs(self):
+        """
+        Test that a policy returning too few outputs stops the batch with an error rather than leaving games waiting
+        """
+        def policy(input_vectors):
+            return [randomAction(input_vector) for input_vector in input_vectors[1:]]
+
+        environment = BatchedEnvironment(policy, 3)
+        with self.assertRaises(ValueError):
+            environment.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.Benchmarks import *
+
+
+class BenchmarkSuite(unittest.TestCase):
+
+    def testRunAndCompare(self):
+        """
+        Test that every benchmark runs and results survive a round trip through JSON for comparison
+        """
+        results = runBenchmarks(repeats=1, scale=0.01)
+        self.assertEqual(list(results['benchmarks'].keys()), [name for name, create_operation, number in BENCHMARKS])
+        for result in results['benchmarks'].values():
+            self.assertGreater(result['seconds_per_operation'], 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            with open(path, 'w') as results_file:
+                json.dump(results, results_file)
+            with open(path) as results_file:
+                baseline = json.load(results_file)
+
+        comparisons = compareResults(baseline, results)
+        self.assertEqual(len(comparisons), len(BENCHMARKS))
+        for comparison in comparisons:
+            self.assertAlmostEqual(comparison['ratio'], 1.0)
+            self.assertFalse(comparison['regressed'])
+
+    def testRegressionDetected(self):
+        """
+        Test that a benchmark slowing down by more than the threshold is reported
+        """
+        baseline = {'benchmarks': {'turn': {'seconds_per_operation': 1.0}, 'game': {'seconds_per_operation': 1.0}}}
+        current = {'benchmarks': {'turn': {'seconds_per_operation': 1.05}, 'game': {'seconds_per_operation': 1.5},
+                                  'new': {'seconds_per_operation': 1.0}}}
+
+        comparisons = {comparison['name']: comparison for comparison in compareResults(baseline, current, 0.1)}
+        self.assertEqual(sorted(comparisons), ['game', 'turn'])
+        self.assertFalse(comparisons['turn']['regressed'])
+        self.assertTrue(comparisons['game']['regressed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from src.Board import *
@@ -107,6 +108,63 @@ class TestEdge(unittest.TestCase):
         self.assertEqual(board.edgeHasRoadOrSettlement(48, 2), False)
 
 
+class InputValues(unittest.TestCase):
+    def test_InputValuesUpdatedInPlace(self):
+        """
+        Test input values are kept up to date as pieces are placed
+        """
+        # Initialise board
+        board = Board(4)
+        input_values = board.getInputValues()
+        self.assertEqual(input_values, board.assembleInputValues())
+
+        # Place settlement, city and road
+        board.placeSettlement(31, 1)
+        board.placeSettlement(12, 2)
+        board.placeCity(12, 2)
+        board.placeRoad(42, 1)
+
+        # Same list is updated
+        self.assertIs(board.getInputValues(), input_values)
+        self.assertEqual(input_values, board.assembleInputValues())
+        self.assertEqual(board.nodes[12].settlement, (0, 0, 0, 0))
+        self.assertEqual(board.nodes[12].city, (0, 0, 1, 0))
+
+
+class CompactState(unittest.TestCase):
+    def test_OccupancyArrays(self):
+        """
+        Test node and edge attributes are views of the board occupancy arrays
+        """
+        # Initialise board
+        board = Board(4)
+
+        # Assigning attributes updates arrays and input values
+        board.nodes[31].settlement = [0, 0, 1, 0]
+        board.edges[20].road = [0, 1, 0, 0]
+        self.assertEqual(board.node_owner[31], 3)
+        self.assertEqual(board.node_building[31], SETTLEMENT)
+        self.assertEqual(board.edge_owner[20], 2)
+        self.assertEqual(board.getInputValues(), board.assembleInputValues())
+
+        # Placing a city replaces settlement
+        board.placeCity(31, 2)
+        self.assertEqual(board.nodes[31].settlement, (0, 0, 0, 0))
+        self.assertEqual(board.nodes[31].city, (0, 0, 1, 0))
+        self.assertEqual(board.node_building[31], CITY)
+
+        # Clearing attributes empties node and edge
+        board.nodes[31].city = [0, 0, 0, 0]
+        board.edges[20].road = [0, 0, 0, 0]
+        self.assertEqual(board.nodes[31].isEmpty(), True)
+        self.assertEqual(board.edges[20].isEmpty(), True)
+        self.assertEqual(board.getInputValues(), board.assembleInputValues())
+
+        # Nodes, edges and hexes only hold their slots
+        with self.assertRaises(AttributeError):
+            board.nodes[0].colour = 'red'
+
+
 class NodeEdgeConnectivity(unittest.TestCase):
     def test_NodeHasRoad(self):
         """
@@ -127,6 +185,99 @@ class NodeEdgeConnectivity(unittest.TestCase):
         self.assertEqual(board.nodeHasRoad(30, 0), True)
 
 
+class ResourceProbabilities(unittest.TestCase):
+    def test_ResourceProbabilities(self):
+        """
+        Test each node's probability of getting a resource counts each of its dice rolls once
+        """
+        for seed in range(10):
+            board = Board(4, rng=random.Random(seed))
+            for node in board.nodes:
+                for resource_index in range(5):
+                    expected = sum(probabilityOfRoll(dice_roll)
+                                   for dice_roll in set(node.resource_dice_rolls[resource_index]))
+                    self.assertAlmostEqual(node.resource_probabilities[resource_index], expected)
+
+            # Most nodes get a resource
+            self.assertGreater(sum(1 for node in board.nodes if sum(node.resource_probabilities) > 0), 40)
+
+
+class SettlementSpotIndex(unittest.TestCase):
+    def bruteForceBestSpot(self, board, mask=None):
+        """
+        Best scoring open node found by scanning every node
+        """
+        best_node = None
+        for node_index in range(len(board.nodes)):
+            if board.node_building[node_index] == EMPTY and board.connectedNodesBuiltOn(node_index) and \
+                    (mask is None or mask[node_index] == 1):
+                if best_node is None or board.settlement_spots.scores[node_index] > \
+                        board.settlement_spots.scores[best_node]:
+                    best_node = node_index
+
+        return best_node
+
+    def test_Scores(self):
+        """
+        Test node scores are made up of pips, resource mix, ports and expansion
+        """
+        board = Board(4, rng=random.Random(1))
+        spots = board.settlement_spots
+
+        for node in board.nodes:
+            dice_rolls = [dice_roll for rolls in node.resource_dice_rolls for dice_roll in rolls]
+            self.assertEqual(spots.pips[node.ID], sum(6 - abs(7 - dice_roll) for dice_roll in dice_rolls))
+            self.assertEqual(spots.resource_mix[node.ID], sum(1 for rolls in node.resource_dice_rolls if rolls))
+
+            for spot in spots.two_step_spots[node.ID]:
+                self.assertNotIn(spot, board.node_neighbours[node.ID])
+                self.assertTrue(set(board.node_neighbours[spot]) & set(board.node_neighbours[node.ID]))
+
+        self.assertEqual(spots.port_bonus[0], PORT_BONUSES[0])
+        self.assertEqual(sorted(spots.ranked_nodes), list(range(54)))
+        self.assertEqual(spots.bestSpot(), max(range(54), key=lambda node_index: spots.scores[node_index]))
+
+    def test_BestSpotUpdated(self):
+        """
+        Test best spot follows buildings being placed and removed, and occupancy being restored
+        """
+        rng = random.Random(2)
+        board = Board(4, rng=rng)
+        spots = board.settlement_spots
+        snapshot = board.snapshotOccupancy()
+
+        built_nodes = []
+        for step in range(60):
+            if built_nodes and rng.random() < 0.3:
+                board.setNodeBuilding(built_nodes.pop(rng.randrange(len(built_nodes))), 0, EMPTY)
+            else:
+                node_index = spots.bestSpot() if rng.random() < 0.5 else rng.choice(list(spots.openSpots()) or [None])
+                if node_index is None:
+                    continue
+                board.setNodeBuilding(node_index, rng.randrange(4), SETTLEMENT)
+                built_nodes.append(node_index)
+
+            self.assertEqual(spots.bestSpot(), self.bruteForceBestSpot(board))
+            mask = [rng.randint(0, 1) for node_index in range(54)]
+            self.assertEqual(spots.bestSpot(mask), self.bruteForceBestSpot(board, mask))
+
+        board.restoreOccupancy(snapshot)
+        self.assertEqual(board.node_block_count, bytearray(54))
+        self.assertEqual(spots.bestSpot(), spots.ranked_nodes[0])
+
+    def test_BuiltOnFirstUse(self):
+        """
+        Test index built after nodes are occupied counts them as blocked
+        """
+        board = Board(4, rng=random.Random(3))
+        board.placeSettlement(10, 0)
+        board.placeCity(30, 1)
+
+        for node_index in (10, 30) + board.node_neighbours[10] + board.node_neighbours[30]:
+            self.assertFalse(board.settlement_spots.isOpen(node_index))
+        self.assertNotIn(10, list(board.settlement_spots.openSpots()))
+
+
 
 
 
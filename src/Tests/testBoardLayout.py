@@ -0,0 +1,117 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from src.BatchRunner import *
+from src.BoardLayout import *
+
+
+class BalancedLayouts(unittest.TestCase):
+
+    def testConstraints(self):
+        """
+        Test that generated layouts use every tile and keep matching resources, numbers and red numbers apart
+        """
+        rng = random.Random(0)
+        for topology in (STANDARD_TOPOLOGY, hexGridTopology(FIVE_SIX_PLAYER_ROW_LENGTHS),
+                         hexGridTopology(hexagonRowLengths(3))):
+            for layout_index in range(5):
+                layout = balancedLayout(topology, rng)
+                self.assertTrue(isBalanced(layout, topology))
+
+                for hex_index, neighbours in enumerate(topology.hex_neighbours):
+                    for neighbour in neighbours:
+                        self.assertNotEqual(layout.resources[hex_index], layout.resources[neighbour])
+                        if layout.dice_rolls[hex_index] in RED_NUMBERS:
+                            self.assertNotIn(layout.dice_rolls[neighbour], RED_NUMBERS)
+
+        # Layouts only depend on the stream given
+        self.assertEqual(balancedLayout(rng=random.Random(3)), balancedLayout(rng=random.Random(3)))
+
+    def testRestartLimit(self):
+        """
+        Test that the search gives up after its restarts rather than running forever
+        """
+        with mock.patch('src.BoardLayout.SEARCH_LIMIT', 0):
+            with self.assertRaises(ValueError):
+                balancedLayout(rng=random.Random(0), max_restarts=5)
+
+    def testUnbalancedLayouts(self):
+        """
+        Test that layouts breaking a constraint or with the wrong tiles are rejected
+        """
+        layout = balancedLayout(rng=random.Random(1))
+        resources, dice_rolls = list(layout.resources), list(layout.dice_rolls)
+
+        # Swap a red number next to another red number
+        red_hexes = [hex_index for hex_index, roll in enumerate(dice_rolls) if roll in RED_NUMBERS]
+        neighbour = next(neighbour for neighbour in STANDARD_TOPOLOGY.hex_neighbours[red_hexes[0]]
+                         if resources[neighbour] != -1)
+        dice_rolls[neighbour], dice_rolls[red_hexes[1]] = dice_rolls[red_hexes[1]], dice_rolls[neighbour]
+        self.assertFalse(isBalanced(BoardLayout(tuple(resources), tuple(dice_rolls))))
+
+        self.assertFalse(isBalanced(BoardLayout(layout.resources[:-1], layout.dice_rolls[:-1])))
+        self.assertFalse(isBalanced(BoardLayout((0,) * 19, layout.dice_rolls)))
+
+    def testBoard(self):
+        """
+        Test that a board and game are laid out as the layout given
+        """
+        layout = balancedLayout(rng=random.Random(2))
+        board = Board(4, layout=layout)
+
+        self.assertEqual(tuple(hexagon.resource_index for hexagon in board.hexes), layout.resources)
+        self.assertEqual(tuple(hexagon.dice_roll for hexagon in board.hexes), layout.dice_rolls)
+        self.assertEqual([hexagon.ID for hexagon in board.hexes], list(range(19)))
+
+        # Nodes get resources from the hexes around them
+        desert = layout.resources.index(-1)
+        for node_index in board.hex_node_connectivity[desert]:
+            expected = sum(1 for hex_index in board.topology.node_hexes[node_index] if hex_index != desert)
+            self.assertEqual(sum(len(rolls) for rolls in board.nodes[node_index].resource_dice_rolls), expected)
+
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players, seed=4, layout=layout)
+        self.assertEqual(game_manager.robber_location, desert)
+        game_manager.startGame()
+
+        with self.assertRaises(ValueError):
+            Board(4, layout=BoardLayout(layout.resources[:-1], layout.dice_rolls[:-1]))
+
+
+class LayoutCacheFile(unittest.TestCase):
+
+    def testRoundTrip(self):
+        """
+        Test that cached layouts are read back by index, and caches with the same seed agree
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'layouts.bin')
+            short_path = os.path.join(directory, 'short.bin')
+            writeLayoutCache(path, 5, seed=7)
+            writeLayoutCache(short_path, 3, seed=7)
+
+            with LayoutCache(path) as layouts, LayoutCache(short_path) as short_layouts:
+                self.assertEqual(len(layouts), 5)
+                self.assertEqual([layouts[index] for index in range(3)], [short_layouts[index] for index in range(3)])
+                self.assertEqual(layouts[-1], layouts[4])
+                for index in range(5):
+                    self.assertTrue(isBalanced(layouts[index]))
+                with self.assertRaises(IndexError):
+                    layouts[5]
+
+                # Batches with the same seed play the same boards
+                summary, results = runBatch([randomAction] * 4, 3, processes=1, seed=2, layouts=layouts)
+                repeat_summary, repeat_results = runBatch([randomAction] * 4, 3, processes=1, seed=2, layouts=layouts)
+                self.assertEqual([result['points'] for result in results],
+                                 [result['points'] for result in repeat_results])
+
+            # Layouts are only read for the topology they were written for
+            with self.assertRaises(ValueError):
+                LayoutCache(path, hexGridTopology(FIVE_SIX_PLAYER_ROW_LENGTHS))
+
+
+if __name__ == '__main__':
+    unittest.main()
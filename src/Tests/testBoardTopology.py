@@ -0,0 +1,136 @@
+import unittest
+
+from src.Board import *
+from src.BoardTopology import *
+from src.GameManager import *
+
+
+class StandardTopology(unittest.TestCase):
+
+    def test_Tables(self):
+        """
+        Test derived topology tables of the standard board
+        """
+        topology = STANDARD_TOPOLOGY
+        self.assertEqual(topology.number_of_nodes, 54)
+        self.assertEqual(topology.number_of_edges, 72)
+        self.assertEqual(topology.number_of_hexes, 19)
+
+        # Node 12 is connected to edges 8, 14 and 15 and hexes 1, 2 and 5
+        self.assertEqual(topology.node_edges[12], (8, 14, 15))
+        self.assertEqual(topology.node_neighbours[12], (4, 11, 13))
+        self.assertEqual(topology.node_hexes[12], (1, 2, 5))
+
+        # Corner node 0 is connected to one hex and has a 3:1 port
+        self.assertEqual(topology.node_hexes[0], (0,))
+        self.assertEqual(topology.node_ports[0], (1, 0, 0, 0, 0, 0))
+        self.assertEqual(topology.node_ports[28], (0, 1, 0, 0, 0, 0))
+
+        # Every node is on at least one hex and has two or three edges
+        for node_index in range(topology.number_of_nodes):
+            self.assertTrue(1 <= len(topology.node_hexes[node_index]) <= 3)
+            self.assertTrue(2 <= len(topology.node_edges[node_index]) <= 3)
+
+    def test_SharedBetweenBoards(self):
+        """
+        Test boards share static tables but not their state
+        """
+        board_1 = Board(4)
+        board_2 = Board(4)
+
+        self.assertIs(board_1.topology, board_2.topology)
+        self.assertIs(board_1.nodes[0].ports, board_2.nodes[0].ports)
+        self.assertIs(board_1.node_connectivity_matrix, board_2.node_connectivity_matrix)
+        with self.assertRaises(TypeError):
+            board_1.node_connectivity_matrix[0][1] = 0
+
+        board_1.placeSettlement(10, 0)
+        self.assertEqual(board_2.nodes[10].isEmpty(), True)
+
+        # Connected edges are the board's own edges
+        self.assertEqual([edge.ID for edge in board_1.nodes[12].connected_edges], [8, 14, 15])
+        self.assertIs(board_1.nodes[12].connected_edges[0], board_1.edges[8])
+
+
+class HexGridTopology(unittest.TestCase):
+
+    def test_StandardGeometry(self):
+        """
+        Test the generator reproduces the standard board's tables and caches topologies per geometry
+        """
+        number_of_nodes, edge_pairs, hex_node_connectivity = hexGridTables(STANDARD_ROW_LENGTHS)
+        self.assertEqual(number_of_nodes, 54)
+        self.assertEqual(edge_pairs, EDGE_PAIRS)
+        self.assertEqual(hex_node_connectivity, HEX_NODE_CONNECTIVITY)
+
+        self.assertEqual(hexagonRowLengths(2), STANDARD_ROW_LENGTHS)
+        self.assertIs(hexGridTopology(STANDARD_ROW_LENGTHS, PORT_LOCATIONS), STANDARD_TOPOLOGY)
+        self.assertIs(hexGridTopology(hexagonRowLengths(3)), hexGridTopology([4, 5, 6, 7, 6, 5, 4]))
+
+        self.assertEqual(STANDARD_TOPOLOGY.resource_counts, STANDARD_RESOURCE_COUNTS)
+        self.assertEqual(STANDARD_TOPOLOGY.number_tokens, STANDARD_NUMBER_TOKENS)
+
+        with self.assertRaises(ValueError):
+            hexGridTables((3, 5, 3))
+
+    def test_LargerGeometries(self):
+        """
+        Test node, edge, hex and tile counts of generated geometries
+        """
+        # Rings of 6r hexes around the centre hex
+        topology = hexGridTopology(hexagonRowLengths(3))
+        self.assertEqual(topology.number_of_hexes, 37)
+        self.assertEqual(topology.number_of_nodes, 96)
+        self.assertEqual(topology.number_of_edges, 132)
+
+        # The 5-6 player extension has the printed game's tiles
+        topology = hexGridTopology(FIVE_SIX_PLAYER_ROW_LENGTHS)
+        self.assertEqual((topology.number_of_hexes, topology.number_of_nodes, topology.number_of_edges), (30, 80, 109))
+        self.assertEqual(topology.resource_counts, (6, 5, 5, 6, 6))
+        self.assertEqual(topology.number_of_deserts, 2)
+        self.assertEqual(sorted(topology.number_tokens.count(roll) for roll in (2, 12)), [2, 2])
+        self.assertEqual(len(topology.number_tokens), 28)
+
+        for topology in (hexGridTopology(hexagonRowLengths(3)), hexGridTopology(FIVE_SIX_PLAYER_ROW_LENGTHS)):
+            # Every hex has six edges between its nodes, and each node is on one to three hexes with two or three edges
+            for hex_nodes in topology.hex_node_connectivity:
+                self.assertEqual(sum(1 for node_1, node_2 in topology.edge_pairs
+                                     if node_1 in hex_nodes and node_2 in hex_nodes), 6)
+            for node_index in range(topology.number_of_nodes):
+                self.assertTrue(1 <= len(topology.node_hexes[node_index]) <= 3)
+                self.assertTrue(2 <= len(topology.node_edges[node_index]) <= 3)
+
+            # Ports are pairs of coastal nodes
+            for port_nodes in topology.port_locations:
+                self.assertEqual(len(port_nodes) % 2, 0)
+                for node_index in port_nodes:
+                    self.assertTrue(len(topology.node_hexes[node_index]) < 3)
+
+    def test_BoardOnLargerGeometry(self):
+        """
+        Test a board lays out the tiles of its topology
+        """
+        topology = hexGridTopology(FIVE_SIX_PLAYER_ROW_LENGTHS)
+        board = Board(4, topology=topology, rng=random.Random(0))
+
+        self.assertEqual(len(board.hexes), 30)
+        self.assertEqual(len(board.nodes), 80)
+        self.assertEqual(sum(1 for hexagon in board.hexes if hexagon.resource_index == -1), 2)
+        self.assertEqual(sorted(hexagon.dice_roll for hexagon in board.hexes if hexagon.resource_index != -1),
+                         sorted(topology.number_tokens))
+
+    def test_GameOnLargerGeometry(self):
+        """
+        Test randomAction players score the actions of a larger board and can finish games on it
+        """
+        topology = hexGridTopology(FIVE_SIX_PLAYER_ROW_LENGTHS)
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players, seed=1, topology=topology)
+        game_manager.startGame()
+
+        self.assertIs(players[0].move_function.keywords['layout'], game_manager.action_layout)
+        self.assertTrue(game_manager.winner is not None or game_manager.turn_counter == 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import tempfile
+import unittest
+
+from src.Dataset import *
+
+
+class DatasetTest(unittest.TestCase):
+
+    def testWriteAndRead(self):
+        """
+        Test that samples are read back from memory-mapped shards in the order they were written
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            with DatasetWriter(directory, samples_per_shard=3) as writer:
+                for sample_index in range(7):
+                    writer.addSample([sample_index, 0.5, 2], [1, sample_index], sample_index % 2)
+
+            with Dataset(directory) as dataset:
+                self.assertEqual(len(dataset), 7)
+                self.assertEqual(len(dataset.index['shards']), 3)
+
+                for sample_index in [0, 2, 3, 6, -1]:
+                    observation, action, reward = dataset[sample_index]
+                    expected_index = sample_index % 7
+                    self.assertEqual(observation.tolist(), [expected_index, 0.5, 2])
+                    self.assertEqual(action.tolist(), [1, expected_index])
+                    self.assertEqual(reward, expected_index % 2)
+
+                with self.assertRaises(IndexError):
+                    dataset[7]
+
+    def testExportSelfPlay(self):
+        """
+        Test that self-play games are exported with one sample per decision, rewarding the winner's decisions
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            samples = exportSelfPlay(directory, [randomAction] * 4, 2, seed=3, samples_per_shard=500)
+
+            with Dataset(directory) as dataset:
+                self.assertEqual(len(dataset), samples)
+                self.assertEqual(dataset.observation_size, len(Player(randomAction).number_of_resource_cards) * 2 +
+                                 len(Player(randomAction).development_cards) * 2 + len(Board(4).input_values))
+                self.assertEqual(dataset.action_size, 54 + 54 + 72 + 1 + 20 + 1 + 1)
+
+                rewards = [dataset[sample_index][2] for sample_index in range(len(dataset))]
+                self.assertGreater(sum(rewards), 0)
+                self.assertLess(sum(rewards), len(dataset))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import io
+import unittest
+
+from src.EventLog import *
+from src.GameManager import *
+from src.Player import *
+
+
+class Sinks(unittest.TestCase):
+
+    def testSilentByDefault(self):
+        """
+        Test that an event log without sinks is inactive
+        """
+        event_log = EventLog()
+        self.assertEqual(event_log.active, False)
+
+        sink = RecordSink()
+        event_log.addSink(sink)
+        self.assertEqual(event_log.active, True)
+
+        event_log.removeSink(sink)
+        self.assertEqual(event_log.active, False)
+
+    def testTextSink(self):
+        """
+        Test that text sink formats events as messages
+        """
+        stream = io.StringIO()
+        event_log = EventLog([TextSink(stream)])
+        event_log.emit('settlement_built', player=2, node=31)
+        event_log.emit('no_winner')
+        self.assertEqual(stream.getvalue(), 'Player 2 built settlement on node 31\nNo player won\n')
+
+    def testRecordSink(self):
+        """
+        Test that game events are recorded with their fields
+        """
+        sink = RecordSink()
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players, event_log=EventLog([sink]))
+        game_manager.turn_counter = 0
+
+        # Build settlement and road in setup phase
+        game_manager.buildSettlement(players[1], 31)
+        game_manager.buildRoad(players[1], 42)
+
+        self.assertEqual(sink.events('settlement_built'), [{'player': 1, 'node': 31}])
+        self.assertEqual(sink.events('road_built'), [{'player': 1, 'edge': 42, 'node_0': 30, 'node_1': 31,
+                                                      'road_length': 1}])
+
+        # Every event type has a message
+        for event, fields in sink.records:
+            formatEvent(event, fields)
+
+
+if __name__ == '__main__':
+    unittest.main()
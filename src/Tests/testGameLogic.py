@@ -68,5 +68,87 @@ class SettlementPlacement(unittest.TestCase):
         self.assertEqual(game_manager.buildSettlement(player_1, 5), False)
 
 
+class CityPlacement(unittest.TestCase):
+
+    def testBuildCity(self):
+        """
+        Test that a city can only replace the player's own settlement
+        """
+
+        # Create game
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players)
+        game_manager.turn_counter = 7
+        game_manager.game_board.placeSettlement(5, 0)
+        game_manager.game_board.placeSettlement(20, 1)
+        game_manager.settlements[0] = 1
+
+        # Give player 1 enough resources for building city
+        players[0].resource_cards = [2, 3, 0, 0, 0]
+
+        # Can't build on empty node or another player's settlement
+        self.assertEqual(game_manager.buildCity(players[0], 7), False)
+        self.assertEqual(game_manager.buildCity(players[0], 20), False)
+
+        # Build on own settlement
+        self.assertEqual(game_manager.buildCity(players[0], 5), True)
+        self.assertEqual(game_manager.game_board.nodes[5].settlement, (0, 0, 0, 0))
+        self.assertEqual(game_manager.game_board.nodes[5].city, (1, 0, 0, 0))
+        self.assertEqual(players[0].resource_cards, [0, 0, 0, 0, 0])
+        self.assertEqual(players[0].building_pieces, [15, 6, 3])
+        self.assertEqual(game_manager.countPoints(0), 2)
+
+
+class PlayerCount(unittest.TestCase):
+
+    def testSetupOrder(self):
+        """
+        Test that players place settlements round the table and back again, whatever the number of players
+        """
+        self.assertEqual(loopingIterator(2, 3), 0)
+        self.assertEqual(loopingIterator(0, 3, increment=False), 2)
+
+        for number_of_players in (2, 3, 5):
+            players = [Player(randomAction) for i in range(number_of_players)]
+            sink = RecordSink()
+            game_manager = GameManager(players, event_log=EventLog([sink]), seed=number_of_players)
+            game_manager.startGame()
+            setup_order = [fields['player'] for fields in sink.events('placing_settlement')]
+
+            first_round = [(game_manager.starting_player + i) % number_of_players for i in range(number_of_players)]
+            self.assertEqual(setup_order, first_round + first_round[::-1])
+
+            # Per player state is sized for the players in the game
+            self.assertEqual(len(game_manager.points), number_of_players)
+            self.assertEqual(len(players[0].number_of_resource_cards), number_of_players)
+            self.assertEqual(len(game_manager.game_board.nodes[0].settlement), number_of_players)
+            self.assertEqual(len(game_manager.legal_actions.settlement_mask), number_of_players)
+
+    def testStartingPlayer(self):
+        """
+        Test that every seat can start a game, whatever the number of players
+        """
+        def stopAction(input_vector):
+            # First settlement decision comes after the starting player is chosen
+            raise StopIteration
+
+        for number_of_players in (2, 4):
+            starting_players = set()
+            for seed in range(40):
+                game_manager = GameManager([Player(stopAction) for i in range(number_of_players)], seed=seed)
+                with self.assertRaises(StopIteration):
+                    game_manager.startGame()
+                starting_players.add(game_manager.starting_player)
+
+            self.assertEqual(starting_players, set(range(number_of_players)))
+
+    def testTooFewPlayers(self):
+        """
+        Test that a game can't be played alone
+        """
+        with self.assertRaises(ValueError):
+            GameManager([Player(randomAction)])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
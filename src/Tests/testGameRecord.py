@@ -0,0 +1,126 @@
+import io
+import unittest
+
+from src.GameRecord import *
+from src.RandomAgent import *
+
+
+def playRecordedGame(seed, writer):
+    """
+    Plays a seeded game while recording it, keeping the input vector and actions of every decision
+    """
+    players = [Player(randomAction) for i in range(4)]
+    game_manager = GameManager(players, event_log=EventLog([writer]), seed=seed)
+    decisions = []
+
+    def recordedAction(input_vector, rng=random):
+        decisions.append(list(input_vector))
+        return randomAction(input_vector, rng)
+
+    for player in players:
+        player.move_function = seedMoveFunction(recordedAction, player.rng)
+
+    game_manager.startGame()
+    return game_manager, decisions
+
+
+class GameRecordTest(unittest.TestCase):
+
+    def testRecordAndReplay(self):
+        """
+        Test that games written to a stream are read back one at a time and replay to the same end state
+        """
+        stream = io.BytesIO()
+        writer = GameRecordWriter(stream)
+        games = [playRecordedGame(seed, writer) for seed in [3, 4, 5]]
+
+        stream.seek(0)
+        game_records = list(readGameRecords(stream))
+        self.assertEqual([game_record.seed for game_record in game_records], [3, 4, 5])
+
+        for (game_manager, decisions), game_record in zip(games, game_records):
+            self.assertEqual(game_record.winner, game_manager.winner)
+            self.assertEqual(game_record.rounds, game_manager.turn_counter)
+
+            replay_game_manager, samples = replayGame(game_record)
+            self.assertEqual(replay_game_manager.snapshot()._replace(random_state=None),
+                             game_manager.snapshot()._replace(random_state=None))
+
+            # Every decision is replayed from the same input vector
+            self.assertEqual([input_vector for player_index, input_vector, actions in samples], decisions)
+
+        # Records are compact, a few bytes per turn
+        turns = sum(len(game_manager.players) * game_manager.turn_counter for game_manager, decisions in games)
+        self.assertLess(len(stream.getvalue()), 20 * turns)
+
+    def testIterateSamples(self):
+        """
+        Test that samples are yielded for each decision, and an unfinished game at the end of a stream is skipped
+        """
+        stream = io.BytesIO()
+        writer = GameRecordWriter(stream)
+        game_manager, decisions = playRecordedGame(6, writer)
+        complete_length = len(stream.getvalue())
+        playRecordedGame(7, writer)
+
+        truncated_stream = io.BytesIO(stream.getvalue()[:complete_length + 100])
+        samples = list(iterateSamples(truncated_stream))
+        self.assertEqual(len(samples), len(decisions))
+
+        # Setup decisions are a single settlement or road
+        self.assertEqual(samples[0][1][0][0], 'Settlements')
+        self.assertEqual(samples[1][1][0][0], 'Roads')
+        self.assertEqual(len(samples[0][1]), 1)
+
+    def testGeneratedTopology(self):
+        """
+        Test that games on a generated board with more than 255 edges are recorded and replayed on the same board
+        """
+        topology = hexGridTopology(hexagonRowLengths(5))
+        self.assertGreater(topology.number_of_edges, 255)
+
+        stream = io.BytesIO()
+        players = [Player(RandomAgent(layout=actionLayout(topology))) for i in range(4)]
+        game_manager = GameManager(players, event_log=EventLog([GameRecordWriter(stream)]), seed=2, topology=topology)
+        game_manager.startGame()
+
+        stream.seek(0)
+        game_record, = readGameRecords(stream)
+        self.assertEqual(game_record.row_lengths, hexagonRowLengths(5))
+
+        replay_game_manager, samples = replayGame(game_record)
+        self.assertIs(replay_game_manager.game_board.topology, topology)
+        self.assertEqual(replay_game_manager.snapshot()._replace(random_state=None),
+                         game_manager.snapshot()._replace(random_state=None))
+
+        # Topologies which can't be rebuilt from their row lengths are rejected
+        custom_ports = hexGridTopology(STANDARD_ROW_LENGTHS)
+        game_manager = GameManager([Player(randomAction) for i in range(4)],
+                                   event_log=EventLog([GameRecordWriter(io.BytesIO())]), topology=custom_ports)
+        with self.assertRaises(ValueError):
+            game_manager.startGame()
+
+    def testBalancedLayout(self):
+        """
+        Test that a game played on a given layout is replayed on that layout without the caller supplying it
+        """
+        layout = balancedLayout(rng=random.Random(3))
+        stream = io.BytesIO()
+        game_manager = GameManager([Player(randomAction) for i in range(4)],
+                                   event_log=EventLog([GameRecordWriter(stream)]), seed=3, layout=layout)
+        game_manager.startGame()
+        playRecordedGame(4, GameRecordWriter(stream))
+
+        stream.seek(0)
+        layout_record, shuffled_record = readGameRecords(stream)
+        self.assertEqual(layout_record.layout, layout)
+        self.assertIsNone(shuffled_record.layout)
+
+        replay_game_manager, samples = replayGame(layout_record)
+        self.assertEqual(replay_game_manager.snapshot()._replace(random_state=None),
+                         game_manager.snapshot()._replace(random_state=None))
+        self.assertGreater(len(list(iterateSamples(io.BytesIO(stream.getvalue())))), len(samples))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,6 +26,41 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(constructNodeConnectivityMatrix(edges), expected_matrix)
 
 
+    def test_constructNodeAdjacencyList(self):
+        """
+        Test that adjacency list is correct
+        """
+        # Triangular graph with one edge missing
+        edges = [[0, 1], [1, 2]]
+        self.assertEqual(constructNodeAdjacencyList(edges), [[1], [0, 2], [1]])
+
+        # 1 node to 4 others, with an extra unconnected node
+        edges = [[0, 1], [0, 2], [0, 3], [0, 4]]
+        self.assertEqual(constructNodeAdjacencyList(edges, 6), [[1, 2, 3, 4], [0], [0], [0], [0], []])
+
+    def test_adjacency(self):
+        """
+        Test adjacency list, edge index map and connectivity matrix are kept up to date as graph changes
+        """
+        # Initialise graph with path 0-1-2
+        graph = Graph()
+        n = [graph.appendNodeToGraph() for i in range(4)]
+        graph.appendEdgeToGraph([n[0], n[1]])
+        graph.appendEdgeToGraph([n[1], n[2]])
+
+        self.assertEqual(graph.neighbours(n[1]), [n[0], n[2]])
+        self.assertEqual(graph.edgeBetween(n[2], n[1]), 1)
+        self.assertEqual(graph.edgeBetween(n[0], n[2]), None)
+        self.assertEqual(graph.node_connectivity, [[0, 1, 0, 0], [1, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 0]])
+
+        # Move end of edge 1 from node 2 to node 3
+        graph.reassignEdgeNode(1, n[2], n[3])
+        self.assertEqual(graph.neighbours(n[1]), [n[0], n[3]])
+        self.assertEqual(graph.neighbours(n[2]), [])
+        self.assertEqual(graph.edgeBetween(n[1], n[2]), None)
+        self.assertEqual(graph.edgeBetween(n[1], n[3]), 1)
+        self.assertEqual(graph.node_connectivity, [[0, 1, 0, 0], [1, 0, 0, 1], [0, 0, 0, 0], [0, 1, 0, 0]])
+
     def test_longestContinousPath(self):
         """
         Tests for path length functionality
@@ -126,6 +161,92 @@ class TestGraph(unittest.TestCase):
         length, path = graph_1.longestContinousPath()
         self.assertEqual(length, 13)
 
+    def test_longestContinousPathComponents(self):
+        """
+        Tests cached path lengths are updated when components are joined and split
+        """
+
+        # Initialise graph with two separate paths: 0-1-2 and 3-4
+        graph = Graph(nodes=[], edges=[])
+        n = [graph.appendNodeToGraph() for i in range(6)]
+        graph.appendEdgeToGraph([n[0], n[1]])
+        graph.appendEdgeToGraph([n[1], n[2]])
+        graph.appendEdgeToGraph([n[3], n[4]])
+        length, path = graph.longestContinousPath()
+        self.assertEqual(length, 2)
+
+        """ Extend shorter path so it is the longest """
+        graph.appendEdgeToGraph([n[4], n[5]])
+        n_6 = graph.appendNodeToGraph()
+        graph.appendEdgeToGraph([n[5], n_6])
+        length, path = graph.longestContinousPath()
+        self.assertEqual(length, 3)
+        self.assertEqual(path, [[n[3], n[4]], [n[4], n[5]], [n[5], n_6]])
+
+        """ Join paths """
+        graph.appendEdgeToGraph([n[2], n[3]])
+        length, path = graph.longestContinousPath()
+        self.assertEqual(length, 6)
+
+        """ Split joined path at node 4 by moving edge 4-5 onto a new node """
+        n_7 = graph.appendNodeToGraph()
+        graph.reassignEdgeNode(3, n[4], n_7)
+        length, path = graph.longestContinousPath()
+        self.assertEqual(length, 4)
+
+    def test_longPath(self):
+        """
+        Test a path far longer than the recursion limit is searched
+        """
+        graph = Graph(nodes=[], edges=[])
+        n = [graph.appendNodeToGraph() for i in range(5001)]
+        for i in range(5000):
+            graph.appendEdgeToGraph([n[i], n[i + 1]])
+
+        length, path = graph.longestContinousPath()
+        self.assertEqual(length, 5000)
+        self.assertEqual(path[0], [n[0], n[1]])
+        self.assertEqual(graph.reachableNodes(n[0])[-1], n[5000])
+
+    def test_trails(self):
+        """
+        Test every trail which can't be extended is found
+        """
+        # Triangle 0-1-2 with a tail 2-3
+        graph = Graph(nodes=[], edges=[])
+        n = [graph.appendNodeToGraph() for i in range(4)]
+        graph.appendEdgeToGraph([n[0], n[1]])
+        graph.appendEdgeToGraph([n[1], n[2]])
+        graph.appendEdgeToGraph([n[2], n[0]])
+        graph.appendEdgeToGraph([n[2], n[3]])
+
+        self.assertEqual(list(graph.trails(n[3])), [[3, 1, 0, 2], [3, 2, 0, 1]])
+        self.assertEqual(list(graph.trails(n[0])), [[0, 1, 2], [0, 1, 3], [2, 1, 0], [2, 3]])
+
+        # A node without edges has a single empty trail
+        isolated_node = graph.appendNodeToGraph()
+        self.assertEqual(list(graph.trails(isolated_node)), [[]])
+
+    def test_componentsAndReachability(self):
+        """
+        Test connected components and reachable nodes
+        """
+        # Paths 0-1-2-3 and 4-5, and node 6 on its own
+        graph = Graph(nodes=[], edges=[])
+        n = [graph.appendNodeToGraph() for i in range(7)]
+        graph.appendEdgeToGraph([n[0], n[1]])
+        graph.appendEdgeToGraph([n[1], n[2]])
+        graph.appendEdgeToGraph([n[2], n[3]])
+        graph.appendEdgeToGraph([n[4], n[5]])
+
+        components = graph.connectedComponents()
+        self.assertEqual([(sorted(nodes), edges) for nodes, edges in components],
+                         [([0, 1, 2, 3], {0, 1, 2}), ([4, 5], {3}), ([6], set())])
+
+        self.assertEqual(graph.reachableNodes(n[1]), [1, 0, 2, 3])
+        self.assertEqual(graph.reachableNodes(n[1], blocked_nodes=[n[2]]), [1, 0, 2])
+        self.assertEqual(graph.reachableNodes(n[6]), [6])
+
 
 if __name__ == '__main__':
     unittest.main()
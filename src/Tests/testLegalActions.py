@@ -0,0 +1,130 @@
+import random
+import unittest
+
+from src.GameManager import *
+from src.Player import *
+
+
+def bruteForceMask(game_manager, player):
+    """
+    Calculates settlement, city and road masks directly from the board and player state
+    """
+    board = game_manager.game_board
+    setup = game_manager.turn_counter == 0
+    player_index = player.player_index
+
+    settlements = [0] * len(board.nodes)
+    if player.building_pieces[1] != 0 and (setup or player.hasResources([1, 0, 1, 1, 1])):
+        for node_index, node in enumerate(board.nodes):
+            if node.isEmpty() and board.connectedNodesBuiltOn(node_index):
+                if setup:
+                    settlements[node_index] = int(sum(node.ports) == 0)
+                else:
+                    settlements[node_index] = int(board.nodeHasRoad(node_index, player_index))
+
+    cities = [0] * len(board.nodes)
+    if not setup and player.building_pieces[2] != 0 and player.hasResources([2, 3, 0, 0, 0]):
+        for node_index, node in enumerate(board.nodes):
+            cities[node_index] = node.settlement[player_index]
+
+    roads = [0] * len(board.edges)
+    if player.building_pieces[0] != 0 and (setup or player.hasResources([0, 0, 1, 0, 1])):
+        for edge_index, edge in enumerate(board.edges):
+            roads[edge_index] = int(edge.isEmpty() and board.edgeHasRoadOrSettlement(edge_index, player_index))
+
+    return {'Settlements': settlements, 'Cities': cities, 'Roads': roads}
+
+
+class Masks(unittest.TestCase):
+
+    def testSetupMask(self):
+        """
+        Test that settlements can't be placed by ports or next to other settlements in setup
+        """
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players)
+
+        mask = game_manager.legalActionMask(players[0])
+        self.assertEqual(mask['Settlements'][0], 0)
+        self.assertEqual(mask['Settlements'][31], 1)
+        self.assertEqual(mask['Settlements'][32], 1)
+
+        game_manager.buildSettlement(players[1], 31)
+        mask = game_manager.legalActionMask(players[0])
+        self.assertEqual(mask['Settlements'][31], 0)
+        self.assertEqual(mask['Settlements'][32], 0)
+
+    def testMaskMatchesRules(self):
+        """
+        Test that masks match the board rules at every decision of a game
+        """
+        random.seed(4)
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players)
+        test_case = self
+
+        def checkedAction(input_vector):
+            for player in players:
+                mask = game_manager.legalActionMask(player)
+                for key, expected in bruteForceMask(game_manager, player).items():
+                    test_case.assertEqual(mask[key], expected)
+            return randomAction(input_vector)
+
+        for player in players:
+            player.move_function = checkedAction
+
+        game_manager.startGame()
+
+    def testFrontiers(self):
+        """
+        Test that frontiers match the board rules at every decision of a game, and after restoring a snapshot
+        """
+        random.seed(6)
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players, seed=6)
+        board = game_manager.game_board
+        legal_actions = game_manager.legal_actions
+        test_case = self
+        snapshots = []
+
+        def checkFrontiers():
+            for player_index in range(4):
+                road_frontier = {edge_index for edge_index, edge in enumerate(board.edges)
+                                 if edge.isEmpty() and board.edgeHasRoadOrSettlement(edge_index, player_index)}
+                settlement_frontier = {node_index for node_index, node in enumerate(board.nodes)
+                                       if node.isEmpty() and board.connectedNodesBuiltOn(node_index) and
+                                       board.nodeHasRoad(node_index, player_index)}
+                test_case.assertEqual(legal_actions.road_frontier[player_index], road_frontier)
+                test_case.assertEqual(legal_actions.settlement_frontier[player_index], settlement_frontier)
+
+        def checkedAction(input_vector):
+            checkFrontiers()
+            if game_manager.turn_counter == 10 and len(snapshots) == 0:
+                snapshots.append(game_manager.snapshot())
+            return randomAction(input_vector)
+
+        for player in players:
+            player.move_function = checkedAction
+
+        game_manager.startGame()
+
+        game_manager.restore(snapshots[0])
+        checkFrontiers()
+
+    def testTradeMask(self):
+        """
+        Test that trades are legal only when player has enough of the resource given
+        """
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players)
+        game_manager.turn_counter = 3
+
+        players[0].resource_cards = [4, 3, 0, 0, 0]
+        players[0].best_trade_type = [4, 3, 4, 4, 4]
+        mask = game_manager.legalActionMask(players[0])
+        self.assertEqual(mask['TradeWithGame'], [1] * 8 + [0] * 12)
+        self.assertEqual(mask['EndTurn'], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import random
+import unittest
+
+from src.GameManager import *
+from src.Moves import *
+from src.Player import *
+
+
+def comparableState(game_manager):
+    """
+    Game snapshot with road networks reduced to what they represent. Undoing a move can leave a road network's nodes
+    and cached paths numbered differently to before, without changing which roads are connected. Random streams aren't
+    rewound by undoing
+    """
+    road_networks = []
+    for road_network in game_manager.road_network:
+        road_networks.append((len(road_network.nodes),
+                              sorted(sorted(road_network.nodes[node].variables['board_index'] for node in edge.nodes)
+                                     for edge in road_network.edges),
+                              road_network.longestContinousPath()[0]))
+
+    return game_manager.snapshot()._replace(road_networks=road_networks, random_state=None)
+
+
+class ApplyUndo(unittest.TestCase):
+
+    def testUndoRestoresState(self):
+        """
+        Test that applying random sequences of legal moves mid-game and undoing them returns the game to its
+        previous state
+        """
+        random.seed(3)
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players)
+        states = []
+
+        def stopAction(input_vector):
+            if game_manager.turn_counter == 20:
+                states.append(game_manager.snapshot())
+                raise StopIteration
+            return randomAction(input_vector)
+
+        for player in players:
+            player.move_function = stopAction
+
+        with self.assertRaises(StopIteration):
+            game_manager.startGame()
+        game_manager.restore(states[0])
+
+        # Plenty of resources so every type of move is possible
+        for player in players:
+            player.resource_cards[:] = [10, 10, 10, 10, 10]
+        start_state = comparableState(game_manager)
+
+        for sequence in range(20):
+            applied = []
+            states = [start_state]
+            for depth in range(12):
+                player_index = random.randrange(4)
+                moves = legalMoves(game_manager, player_index)
+
+                # Choose type of move first, as trades would otherwise make up most moves
+                key = random.choice(sorted(set(move.key for move in moves)))
+                move = random.choice([move for move in moves if move.key == key])
+                self.assertTrue(move.apply(game_manager))
+                applied.append(move)
+                states.append(comparableState(game_manager))
+
+            # Undo back to start, checking each intermediate state
+            while len(applied) != 0:
+                applied.pop().undo(game_manager)
+                states.pop()
+                self.assertEqual(comparableState(game_manager), states[-1])
+                self.assertEqual(game_manager.production.table,
+                                 ProductionTable(game_manager.game_board, 4, game_manager.robber_location).table)
+
+            board = game_manager.game_board
+            self.assertEqual(board.getInputValues(), board.assembleInputValues())
+            self.assertEqual(game_manager.undo_stack, [])
+
+    def testUndoRoadNetworkBreak(self):
+        """
+        Test that undoing a settlement which breaks another player's road joins the road back together
+        """
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players)
+        game_manager.buildSettlement(players[0], 29)
+        game_manager.buildSettlement(players[1], 19)
+        game_manager.turn_counter = 1
+        players[0].resource_cards[:] = [10, 10, 10, 10, 10]
+        players[1].resource_cards[:] = [10, 10, 10, 10, 10]
+
+        # Player 0 builds a road of length 4 through node 30
+        for edge_index in [41, 42, 43, 44]:
+            game_manager.buildRoad(players[0], edge_index)
+
+        # Player 1 builds a settlement at node 31, breaking player 0's road
+        game_manager.buildRoad(players[1], 26)
+        game_manager.buildRoad(players[1], 35)
+        move = BuildSettlement(1, 31)
+        self.assertTrue(move.apply(game_manager))
+        self.assertEqual(game_manager.road_network[0].longestContinousPath()[0], 2)
+        self.assertEqual(game_manager.legalActionMask(players[0])['Settlements'][30], 0)
+
+        move.undo(game_manager)
+        self.assertEqual(game_manager.road_network[0].longestContinousPath()[0], 4)
+        self.assertEqual(len(game_manager.road_network[0].nodes), 5)
+        self.assertEqual(game_manager.game_board.nodes[31].isEmpty(), True)
+        self.assertEqual(players[1].building_pieces, [13, 4, 4])
+
+        # Moves must be undone in order
+        first_move = BuildRoad(1, 25)
+        second_move = BuildRoad(1, 27)
+        first_move.apply(game_manager)
+        second_move.apply(game_manager)
+        with self.assertRaises(ValueError):
+            first_move.undo(game_manager)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 
+from src.GameManager import *
 from src.Player import *
 
 class PlayerChecks(unittest.TestCase):
@@ -21,6 +22,28 @@ class PlayerChecks(unittest.TestCase):
         player.resource_cards = [2, 2, 2, 2, 2]
         self.assertEqual(player.hasResources([1, 1, 1, 0, 1]), True)
 
+    def testSetupWithoutRoad(self):
+        """
+        Test that no road is placed in setup when other players' roads take every edge of the chosen settlement
+        """
+        def settlementAction(input_vector):
+            output_vector = [0] * STANDARD_LAYOUT.size
+            output_vector[STANDARD_LAYOUT.slot('Settlements', 9)] = 1
+            return STANDARD_LAYOUT.split(output_vector), output_vector
+
+        players = [Player(settlementAction) for i in range(4)]
+        game_manager = GameManager(players, seed=0)
+
+        # Roads of two other players lead into each edge of node 9
+        builds = [(1, 2, [7, 12, 11]), (2, 29, [34, 25, 19])]
+        for player_index, node_index, edges in builds:
+            self.assertTrue(game_manager.buildSettlement(players[player_index], node_index))
+            for edge_index in edges:
+                self.assertTrue(game_manager.buildRoad(players[player_index], edge_index))
+
+        self.assertEqual(players[0].setup(), (9, None))
+        self.assertEqual(game_manager.game_board.nodes[9].settlement[0], 1)
+
 class MaxValue(unittest.TestCase):
     def testGetHighestAcrossDictionaries(self):
         """
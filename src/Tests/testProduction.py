@@ -0,0 +1,86 @@
+import random
+import unittest
+
+from src.GameManager import *
+from src.Player import *
+
+
+def walkProduction(game_manager, dice_roll):
+    """
+    Resources each player receives from a roll, found by walking hexes and nodes
+    """
+    production = [[0] * 5 for player in game_manager.players]
+    for hex in game_manager.game_board.hex_dice_roll_list[dice_roll] or []:
+        if hex.ID != game_manager.robber_location:
+            for node_index in game_manager.game_board.hex_node_connectivity[hex.ID]:
+                if game_manager.game_board.node_building[node_index] != EMPTY:
+                    player_index = game_manager.game_board.node_owner[node_index] - 1
+                    production[player_index][hex.resource_index] += game_manager.game_board.node_building[node_index]
+
+    return production
+
+
+class ProductionTableTest(unittest.TestCase):
+
+    def testTableMatchesBoard(self):
+        """
+        Test that the production table matches the buildings on the board and the robber throughout a game
+        """
+        random.seed(5)
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players)
+        checks = []
+
+        def checkedAction(input_vector):
+            for dice_roll in range(2, 13):
+                table = game_manager.production.table[dice_roll]
+                self.assertEqual(table, walkProduction(game_manager, dice_roll))
+                self.assertEqual(game_manager.production.roll_totals[dice_roll], [sum(row) for row in table])
+            checks.append(game_manager.turn_counter)
+            return randomAction(input_vector)
+
+        for player in players:
+            player.move_function = checkedAction
+
+        game_manager.startGame()
+        self.assertGreater(max(checks), 20)
+
+    def testDistributeResources(self):
+        """
+        Test that a roll gives out resources from the table, with cities getting twice as many and robbed hexes none
+        """
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players)
+        board = game_manager.game_board
+
+        # Settle on a node without a port next to a hex with a 6 which isn't robbed
+        hex = board.hex_dice_roll_list[6][0]
+        game_manager.robber_location = 1 if hex.ID == 0 else 0
+        game_manager.production.moveRobber(game_manager.robber_location)
+        node_index = [node for node in board.hex_node_connectivity[hex.ID] if sum(board.nodes[node].ports) == 0][0]
+        self.assertTrue(game_manager.buildSettlement(players[2], node_index))
+
+        expected = walkProduction(game_manager, 6)[2]
+        self.assertNotEqual(sum(expected), 0)
+        game_manager.distributeResources(6)
+        self.assertEqual(players[2].resource_cards, expected)
+        self.assertEqual(players[0].number_of_resource_cards[2], sum(expected))
+
+        # City doubles production
+        game_manager.turn_counter = 1
+        players[2].resource_cards[:] = [2, 3, 0, 0, 0]
+        self.assertTrue(game_manager.buildCity(players[2], node_index))
+        game_manager.distributeResources(6)
+        self.assertEqual(players[2].resource_cards, [2 * amount for amount in expected])
+
+        # Robber blocks hex
+        players[2].resource_cards[:] = [0] * 5
+        game_manager.robber_location = hex.ID
+        game_manager.production.moveRobber(hex.ID)
+        game_manager.distributeResources(6)
+        self.assertEqual(players[2].resource_cards, walkProduction(game_manager, 6)[2])
+        self.assertNotEqual(players[2].resource_cards, [2 * amount for amount in expected])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from src.BatchRunner import *
+from src.Profiling import *
+
+
+def playProfiledGame(seed, profile):
+    players = [Player(randomAction) for i in range(4)]
+    game_manager = GameManager(players, seed=seed, profile=profile)
+    game_manager.startGame()
+    return game_manager
+
+
+class GameProfileTest(unittest.TestCase):
+
+    def testProfileGame(self):
+        """
+        Test that a profiled game records every phase and consistent counts, without changing how the game is played
+        """
+        profile = GameProfile()
+        game_manager = playProfiledGame(4, profile)
+        unprofiled_game_manager = playProfiledGame(4, None)
+        self.assertEqual(game_manager.snapshot(), unprofiled_game_manager.snapshot())
+
+        for phase in PROFILE_PHASES:
+            self.assertGreater(profile.times[phase], 0)
+        self.assertLessEqual(profile.times['dice_distribution'] + profile.times['robber'], profile.times['turn'])
+
+        # One decision per turn, and each decision is in the histograms once
+        self.assertEqual(profile.counters['games'], 1)
+        self.assertEqual(profile.counters['turns'], profile.calls['turn'])
+        self.assertEqual(profile.counters['decisions'], profile.counters['turns'])
+        self.assertEqual(sum(profile.histograms['actions_per_decision'].values()), profile.counters['decisions'])
+        self.assertEqual(sum(value * frequency for value, frequency in profile.histograms['actions_per_decision'].items()),
+                         profile.counters['actions'])
+        self.assertEqual(profile.calls['dice_distribution'] + profile.calls['robber'], profile.counters['turns'])
+
+    def testMergeProfiles(self):
+        """
+        Test that merged profiles add up
+        """
+        profile_1 = GameProfile()
+        profile_1.addTime('turn', 1.0)
+        profile_1.count('rejected_actions', 2)
+        profile_1.observe('actions_per_decision', 1)
+
+        profile_2 = GameProfile()
+        profile_2.addTime('turn', 3.0)
+        profile_2.addTime('robber', 0.5)
+        profile_2.observe('actions_per_decision', 1)
+        profile_2.observe('actions_per_decision', 3)
+
+        merged_profile = mergeProfiles([profile_1, None, profile_2])
+        self.assertEqual(merged_profile.times, {'turn': 4.0, 'robber': 0.5})
+        self.assertEqual(merged_profile.meanTime('turn'), 2.0)
+        self.assertEqual(merged_profile.counters, {'rejected_actions': 2})
+        self.assertEqual(merged_profile.histograms['actions_per_decision'], {1: 2, 3: 1})
+        self.assertAlmostEqual(merged_profile.histogramMean('actions_per_decision'), 5.0 / 3.0)
+        self.assertIn('robber', formatProfile(merged_profile))
+
+    def testProfileBatch(self):
+        """
+        Test that a batch can be profiled and its profiles merged
+        """
+        summary, results = runBatch([randomAction] * 4, 2, processes=1, profile=True)
+        self.assertEqual(summary['profile'].counters['games'], 2)
+        self.assertEqual(summary['profile'].counters['turns'],
+                         sum(result['profile'].counters['turns'] for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
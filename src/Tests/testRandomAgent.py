@@ -0,0 +1,86 @@
+import pickle
+import random
+import unittest
+
+from src.BatchRunner import *
+from src.RandomAgent import *
+
+
+class RandomAgentTest(unittest.TestCase):
+
+    def testOutput(self):
+        """
+        Test that the agent gives a score to every action, matching between output dictionary and vector
+        """
+        output_dictionary, output_vector = fastRandomAction([], random.Random(0))
+        self.assertEqual(len(output_vector), STANDARD_LAYOUT.size)
+        self.assertEqual(STANDARD_LAYOUT.flatten(output_dictionary), output_vector)
+        self.assertTrue(all(0 <= score < 2 ** SCORE_BITS for score in output_vector))
+
+        # Scores come only from the stream given
+        self.assertEqual(fastRandomAction([], random.Random(4)), fastRandomAction([], random.Random(4)))
+        self.assertNotEqual(fastRandomAction([], random.Random(4)), fastRandomAction([], random.Random(5)))
+
+    def testPriors(self):
+        """
+        Test that actions are the highest scoring with probability proportional to their prior
+        """
+        agent = RandomAgent({'EndTurn': 3, 'Knight': 0})
+        rng = random.Random(1)
+
+        end_turn_highest = 0
+        for decision in range(4000):
+            output_dictionary, output_vector = agent([], rng)
+            self.assertEqual(output_dictionary['Knight'], [0])
+            if output_dictionary['EndTurn'][0] > output_dictionary['Roads'][0]:
+                end_turn_highest += 1
+
+        # Between ending turn with prior 3 and a road with prior 1, ending turn is highest 3 times in 4
+        self.assertAlmostEqual(end_turn_highest / 4000, 0.75, delta=0.03)
+
+    def testInvalidPriors(self):
+        """
+        Test that unknown keys and negative priors are rejected
+        """
+        with self.assertRaises(ValueError):
+            RandomAgent({'Robber': 1})
+        with self.assertRaises(ValueError):
+            RandomAgent({'EndTurn': -1})
+
+    def testBatch(self):
+        """
+        Test that seeded games against randomAction are repeatable and agents with different priors are summarised
+        separately
+        """
+        move_functions = [fastRandomAction, RandomAgent({'TradeWithGame': 0.1}), randomAction, fastRandomAction]
+        summary, results = runBatch(move_functions, 4, processes=1, seed=2)
+        repeat_summary, repeat_results = runBatch(move_functions, 4, processes=1, seed=2)
+
+        self.assertEqual([result['points'] for result in results], [result['points'] for result in repeat_results])
+        self.assertEqual(len(summary['move_functions']), 3)
+        self.assertIn('src.RandomAgent:RandomAgent(TradeWithGame=0.1)', summary['move_functions'])
+
+        # Agents are sent to worker processes by pickling
+        agent = pickle.loads(pickle.dumps(move_functions[1]))
+        self.assertEqual(agent([], random.Random(3)), move_functions[1]([], random.Random(3)))
+
+    def testLargerBoard(self):
+        """
+        Test that agents scoring the layout of a generated board can finish games on it
+        """
+        topology = hexGridTopology(hexagonRowLengths(3))
+        agent = RandomAgent(layout=actionLayout(topology))
+        self.assertEqual(len(agent([], random.Random(0))[1]), 2 * 96 + 132 + 23)
+
+        for seed in range(3):
+            players = [Player(agent) for player_index in range(4)]
+            game_manager = GameManager(players, seed=seed, topology=topology)
+            game_manager.startGame()
+
+            self.assertIs(game_manager.action_layout, agent.layout)
+            self.assertEqual(len(game_manager.game_board.nodes), 96)
+            self.assertTrue(game_manager.winner is not None or game_manager.turn_counter > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
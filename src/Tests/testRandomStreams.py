@@ -0,0 +1,97 @@
+import threading
+import unittest
+
+from src.EventLog import *
+from src.GameManager import *
+from src.Player import *
+
+
+def playSeededGame(seed, move_function=randomAction, dice_rolls=None):
+    """
+    Plays a game with every player's random choices drawn from the game's streams
+    """
+    sink = RecordSink()
+    players = [Player(move_function) for i in range(4)]
+    game_manager = GameManager(players, event_log=EventLog([sink]), seed=seed, dice_rolls=dice_rolls)
+
+    game_manager.startGame()
+    return game_manager, sink
+
+
+def endTurnAction(input_vector, rng=random):
+    # Player which never builds, still using its stream so games differ from randomAction games
+    output_dictionary, output_vector = randomAction(input_vector, rng)
+    output_dictionary['EndTurn'] = [2]
+    return output_dictionary, output_vector
+
+
+class RandomStreamsTest(unittest.TestCase):
+
+    def testSameSeedRepeats(self):
+        """
+        Test that games with the same seed are identical and games with different seeds differ
+        """
+        # Players draw from their own streams, whatever state the global random module is in
+        random.seed(1)
+        game_manager_1, sink_1 = playSeededGame(7)
+        random.seed(2)
+        game_manager_2, sink_2 = playSeededGame(7)
+        game_manager_3, sink_3 = playSeededGame(8)
+
+        self.assertEqual(sink_1.records, sink_2.records)
+        self.assertEqual(game_manager_1.snapshot(), game_manager_2.snapshot())
+        self.assertNotEqual(sink_1.records, sink_3.records)
+
+    def testStreamsIndependent(self):
+        """
+        Test that the board and dice are the same for a seed whatever the players decide
+        """
+        game_manager_1, sink_1 = playSeededGame(7)
+        game_manager_2, sink_2 = playSeededGame(7, endTurnAction)
+
+        self.assertEqual([(hex.resource_index, hex.dice_roll) for hex in game_manager_1.game_board.hexes],
+                         [(hex.resource_index, hex.dice_roll) for hex in game_manager_2.game_board.hexes])
+        self.assertEqual(game_manager_1.starting_player, game_manager_2.starting_player)
+
+        rolls_1 = [fields['roll'] for fields in sink_1.events('dice_rolled')]
+        rolls_2 = [fields['roll'] for fields in sink_2.events('dice_rolled')]
+        length = min(len(rolls_1), len(rolls_2))
+        self.assertGreater(length, 50)
+        self.assertEqual(rolls_1[:length], rolls_2[:length])
+
+    def testPreDrawnDiceRolls(self):
+        """
+        Test that pre-drawn dice rolls are used in order before the dice stream
+        """
+        dice_rolls = [2, 3, 4, 12]
+        game_manager, sink = playSeededGame(7, dice_rolls=dice_rolls)
+        rolls = [fields['roll'] for fields in sink.events('dice_rolled')]
+        self.assertEqual(rolls[:4], dice_rolls)
+
+        # Rolls drawn ahead from a seed match the rolls of a game with that seed
+        game_manager, sink = playSeededGame(7)
+        rolls = [fields['roll'] for fields in sink.events('dice_rolled')]
+        self.assertEqual(drawDiceRolls(7, 20), rolls[:20])
+
+    def testParallelGames(self):
+        """
+        Test that games in parallel threads don't affect each other's random choices
+        """
+        expected = playSeededGame(7)[1].records
+        results = [None] * 4
+
+        def play(index):
+            results[index] = playSeededGame(7)[1].records
+
+        threads = [threading.Thread(target=play, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for records in results:
+            self.assertEqual(records, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -57,6 +57,26 @@ class TestRoadNetwork(unittest.TestCase):
 
         print('3')
 
+    def test_connectedBoardNodes(self):
+        """
+        Test board nodes reached along roads stop at another player's settlement
+        """
+        game_board = Board(4)
+        road_network = RoadNetwork(game_board, 0)
+
+        # Roads along nodes 11-12-4-3
+        road_network.addRoad(14)
+        road_network.addRoad(8)
+        road_network.addRoad(3)
+        self.assertEqual(road_network.connectedBoardNodes(11), [11, 12, 4, 3])
+        self.assertEqual(road_network.connectedBoardNodes(30), [])
+
+        # Another player builds on node 4
+        game_board.placeSettlement(4, 1)
+        road_network.breakRoadAtNode(4)
+        self.assertEqual(road_network.connectedBoardNodes(11), [11, 12, 4])
+        self.assertEqual(road_network.connectedBoardNodes(3), [3, 4])
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from src.GameManager import *
+from src.Player import *
+
+
+class SnapshotRestore(unittest.TestCase):
+
+    def testRestoreMidGame(self):
+        """
+        Test that restoring a snapshot taken mid-game returns every part of the game to that state
+        """
+        random.seed(2)
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players)
+        snapshots = []
+
+        def snapshotAction(input_vector):
+            if len(snapshots) == 0 and game_manager.turn_counter == 30:
+                snapshots.append((game_manager.snapshot(), list(input_vector)))
+            return randomAction(input_vector)
+
+        for player in players:
+            player.move_function = snapshotAction
+
+        game_manager.startGame()
+        snapshot, input_vector = snapshots[0]
+        self.assertNotEqual(game_manager.snapshot(), snapshot)
+
+        # Restore and check state matches
+        game_manager.restore(snapshot)
+        self.assertEqual(game_manager.snapshot(), snapshot)
+        self.assertEqual(game_manager.turn_counter, 30)
+
+        # Derived state matches restored state
+        board = game_manager.game_board
+        self.assertEqual(board.getInputValues(), board.assembleInputValues())
+        self.assertEqual(players[game_manager.player_turn].assembleInputVector(), input_vector)
+        for player_index, road_network in enumerate(game_manager.road_network):
+            self.assertEqual(len(road_network.edges), 15 - players[player_index].building_pieces[0])
+            self.assertEqual(road_network.longestContinousPath()[0], game_manager.road_lengths[player_index])
+
+    def testSnapshotImmutable(self):
+        """
+        Test that a snapshot is unaffected by later moves and can be restored repeatedly
+        """
+        players = [Player(randomAction) for i in range(4)]
+        game_manager = GameManager(players)
+        snapshot = game_manager.snapshot()
+
+        for repeat in range(2):
+            game_manager.buildSettlement(players[0], 31)
+            game_manager.buildRoad(players[0], 42)
+            self.assertEqual(game_manager.road_network[0].longestContinousPath()[0], 1)
+            self.assertEqual(game_manager.legalActionMask(players[1])['Settlements'][30], 0)
+
+            game_manager.restore(snapshot)
+            self.assertEqual(game_manager.game_board.nodes[31].isEmpty(), True)
+            self.assertEqual(game_manager.game_board.edges[42].isEmpty(), True)
+            self.assertEqual(game_manager.road_network[0].longestContinousPath()[0], 0)
+            self.assertEqual(game_manager.legalActionMask(players[1])['Settlements'][30], 1)
+            self.assertEqual(players[0].building_pieces, [15, 5, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,16 @@
 import time
 
+from src.EventLog import *
 from src.GameManager import *
 from src.Player import *
+from src.RandomAgent import *
 
-player_1 = Player(randomAction)
-player_2 = Player(randomAction)
-player_3 = Player(randomAction)
-player_4 = Player(randomAction)
+player_1 = Player(fastRandomAction)
+player_2 = Player(fastRandomAction)
+player_3 = Player(fastRandomAction)
+player_4 = Player(fastRandomAction)
 
-game_manager = GameManager([player_1, player_2, player_3, player_4])
+game_manager = GameManager([player_1, player_2, player_3, player_4], event_log=EventLog([TextSink()]))
 
 start_time = time.time()
 game_manager.startGame()